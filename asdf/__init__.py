@@ -9,21 +9,59 @@ Data Format (ASDF) files
 from ._internal_init import __version__, __githash__, test
 # ----------------------------------------------------------------------------
 
+import importlib
+import importlib.util
+import sys
+
 __all__ = [
     'AsdfFile', 'CustomType', 'AsdfExtension', 'Stream', 'open', 'test',
     'commands', 'IntegerType', 'ExternalArrayReference', 'info', '__version__',
     '__githash__', 'ValidationError', 'get_config', 'config_context',
+    'dumps', 'loads',
 ]
 
 
-from .asdf import AsdfFile, open_asdf as open
-from .types import CustomType
-from .extension import AsdfExtension
-from .stream import Stream
-from . import commands
-from .tags.core import IntegerType
-from .tags.core.external_reference import ExternalArrayReference
-from ._convenience import info
-from .config import get_config, config_context
+# The module and attribute name of each public attribute of the package.
+# These are imported on first access, so that ``import asdf`` doesn't
+# pay for the imports of the modules that aren't used.
+_LAZY_ATTRIBUTES = {
+    'AsdfFile': ('.asdf', 'AsdfFile'),
+    'open': ('.asdf', 'open_asdf'),
+    'CustomType': ('.types', 'CustomType'),
+    'AsdfExtension': ('.extension', 'AsdfExtension'),
+    'Stream': ('.stream', 'Stream'),
+    'commands': ('.commands', None),
+    'IntegerType': ('.tags.core', 'IntegerType'),
+    'ExternalArrayReference': ('.tags.core.external_reference', 'ExternalArrayReference'),
+    'info': ('._convenience', 'info'),
+    'dumps': ('._convenience', 'dumps'),
+    'loads': ('._convenience', 'loads'),
+    'get_config': ('.config', 'get_config'),
+    'config_context': ('.config', 'config_context'),
+    'ValidationError': ('jsonschema', 'ValidationError'),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        # Submodules used to be imported with the package, so code that
+        # only imports asdf may still refer to them as attributes.
+        if not name.startswith('_') and importlib.util.find_spec('.' + name, __name__) is not None:
+            return importlib.import_module('.' + name, __name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
-from jsonschema import ValidationError
+if sys.version_info < (3, 7):
+    # Module __getattr__ is only supported from Python 3.7
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
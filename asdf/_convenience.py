@@ -1,15 +1,22 @@
 """
-Implementation of the asdf.info(...) function.  This is just a thin wrapper
-around _display module code.
+Implementation of the asdf.info(...) function, which is just a thin wrapper
+around _display module code, and of the asdf.dumps(...) and asdf.loads(...)
+functions.
 """
+import functools
+import io
 import pathlib
 from contextlib import contextmanager
 
-from .asdf import open_asdf, AsdfFile
+from . import constants, schema, versioning, yamlutil
+from .asdf import open_asdf, AsdfFile, get_asdf_library_info
+from .config import get_config
+from .extension import AsdfExtension, AsdfExtensionList, Extension, ExtensionProxy
+from .tags.core import AsdfObject
 from ._display import render_tree, DEFAULT_MAX_ROWS, DEFAULT_MAX_COLS, DEFAULT_SHOW_VALUES
 
 
-__all__ = ["info"]
+__all__ = ["info", "dumps", "loads"]
 
 
 def info(node_or_path, max_rows=DEFAULT_MAX_ROWS, max_cols=DEFAULT_MAX_COLS, show_values=DEFAULT_SHOW_VALUES):
@@ -56,3 +63,215 @@ def _manage_node(node_or_path):
             yield "root.tree", node_or_path.tree
         else:
             yield "root", node_or_path
+
+
+# Number of validated subtrees remembered by each message context, which
+# bounds the memory used by an application that sends many different
+# messages.
+_MESSAGE_VALIDATION_CACHE_SIZE = 1024
+
+
+class _MessageContext:
+    """
+    The state shared by calls to `dumps` and `loads` with the same
+    ASDF Standard version and extensions: the header, the tagged
+    ``asdf_library`` and history entries that are added to every tree,
+    and the validator and its cache of validated subtrees.
+    """
+    def __init__(self, version, extensions):
+        self._version = version
+        self._extensions = list(extensions)
+        self._validation_cache = {}
+
+        af = self._new_file()
+        self._header = b"".join([
+            constants.ASDF_MAGIC, b" ", af.version_map["FILE_FORMAT"].encode("ascii"), b"\n",
+            b"#", constants.ASDF_STANDARD_COMMENT, b" ", af.version_string.encode("ascii"), b"\n",
+        ])
+        self._tag_handles = yamlutil._get_tag_handles(AsdfObject(), af)
+
+        serialization_context = af._create_serialization_context()
+        self._asdf_library = yamlutil.custom_tree_to_tagged_tree(
+            get_asdf_library_info(), af, _serialization_context=serialization_context
+        )
+        self._asdf_library_extensions = set(serialization_context._extensions_used)
+        self._history_by_extensions = {}
+
+        self._validate_node = schema._get_node_validator(af, reading=True)
+
+    def _new_file(self):
+        if len(self._validation_cache) > _MESSAGE_VALIDATION_CACHE_SIZE:
+            self._validation_cache.clear()
+
+        af = AsdfFile(version=self._version, extensions=self._extensions)
+        af._validation_cache = self._validation_cache
+        af._fname = ''
+        return af
+
+    def _get_history(self, af, extensions_used):
+        """
+        Get the tagged history that lists the extensions used to
+        write a tree.
+        """
+        key = frozenset(extensions_used)
+        if key not in self._history_by_extensions:
+            serialization_context = af._create_serialization_context()
+            serialization_context._extensions_used.update(extensions_used)
+            af._update_extension_history(serialization_context)
+            self._history_by_extensions[key] = yamlutil.custom_tree_to_tagged_tree(
+                af.tree.pop("history"), af, _serialization_context=serialization_context
+            )
+        return self._history_by_extensions[key]
+
+    def dumps(self, tree):
+        af = self._new_file()
+        if "history" in tree or "asdf_library" in tree:
+            return None
+
+        af._tree = AsdfObject(tree)
+        serialization_context = af._create_serialization_context()
+        tagged_tree = yamlutil.custom_tree_to_tagged_tree(
+            af._tree, af, _serialization_context=serialization_context
+        )
+        if len(af.blocks) > 0:
+            return None
+
+        tagged_tree["asdf_library"] = self._asdf_library
+        if af.version >= versioning.NEW_HISTORY_FORMAT_MIN_VERSION:
+            extensions_used = serialization_context._extensions_used | self._asdf_library_extensions
+            tagged_tree["history"] = self._get_history(af, extensions_used)
+
+        schema.validate(tagged_tree, af)
+
+        return self._header + yamlutil._dump_tagged_tree(tagged_tree, None, af, self._tag_handles)
+
+    def loads(self, yaml_content):
+        af = self._new_file()
+        config = get_config()
+
+        tagged_tree = yamlutil.load_tree(yaml_content)
+        validate_node = self._validate_node if config.validate_on_read else None
+        fill_defaults = (
+            af.version <= versioning.FILL_DEFAULTS_MAX_VERSION and
+            config.legacy_fill_schema_defaults
+        )
+        tree = yamlutil.tagged_tree_to_custom_tree(
+            tagged_tree, af,
+            _validate_node=validate_node,
+            _fill_defaults=fill_defaults,
+            _find_references=True,
+        )
+        af._check_extensions(tree)
+        return tree
+
+
+@functools.lru_cache(maxsize=16)
+def _get_message_context(version, extensions, plugin_extensions):
+    # The plugin extensions are part of the key so that a context
+    # isn't reused after the configured extensions change.
+    return _MessageContext(version, extensions)
+
+
+def _get_context_for(version, extensions):
+    if extensions is None:
+        extensions = []
+    elif isinstance(extensions, (AsdfExtension, Extension, ExtensionProxy)):
+        extensions = [extensions]
+    elif isinstance(extensions, AsdfExtensionList):
+        extensions = extensions.extensions
+
+    if not isinstance(extensions, list):
+        raise TypeError(
+            "The extensions parameter must be an extension, list of extensions, or "
+            "instance of AsdfExtensionList"
+        )
+
+    if version is None:
+        version = get_config().default_version
+
+    return _get_message_context(
+        str(version),
+        tuple(ExtensionProxy.maybe_wrap(e) for e in extensions),
+        tuple(get_config().extensions),
+    )
+
+
+def dumps(tree, version=None, extensions=None):
+    """
+    Serialize a tree to the bytes of an ASDF file.
+
+    This is equivalent to writing ``AsdfFile(tree)`` to a `io.BytesIO`,
+    but is much faster for small trees without arrays, since everything
+    that doesn't depend on the tree is prepared once and reused for
+    every call with the same ``version`` and ``extensions``, and the
+    tree is only validated once.  Trees that contain arrays, or that
+    have their own ``history`` or ``asdf_library``, are written the
+    regular way.
+
+    Parameters
+    ----------
+    tree : dict
+        The tree to serialize.
+
+    version : str, optional
+        The ASDF Standard version.  If not provided, defaults to the
+        configured default version.  See `asdf.config.AsdfConfig.default_version`.
+
+    extensions : object, optional
+        Additional extensions to use when writing the tree.  May be
+        any of the values accepted by `asdf.AsdfFile`.
+
+    Returns
+    -------
+    bytes
+    """
+    result = _get_context_for(version, extensions).dumps(tree)
+    if result is None:
+        buff = io.BytesIO()
+        AsdfFile(tree, version=version, extensions=extensions).write_to(buff)
+        result = buff.getvalue()
+    return result
+
+
+def loads(data, extensions=None):
+    """
+    Deserialize the bytes of an ASDF file into a tree.
+
+    This is equivalent to reading the tree of ``asdf.open(io.BytesIO(data))``,
+    but is much faster for small files without binary blocks, for the
+    same reasons as `asdf.dumps`.  Files with binary blocks are read the
+    regular way, with the arrays loaded into memory.
+
+    Parameters
+    ----------
+    data : bytes
+        Content of an ASDF file.
+
+    extensions : object, optional
+        Additional extensions to use when reading the tree.  May be
+        any of the values accepted by `asdf.open`.
+
+    Returns
+    -------
+    asdf.tags.core.AsdfObject
+    """
+    data = bytes(data)
+
+    yaml_start = data.find(b"%YAML")
+    yaml_end = data.find(b"\n...", yaml_start)
+    if (
+        data.startswith(constants.ASDF_MAGIC)
+        and yaml_start != -1
+        and yaml_end != -1
+        and data[yaml_end + 4:].strip() == b""
+    ):
+        header_line, _, comment_section = data[:yaml_start].partition(b"\n")
+        AsdfFile._parse_header_line(header_line)
+        comments = AsdfFile._parse_comment_section(comment_section)
+        version = AsdfFile._find_asdf_version_in_comments(comments)
+        if version is not None:
+            context = _get_context_for(version, extensions)
+            return context.loads(data[yaml_start:yaml_end + 4])
+
+    with open_asdf(io.BytesIO(data), extensions=extensions, lazy_load=False, copy_arrays=True) as af:
+        return af.tree
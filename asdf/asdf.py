@@ -4,10 +4,10 @@ import time
 import copy
 import datetime
 import warnings
-from pkg_resources import parse_version
 
 import numpy as np
 from jsonschema import ValidationError
+from packaging.version import parse as parse_version
 
 from .config import get_config
 from . import block
@@ -35,6 +35,23 @@ from .search import AsdfSearchResult
 from ._helpers import validate_version
 
 from .tags.core import AsdfObject, Software, HistoryEntry, ExtensionMetadata
+from .tags.core.ndarray import NDArrayType
+
+
+def _copy_on_write_tree(tree):
+    """
+    Copy the containers and the numpy arrays of a tree, sharing arrays
+    read from a file as copy-on-write views, and any other object as it
+    is.
+    """
+    def _callback(node):
+        if isinstance(node, NDArrayType):
+            return node._make_copy_on_write()
+        elif isinstance(node, np.ndarray):
+            return node.copy()
+        return node
+
+    return treeutil.walk_and_modify(tree, _callback, ignore_implicit_conversion=True)
 
 
 def get_asdf_library_info():
@@ -140,8 +157,18 @@ class AsdfFile:
         # that we've already warned about for this file.
         self._warned_tag_pairs = set()
 
+        # Tagged subtrees that have already passed validation, so that
+        # writing out a tree that was read, or the two passes made by
+        # `update`, don't validate unchanged parts of the tree again.
+        self._validation_cache = {}
+
         self._file_format_version = None
 
+        # The YAML content of a file opened with ``select``, and the
+        # paths of the entries of its tree that were left out, which are
+        # loaded when the file is written.
+        self._unselected = None
+
         # Context of a call to treeutil.walk_and_modify, needed in the AsdfFile
         # in case walk_and_modify is re-entered by extension code (via
         # custom_tree_to_tagged_tree or tagged_tree_to_custom_tree).
@@ -468,15 +495,58 @@ class AsdfFile:
         self._external_asdf_by_uri.clear()
         self._blocks.close()
 
-    def copy(self):
+    def copy(self, copy_on_write=False):
+        """
+        Get a copy of this file, whose tree can be modified without
+        changing this file's tree.
+
+        Parameters
+        ----------
+        copy_on_write : bool, optional
+            When `False` (default), the tree is copied in full, and the
+            copy is independent of this file.  When `True`, the copy is
+            made without reading data from the file: the mappings,
+            sequences and numpy arrays of the tree are copied, while
+            other objects are shared between the two trees.  Arrays read
+            from a file are shared as proxies that copy their data the
+            first time they are modified, by setting items or with an
+            in-place operator, without loading the data of arrays that
+            are never modified.  Views taken from those proxies before
+            they are modified are read-only.  Since unmodified arrays
+            still refer to this file's blocks, this file must be kept
+            open while the copy is in use.
+
+        Returns
+        -------
+        AsdfFile
+        """
+        # The copy has no blocks of its own to read the entries left out
+        # by ``select`` from, so they are read into this file's tree first.
+        self._load_unselected()
+        if not copy_on_write:
+            return self.__class__(
+                copy.deepcopy(self._tree),
+                self._uri,
+                self._user_extensions,
+            )
+
+        result = self.__class__(uri=self._uri, extensions=self._user_extensions)
+        # Set directly to result._tree (bypassing the property), since
+        # this file's tree is already valid, and validating the copy
+        # would load the data of its arrays.
+        result._tree = _copy_on_write_tree(self._tree)
+        return result
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        self._load_unselected()
         return self.__class__(
-            copy.deepcopy(self._tree),
+            copy.deepcopy(self._tree, memo),
             self._uri,
             self._user_extensions,
         )
 
-    __copy__ = __deepcopy__ = copy
-
     @property
     def uri(self):
         """
@@ -586,6 +656,8 @@ class AsdfFile:
         # Only perform custom validation if the tree is not empty
         self._validate(asdf_object, custom=bool(tree))
         self._tree = asdf_object
+        # The entries left out by ``select`` belong to the old tree.
+        self._unselected = None
 
     def keys(self):
         return self.tree.keys()
@@ -792,6 +864,8 @@ class AsdfFile:
                    _force_raw_types=False,
                    strict_extension_check=False,
                    ignore_missing_extensions=False,
+                   lazy_tree=False,
+                   select=None,
                    **kwargs):
         """Attempt to populate AsdfFile data from file-like object"""
 
@@ -862,7 +936,15 @@ class AsdfFile:
             # We parse the YAML content into basic data structures
             # now, but we don't do anything special with it until
             # after the blocks have been read
-            tree = yamlutil.load_tree(reader)
+            if select is None:
+                tree = yamlutil.load_tree(reader)
+            else:
+                # Keep the content, to load the rest of the tree from
+                # in case the file is written.
+                yaml_content = reader.read()
+                tree, unselected = yamlutil._load_selected_tree(yaml_content, select)
+                if unselected:
+                    self._unselected = (yaml_content, unselected)
             has_blocks = fd.seek_until(constants.BLOCK_MAGIC, 4, include=True)
         elif yaml_token == constants.BLOCK_MAGIC:
             has_blocks = True
@@ -881,19 +963,54 @@ class AsdfFile:
                 fd, past_magic=True, validate_checksums=validate_checksums)
             self._blocks.read_block_index(fd, self)
 
-        tree = reference.find_references(tree, self)
-
-        if self.version <= versioning.FILL_DEFAULTS_MAX_VERSION and legacy_fill_schema_defaults:
-            schema.fill_defaults(tree, self, reading=True)
+        fill_defaults = (
+            self.version <= versioning.FILL_DEFAULTS_MAX_VERSION and
+            legacy_fill_schema_defaults
+        )
 
+        # Find references, fill defaults, validate and convert the tree
+        # in a single walk.  Each node is validated against its tag's
+        # schema just before it is converted, after the defaults have
+        # been filled in the node and its children.
+        validate_node = None
         if validate_on_read:
-            try:
-                self._validate(tree, reading=True)
-            except ValidationError:
-                self.close()
-                raise
+            validate_node = schema._get_node_validator(self, reading=True)
+
+        try:
+            tagged_tree = tree
+            if lazy_tree:
+                if fill_defaults and validate_on_read and (
+                        validate_on_read != 'lazy' or self._custom_schema):
+                    # The tree is validated now, so the defaults are
+                    # filled first, as they are by the eager walk.
+                    schema.fill_defaults(tree, self, reading=True)
+                    fill_defaults = False
+                if validate_on_read and validate_on_read != 'lazy':
+                    # Validate all of the tree now, so that only the
+                    # conversion is left until the nodes are accessed.
+                    for node in treeutil.iter_tree(tree):
+                        validate_node(node)
+                    validate_node = None
+                tree = yamlutil._tagged_tree_to_lazy_tree(
+                    tree, self, _force_raw_types,
+                    _validate_node=validate_node,
+                    _fill_defaults=fill_defaults,
+                )
+            else:
+                tree = yamlutil.tagged_tree_to_custom_tree(
+                    tree, self, _force_raw_types,
+                    _validate_node=validate_node,
+                    _fill_defaults=fill_defaults,
+                    _find_references=True,
+                )
 
-        tree = yamlutil.tagged_tree_to_custom_tree(tree, self, _force_raw_types)
+            if validate_on_read and self._custom_schema:
+                # The walk fills defaults in the original tagged tree,
+                # so it can still be checked against the custom schema.
+                schema.validate(tagged_tree, self, self._custom_schema, reading=True)
+        except ValidationError:
+            self.close()
+            raise
 
         if not (ignore_missing_extensions or _force_raw_types):
             self._check_extensions(tree, strict=strict_extension_check)
@@ -1026,8 +1143,65 @@ class AsdfFile:
                 fd.tell(), pad_blocks, fd.block_size)
             fd.fast_forward(padding)
 
+    def _load_unselected(self):
+        """
+        Add the entries of the tree left out when the file was opened
+        with ``select`` back to the tree, so that they are written with
+        the rest of it.  Entries that have since been set, or whose
+        parent is no longer in the tree, are left as they are.
+        """
+        if self._unselected is None:
+            return
+
+        yaml_content, unselected = self._unselected
+        self._unselected = None
+
+        fill_defaults = (
+            self.version <= versioning.FILL_DEFAULTS_MAX_VERSION and
+            get_config().legacy_fill_schema_defaults
+        )
+
+        def get_json_id(tagged_node, json_id):
+            if isinstance(tagged_node, dict) and isinstance(tagged_node.get('id'), str):
+                return tagged_node['id']
+            return json_id
+
+        tagged_tree = yamlutil.load_tree(yaml_content)
+        entries = []
+        for path in unselected:
+            node = self._tree
+            tagged_node = tagged_tree
+            # The id of the closest ancestor that has one is the base
+            # URI of the references in the entry.
+            json_id = get_json_id(tagged_node, None)
+            for key in path[:-1]:
+                if not isinstance(node, dict) or key not in node:
+                    break
+                node = node[key]
+                tagged_node = tagged_node[key]
+                json_id = get_json_id(tagged_node, json_id)
+            else:
+                if isinstance(node, dict) and path[-1] not in node:
+                    entries.append((node, path[-1], tagged_node[path[-1]], json_id))
+
+        # The entries share a context, so that nodes shared between
+        # them keep their identity.
+        serialization_context = self._create_serialization_context()
+        modification_context = treeutil._TreeModificationContext(keep_results=True)
+        for node, key, tagged_value, json_id in entries:
+            node[key] = yamlutil.tagged_tree_to_custom_tree(
+                tagged_value, self,
+                _serialization_context=serialization_context,
+                _fill_defaults=fill_defaults,
+                _find_references=True,
+                _modification_context=modification_context,
+                _json_id=json_id,
+            )
+
     def _pre_write(self, fd, all_array_storage, all_array_compression,
                    auto_inline):
+        self._load_unselected()
+
         if all_array_storage not in (None, 'internal', 'external', 'inline'):
             raise ValueError(
                 "Invalid value for all_array_storage: '{0}'".format(
@@ -1061,9 +1235,10 @@ class AsdfFile:
 
         self._tree['asdf_library'] = get_asdf_library_info()
 
-    def _serial_write(self, fd, pad_blocks, include_block_index):
+    def _serial_write(self, fd, pad_blocks, include_block_index, update_checksums=True):
         self._write_tree(self._tree, fd, pad_blocks)
-        self.blocks.write_internal_blocks_serial(fd, pad_blocks)
+        self.blocks.write_internal_blocks_serial(
+            fd, pad_blocks, update_checksums=update_checksums)
         self.blocks.write_external_blocks(fd.uri, pad_blocks)
         if include_block_index:
             self.blocks.write_block_index(fd, self)
@@ -1313,6 +1488,62 @@ class AsdfFile:
             finally:
                 self._post_write(fd)
 
+    def write_to_buffers(self, all_array_storage=None, all_array_compression='input',
+                         auto_inline=constants.DEFAULT_AUTO_INLINE,
+                         include_block_index=True, version=None, checksums=False):
+        """
+        Write the ASDF file to a list of buffers.
+
+        The content is the same as written by `write_to`, but is
+        returned as a list of `memoryview` objects that can be passed
+        to `socket.socket.sendmsg`, `os.writev` or a similar
+        scatter/gather call.  The data of uncompressed binary blocks is
+        not copied: their buffers are views of the memory of the arrays
+        themselves, so the arrays should not be modified until the
+        buffers have been sent.
+
+        Parameters
+        ----------
+        all_array_storage : string, optional
+            See `write_to`.  External blocks can only be written if the
+            file has a URI.
+
+        all_array_compression : string, optional
+            See `write_to`.
+
+        auto_inline : int, optional
+            See `write_to`.
+
+        include_block_index : bool, optional
+            See `write_to`.
+
+        version : str, optional
+            See `write_to`.
+
+        checksums : bool, optional
+            If `True`, compute the checksum of each binary block, which
+            reads all of the array data.  By default the checksums are
+            left out of the block headers, which readers treat as
+            "not computed".
+
+        Returns
+        -------
+        list of memoryview
+        """
+        if version is not None:
+            self.version = version
+
+        fd = generic_io.BufferList(uri=self._uri)
+        self._pre_write(fd, all_array_storage, all_array_compression,
+                        auto_inline)
+        try:
+            self._serial_write(fd, False, include_block_index,
+                               update_checksums=checksums)
+        finally:
+            self._post_write(fd)
+
+        return fd.buffers
+
     def find_references(self):
         """
         Finds all external "JSON References" in the tree and converts
@@ -1621,16 +1852,20 @@ def open_asdf(fd, uri=None, mode=None, validate_checksums=False, extensions=None
               ignore_version_mismatch=True, ignore_unrecognized_tag=False,
               _force_raw_types=False, copy_arrays=False, lazy_load=True,
               custom_schema=None, strict_extension_check=False,
-              ignore_missing_extensions=False, _compat=False,
-              **kwargs):
+              ignore_missing_extensions=False, lazy_tree=False, select=None,
+              _compat=False, **kwargs):
     """
     Open an existing ASDF file.
 
     Parameters
     ----------
-    fd : string or file-like object
-        May be a string ``file`` or ``http`` URI, or a Python
-        file-like object.
+    fd : string, file-like object or buffer
+        May be a string ``file`` or ``http`` URI, a Python
+        file-like object, or any object supporting the buffer
+        protocol (`bytes`, `bytearray`, `mmap.mmap`, etc.).  When
+        opening a buffer or an `io.BytesIO` in ``r`` mode, arrays are
+        read-only views of the buffer unless ``copy_arrays`` is
+        `True`.
 
     uri : string, optional
         The URI of the file.  Only required if the URI can not be
@@ -1690,10 +1925,30 @@ def open_asdf(fd, uri=None, mode=None, validate_checksums=False, extensions=None
         contains metadata about extensions that are not available. Defaults
         to `False`.
 
-    validate_on_read : bool, optional
+    lazy_tree : bool, optional
+        When `True`, the tree is converted to custom types as it is
+        accessed, rather than all at once when the file is opened.  The
+        mappings and sequences of the tree are then instances of
+        `asdf.lazy_nodes.AsdfDictNode` and `asdf.lazy_nodes.AsdfListNode`,
+        which convert each of their items the first time it is accessed.
+        With ``validate_on_read`` set to ``'lazy'``, each node is also
+        validated only when it is accessed.  Defaults to `False`.
+
+    select : list of str, optional
+        JSON pointers to the parts of the tree to read, for example
+        ``['/meta', '/data']``.  The YAML of the other entries of the
+        root mapping, and of untagged mappings on the way to the
+        pointers, is parsed but not loaded, and those entries are left
+        out of the tree.  They are loaded when the file is written, so
+        that they are written along with the rest of the tree.  Any
+        other node on the way to a pointer is read whole.  Defaults to
+        `None`, which reads the whole tree.
+
+    validate_on_read : bool or str, optional
         DEPRECATED. When `True`, validate the newly opened file against tag
         and custom schemas.  Recommended unless the file is already known
-        to be valid.
+        to be valid.  When ``'lazy'``, validate each tagged node only when
+        it is converted to a custom object.
 
     Returns
     -------
@@ -1722,6 +1977,8 @@ def open_asdf(fd, uri=None, mode=None, validate_checksums=False, extensions=None
         _force_raw_types=_force_raw_types,
         strict_extension_check=strict_extension_check,
         ignore_missing_extensions=ignore_missing_extensions,
+        lazy_tree=lazy_tree,
+        select=select,
         **kwargs)
 
 
@@ -1772,6 +2029,11 @@ class SerializationContext:
 
         self.__extensions_used = set()
 
+        # Conversion dispatch, memoized by Python type and by tag,
+        # including types and tags that need no conversion.
+        self._type_dispatch = {}
+        self._tag_dispatch = {}
+
     @property
     def version(self):
         """
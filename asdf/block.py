@@ -13,6 +13,7 @@ import yaml
 
 from . import compression as mcompression
 from .compat.numpycompat import NUMPY_LT_1_7
+from .config import get_config
 from . import constants
 from . import generic_io
 from . import treeutil
@@ -43,6 +44,7 @@ class BlockManager:
         }
 
         self._data_to_block_mapping = {}
+        self._coalesced_memmaps = []
         self._validate_checksums = False
         self._memmap = not copy_arrays
         self._lazy_load = lazy_load
@@ -273,6 +275,14 @@ class BlockManager:
         """
         if not self._internal_blocks:
             return
+
+        # When every block is going to be read anyway, read runs of
+        # small adjacent blocks with a single read (or memory map)
+        # rather than one per block.
+        if not self.lazy_load:
+            for indices, end in self._plan_coalesced_reads():
+                self._read_coalesced_blocks(indices, end)
+
         for i, block in enumerate(self._internal_blocks):
             if isinstance(block, UnloadedBlock):
                 block.load()
@@ -289,7 +299,104 @@ class BlockManager:
                 if last_block is None:
                     break
 
-    def write_internal_blocks_serial(self, fd, pad_blocks=False):
+    def _plan_coalesced_reads(self):
+        """
+        Find runs of adjacent `UnloadedBlock` instances that are small
+        enough to be read together.  A block is small when the space
+        up to the start of the next block is no larger than the
+        configured ``io_chunk_size``, which also limits the total
+        size of each run.
+
+        Returns
+        -------
+        groups : list of (list of int, int)
+            The indices in the list of internal blocks of each run of
+            blocks, with the offset at which it ends.
+        """
+        chunk_size = get_config().io_chunk_size
+        blocks = self._internal_blocks
+
+        groups = []
+        group = []
+        group_end = None
+        for i, (block, next_block) in enumerate(zip(blocks, blocks[1:])):
+            end = next_block.offset
+            if (isinstance(block, UnloadedBlock) and end is not None and
+                    end - block.offset <= chunk_size):
+                if group and end - blocks[group[0]].offset > chunk_size:
+                    groups.append((group, group_end))
+                    group = []
+                group.append(i)
+                group_end = end
+            elif group:
+                groups.append((group, group_end))
+                group = []
+        if group:
+            groups.append((group, group_end))
+
+        return [(blocks, end) for blocks, end in groups if len(blocks) > 1]
+
+    def _read_coalesced_blocks(self, indices, end):
+        """
+        Read a run of adjacent blocks, at ``indices`` in the list of
+        internal blocks and ending at offset ``end``, from a single
+        buffer, replacing their `UnloadedBlock` instances.  The data of
+        each uncompressed block is a view of that buffer.
+        """
+        first = self._internal_blocks[indices[0]]
+        fd = first._fd
+        start = first.offset
+
+        if self.memmap and fd.can_memmap():
+            region = fd.memmap_array(start, end - start)
+            if isinstance(region, np.memmap):
+                self._coalesced_memmaps.append(region)
+            memmapped = True
+        else:
+            fd.seek(start)
+            region = fd.read_into_array(end - start)
+            memmapped = False
+
+        buff = memoryview(region)
+        region_fd = generic_io.get_file(buff, mode='r')
+
+        for index in indices:
+            unloaded = self._internal_blocks[index]
+            region_fd.seek(unloaded.offset - start)
+            # Only parse the header here; the data is sliced out of
+            # the buffer below.
+            block = Block(memmap=self.memmap, lazy_load=True)
+            block.read(region_fd)
+            block._lazy_load = self.lazy_load
+            block._readonly = unloaded._readonly
+            block._fd = fd
+            block._offset += start
+            self._internal_blocks[index] = block
+
+            if not block.input_compression:
+                data_start = block.data_offset - start
+                if isinstance(region, np.memmap):
+                    # A slice of the memory map of the whole run.  Its
+                    # offset is that of the run, so the position of the
+                    # data in the file is kept on the block instead.
+                    block._data = region[data_start:data_start + block._size]
+                    block._memmap_source = (block._data, fd, block.data_offset)
+                    # The arrays of the block are views of its data,
+                    # rather than of the memory map they share.
+                    self._data_to_block_mapping[id(block._data)] = block
+                else:
+                    block._data = np.frombuffer(
+                        buff[data_start:data_start + block._size], np.uint8)
+                block._memmapped = memmapped
+            else:
+                block.data
+
+            if self._validate_checksums and not block.validate_checksum():
+                raise ValueError(
+                    "Block at {0} does not match given checksum".format(
+                    block._offset))
+
+    def write_internal_blocks_serial(self, fd, pad_blocks=False, update_checksums=True):
         """
         Write all blocks to disk serially.
 
@@ -298,11 +405,15 @@ class BlockManager:
         fd : generic_io.GenericFile
             The file to write internal blocks to.  The file position
             should be after the tree.
+
+        update_checksums : bool, optional
+            If `False`, don't read the data of the blocks to compute
+            their checksums, see `Block.write`.
         """
         for block in self.internal_blocks:
             if block.output_compression:
                 block.offset = fd.tell()
-                block.write(fd)
+                block.write(fd, update_checksum=update_checksums)
             else:
                 if block.input_compression:
                     block.update_size()
@@ -310,7 +421,7 @@ class BlockManager:
                     block.size, pad_blocks, fd.block_size)
                 block.allocated = block._size + padding
                 block.offset = fd.tell()
-                block.write(fd)
+                block.write(fd, update_checksum=update_checksums)
                 fd.fast_forward(block.allocated - block._size)
 
     def write_internal_blocks_random_access(self, fd):
@@ -715,6 +826,28 @@ class BlockManager:
 
         raise ValueError("block not found.")
 
+    def get_array_base(self, arr):
+        """
+        For a given array, finds the base array that "owns" the actual
+        data, or the data of a block that the array is a view of,
+        whichever comes first.  Unlike `util.get_array_base`, this
+        tells apart the blocks read with their neighbours, whose data
+        are views of the same memory map.
+
+        Parameters
+        ----------
+        arr : numpy.ndarray
+
+        Returns
+        -------
+        base : numpy.ndarray
+        """
+        base = arr
+        while (id(base) not in self._data_to_block_mapping and
+               isinstance(base.base, np.ndarray)):
+            base = base.base
+        return base
+
     def find_or_create_block_for_array(self, arr, ctx):
         """
         For a given array, looks for an existing block containing its
@@ -737,7 +870,13 @@ class BlockManager:
             else:
                 arr._block = None
 
-        base = util.get_array_base(arr)
+        if any(stride == 0 for stride in arr.strides):
+            # The ASDF Standard doesn't permit zero strides, so
+            # broadcast arrays get a block of their own, which is
+            # written out in full without materializing it in memory.
+            base = arr
+        else:
+            base = self.get_array_base(arr)
         block = self._data_to_block_mapping.get(id(base))
         if block is not None:
             return block
@@ -772,6 +911,11 @@ class BlockManager:
     def close(self):
         for block in self.blocks:
             block.close()
+        for region in self._coalesced_memmaps:
+            region.flush()
+            if region._mmap is not None:
+                region._mmap.close()
+        self._coalesced_memmaps = []
 
 
 class Block:
@@ -805,6 +949,10 @@ class Block:
         self._memmapped = False
         self._lazy_load = lazy_load
         self._readonly = False
+        self._shared_memory = None
+        # The data memory mapped from a file, with the file and the
+        # offset of the data in it.
+        self._memmap_source = None
 
         self.update_size()
         self._allocated = self._size
@@ -914,7 +1062,8 @@ class Block:
         # The following line is safe because we're only using
         # the MD5 as a checksum.
         m = hashlib.new('md5') # nosec
-        m.update(self.data.ravel('K'))
+        for chunk in util.iter_array_chunks(data, get_config().io_chunk_size):
+            m.update(chunk)
         return m.digest()
 
     def validate_checksum(self):
@@ -947,7 +1096,7 @@ class Block:
         updating the file in-place, otherwise the work is redundant.
         """
         if self._data is not None:
-            self._data_size = self._data.data.nbytes
+            self._data_size = self._data.nbytes
 
             if not self.output_compression:
                 self._size = self._data_size
@@ -1096,11 +1245,16 @@ class Block:
         memmap = self._fd.can_memmap() and not self.input_compression
         if self._should_memmap and memmap:
             self._data = self._fd.memmap_array(self.data_offset, self._size)
+            self._memmap_source = (self._data, self._fd, self.data_offset)
             self._memmapped = True
 
-    def write(self, fd):
+    def write(self, fd, update_checksum=True):
         """
         Write an internal block to the given Python file-like object.
+
+        If ``update_checksum`` is `False`, the checksum is not computed
+        from the data, and is left out of the block header unless it is
+        known to be current.
         """
         self._header_size = self._header.size
 
@@ -1109,7 +1263,15 @@ class Block:
         if self._array_storage == 'streamed':
             flags |= constants.BLOCK_FLAG_STREAMED
         elif self._data is not None:
-            self.update_checksum()
+            # A block memory mapped read-only can not have changed
+            # since it was read, so there is no need to read it all
+            # again to recompute a checksum we already have.
+            if not (self._checksum and isinstance(self._data, np.memmap) and
+                    not self._data.flags.writeable):
+                if update_checksum:
+                    self.update_checksum()
+                else:
+                    self._checksum = None
             data_size = self._data.nbytes
             if not fd.seekable() and self.output_compression:
                 buff = io.BytesIO()
@@ -1161,7 +1323,18 @@ class Block:
             else:
                 if used_size != data_size:
                     raise RuntimeError(f"Block used size {used_size} is not equal to the data size {data_size}")
-                fd.write_array(self._data)
+                source = self._memmap_source
+                if (source is not None and source[0] is self._data and
+                        source[1] is not fd and
+                        isinstance(source[1], generic_io.RealFile) and
+                        isinstance(fd, generic_io.RealFile)):
+                    # An unchanged block memory mapped from another file
+                    # on disk, which can be copied over without reading
+                    # it in.
+                    self._data.flush()
+                    fd.copy_from(source[1], source[2], data_size)
+                else:
+                    fd.write_array(self._data)
 
     @property
     def data(self):
@@ -1187,8 +1360,127 @@ class Block:
 
         return self._data
 
+    def iter_data(self, offset=0, chunk_size=None):
+        """
+        Iterate over the data of the block, starting ``offset`` bytes
+        into it, without reading all of it into memory.
+
+        Data that is already in memory (or memory mapped) is yielded as
+        views of it.  Otherwise the data is read from the file one piece
+        at a time, decompressing it as it is read, and restoring the
+        file position around each read, so that the file may be used
+        for other things in the meantime.
+
+        Parameters
+        ----------
+        offset : int, optional
+            The offset, in bytes, of the first byte to yield.
+
+        chunk_size : int, optional
+            The maximum size of each piece.  Defaults to the configured
+            ``io_chunk_size``.
+
+        Yields
+        ------
+        chunk : numpy.ndarray
+            A flat uint8 array.  Pieces of uncompressed data are exactly
+            ``chunk_size`` bytes long, except for the last.
+        """
+        if chunk_size is None:
+            chunk_size = get_config().io_chunk_size
+
+        if self._data is not None or self._fd is None or self._fd.is_closed():
+            data = self.data
+            for i in range(offset, len(data), chunk_size):
+                yield data[i:i + chunk_size]
+            return
+
+        fd = self._fd
+
+        def read(position, size):
+            curpos = fd.tell()
+            try:
+                fd.seek(position)
+                return fd.read_into_array(size)
+            finally:
+                fd.seek(curpos)
+
+        if not self.input_compression:
+            for i in range(offset, self._size, chunk_size):
+                yield read(self.data_offset + i, min(chunk_size, self._size - i))
+            return
+
+        compressed = (
+            read(self.data_offset + i, min(fd.block_size, self._size - i)).data
+            for i in range(0, self._size, fd.block_size)
+        )
+        for decoded in mcompression.iter_decompress(
+                compressed, self.input_compression, chunk_size):
+            if offset >= len(decoded):
+                offset -= len(decoded)
+                continue
+            yield np.frombuffer(decoded, np.uint8)[offset:]
+            offset = 0
+
+    def to_shared_memory(self):
+        """
+        Move the data of the block into a new
+        `multiprocessing.shared_memory.SharedMemory` segment, decompressing
+        it if necessary, so that pickling the block (or an array that uses
+        it) refers to the segment rather than copying the data.  Requires
+        Python 3.8 or later.
+
+        The segment stays attached for the lifetime of every process that
+        uses it.  Once no process needs the data any longer, the caller
+        should ``unlink`` the returned segment.
+
+        Returns
+        -------
+        multiprocessing.shared_memory.SharedMemory
+        """
+        from multiprocessing import shared_memory
+
+        if self._shared_memory is None:
+            data = self.data
+            segment = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+            _shared_memory_segments[segment.name] = segment
+            shared = np.ndarray(data.shape, data.dtype, buffer=segment.buf)
+            shared[...] = data
+            self._data = shared
+            self._memmapped = False
+            self._shared_memory = segment
+
+        return self._shared_memory
+
+    def __reduce__(self):
+        # Blocks are pickled as a handle to their data rather than with
+        # the file they were read from, so that a block memory mapped
+        # from a file on disk is memory mapped again from the same file,
+        # and a block in shared memory is attached to the same segment.
+        # The data of any other block is pickled along with it.
+        fd = self._fd
+        filename = getattr(getattr(fd, '_fd', None), 'name', None)
+        if self._shared_memory is not None:
+            source = ('shared_memory', self._shared_memory.name)
+        elif (isinstance(fd, generic_io.RealFile) and isinstance(filename, str) and
+              not self.input_compression and self._data_size > 0 and
+              (self._data is None or isinstance(self._data, np.memmap))):
+            if self._data is not None and self._data.flags.writeable:
+                self._data.flush()
+            mode = 'r+' if 'w' in fd.mode else 'r'
+            source = ('file', os.path.abspath(filename), self.data_offset, mode)
+        else:
+            source = ('data', self.data)
+
+        return (_restore_block, (
+            source, self._data_size, self._array_storage,
+            self._readonly, self._checksum))
+
     def close(self):
-        if self._memmapped and self._data is not None:
+        # Blocks read from memory buffers are "memmapped" as plain
+        # array views, which have nothing to flush or close.
+        if (self._memmapped and self._data is not None and
+                isinstance(self._data, np.memmap)):
             if NUMPY_LT_1_7:  # pragma: no cover
                 try:
                     self._data.flush()
@@ -1196,7 +1488,10 @@ class Block:
                     pass
             else:
                 self._data.flush()
-            if self._data._mmap is not None:
+            # The data of a block read with its neighbours is a slice
+            # of a memmap shared with them, which is closed by the
+            # BlockManager instead.
+            if self._data._mmap is not None and self._data.base is self._data._mmap:
                 self._data._mmap.close()
         self._data = None
 
@@ -1221,11 +1516,17 @@ class UnloadedBlock:
         self._memmapped = False
         self._lazy_load = lazy_load
         self._readonly = readonly
+        self._shared_memory = None
+        self._memmap_source = None
 
     def __len__(self):
         self.load()
         return len(self)
 
+    def __reduce__(self):
+        self.load()
+        return self.__reduce__()
+
     def close(self):
         pass
 
@@ -1247,6 +1548,42 @@ class UnloadedBlock:
         self.read(self._fd)
 
 
+# Shared memory segments created or attached by this process, by name.
+# They are never closed, since arrays that view their memory can outlive
+# any block that refers to them.
+_shared_memory_segments = {}
+
+
+def _attach_shared_memory(name):
+    if name not in _shared_memory_segments:
+        from multiprocessing import shared_memory
+        _shared_memory_segments[name] = shared_memory.SharedMemory(name=name)
+    return _shared_memory_segments[name]
+
+
+def _restore_block(source, data_size, array_storage, readonly, checksum):
+    """
+    Create a block from the handle made by `Block.__reduce__`.
+    """
+    kind = source[0]
+    if kind == 'file':
+        path, offset, mode = source[1:]
+        data = np.memmap(path, mode=mode, offset=offset, shape=data_size)
+    elif kind == 'shared_memory':
+        segment = _attach_shared_memory(source[1])
+        data = np.ndarray((data_size,), np.uint8, buffer=segment.buf)
+    else:
+        data = source[1]
+
+    block = Block(data, array_storage=array_storage)
+    block._memmapped = kind == 'file'
+    block._readonly = readonly
+    block._checksum = checksum
+    if kind == 'shared_memory':
+        block._shared_memory = segment
+    return block
+
+
 def calculate_updated_layout(blocks, tree_size, pad_blocks, block_size):
     """
     Calculates a block layout that will try to use as many blocks as
@@ -1,22 +1,60 @@
 import importlib
-
-from .exploded import implode, explode
-from .to_yaml import to_yaml
-from .defragment import defragment
-from .diff import diff
-from .tags import list_tags
-from .extension import find_extensions
-from .info import info
-from .edit import edit
+import importlib.util
+import sys
+import types
 
 
 __all__ = ['implode', 'explode', 'to_yaml', 'defragment', 'diff', 'list_tags',
     'find_extensions', 'info', 'edit']
 
 
+# The module that implements each command function.  The modules are
+# only imported when a function is first accessed, or by `main` to
+# register the subcommands of asdftool.
+_COMMAND_MODULES = {
+    'implode': 'exploded',
+    'explode': 'exploded',
+    'to_yaml': 'to_yaml',
+    'defragment': 'defragment',
+    'diff': 'diff',
+    'list_tags': 'tags',
+    'find_extensions': 'extension',
+    'info': 'info',
+    'edit': 'edit',
+}
+
+
 # Extracting ASDF-in-FITS files requires Astropy
 if importlib.util.find_spec('astropy'):
-    from .extract import extract_file
-    from .remove_hdu import remove_hdu
+    _COMMAND_MODULES['extract_file'] = 'extract'
+    _COMMAND_MODULES['remove_hdu'] = 'remove_hdu'
 
     __all__ += ['extract_file', 'remove_hdu']
+
+
+class _CommandsModule(types.ModuleType):
+    """
+    Type of this package, which imports the module of each command
+    function when the function is first accessed.
+    """
+    def __getattr__(self, name):
+        if name not in _COMMAND_MODULES:
+            raise AttributeError("module {!r} has no attribute {!r}".format(self.__name__, name))
+
+        module = importlib.import_module('.' + _COMMAND_MODULES[name], self.__name__)
+        value = getattr(module, name)
+        super().__setattr__(name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # Importing a module sets it as an attribute of this package,
+        # which would hide the command function of the same name.
+        if isinstance(value, types.ModuleType) and _COMMAND_MODULES.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_COMMAND_MODULES))
+
+
+sys.modules[__name__].__class__ = _CommandsModule
@@ -550,18 +550,16 @@ def copy_binary_blocks(ofd, ifd, yaml_version):
                 ofd.write(chunk)
 
         alloc = struct.unpack(">Q", header[alloc_loc : alloc_loc + 8])[0]
-        while alloc >= chunk_sz:
-            chunk = ifd.read(chunk_sz)
-            if len(chunk) == 0:
-                print("Error: Invalid reading of binary block {block_num}.")
-                print("       Exiting ...")
-                sys.exit(1)
-            ofd.write(chunk)
-            alloc -= chunk_sz
-
-        if alloc > 0:
-            chunk = ifd.read(alloc)
-            ofd.write(chunk)
+        start = ifd.tell()
+        try:
+            # Copied inside the kernel where the platform supports it.
+            generic_io.RealFile(ofd, "w").copy_from(
+                generic_io.RealFile(ifd, "r"), start, alloc)
+        except IOError:
+            print("Error: Invalid reading of binary block {block_num}.")
+            print("       Exiting ...")
+            sys.exit(1)
+        ifd.seek(start + alloc)
         block_num += 1
 
     if len(block_index) > 0:
@@ -3,7 +3,11 @@ Implementation of command for reporting information about installed extensions.
 """
 
 import sys
-from pkg_resources import iter_entry_points
+
+if sys.version_info < (3, 10):
+    from importlib_metadata import entry_points
+else:
+    from importlib.metadata import entry_points
 
 from .main import Command
 
@@ -38,9 +42,9 @@ class QueryExtension(Command): # pragma: no cover
 
 
 def _format_entry_point(ep):
-    extension_class = "{}.{}".format(ep.module_name, ep.attrs[0])
-    return "Extension Name: '{}' (from {}) Class: {}".format(
-        ep.name, ep.dist, extension_class)
+    extension_class = "{}.{}".format(ep.module, ep.attr)
+    return "Extension Name: '{}' (from {} {}) Class: {}".format(
+        ep.name, ep.dist.name, ep.dist.version, extension_class)
 
 
 def _format_type_name(typ):
@@ -64,7 +68,7 @@ def _print_extension_details(ext, tags_only):
 
 
 def find_extensions(summary, tags_only):
-    for ep in iter_entry_points(group='asdf_extensions'):
+    for ep in entry_points(group='asdf_extensions'):
         print(_format_entry_point(ep))
         if not summary:
             _print_extension_details(ep.load()(), tags_only)
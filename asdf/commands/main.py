@@ -19,6 +19,17 @@ class Command:
         raise NotImplementedError()
 
 
+def _load_commands():
+    """
+    Import the modules of the subcommands, which registers their `Command`
+    subclasses.
+    """
+    from .. import commands
+
+    for name in commands.__all__:
+        getattr(commands, name)
+
+
 def make_argparser():
     """
     Most of the real work is handled by the subcommands in the
@@ -44,6 +55,7 @@ def make_argparser():
         str("help"), help="Display usage information")
     help_parser.set_defaults(func=help)
 
+    _load_commands()
     commands = dict((x.__name__, x) for x in util.iter_subclasses(Command))
 
     for command in command_order:
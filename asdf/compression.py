@@ -2,6 +2,8 @@ import struct
 
 import numpy as np
 
+from . import util
+
 
 DEFAULT_BLOCK_SIZE = 1 << 22  #: Decompressed block size in bytes, 4MiB
 
@@ -158,6 +160,85 @@ def to_compression_header(compression):
     return compression
 
 
+def _iter_blocks(data, block_size):
+    """
+    Split data into pieces of ``block_size`` bytes.  Arrays are split
+    into views of their data when contiguous, and otherwise copied a
+    piece at a time, so the data is never copied in full.
+    """
+    if isinstance(data, np.ndarray):
+        if not (data.flags.c_contiguous or data.flags.f_contiguous):
+            pending = bytearray()
+            for chunk in util.iter_array_chunks(data, block_size):
+                pending += np.ascontiguousarray(chunk).tobytes()
+                while len(pending) >= block_size:
+                    yield bytes(pending[:block_size])
+                    del pending[:block_size]
+            if pending:
+                yield bytes(pending)
+            return
+
+        data = data.ravel(order='K').view(np.uint8)
+
+    for i in range(0, len(data), block_size):
+        yield data[i:i+block_size]
+
+
+def _iter_decoded(decoder, data, max_length):
+    """
+    Decode a piece of compressed data, in pieces of at most
+    ``max_length`` bytes when the decoder can limit its output.
+    """
+    if hasattr(decoder, 'unconsumed_tail'):
+        # zlib
+        while data:
+            yield decoder.decompress(data, max_length)
+            data = decoder.unconsumed_tail
+    elif hasattr(decoder, 'needs_input'):
+        # bz2
+        yield decoder.decompress(data, max_length)
+        while not (decoder.needs_input or decoder.eof):
+            yield decoder.decompress(b'', max_length)
+    else:
+        yield decoder.decompress(data)
+
+
+def iter_decompress(blocks, compression, max_length=DEFAULT_BLOCK_SIZE):
+    """
+    Decompress binary data a piece at a time.
+
+    Parameters
+    ----------
+    blocks : iterable of bytes
+         The compressed data, in pieces of any size.
+
+    compression : str
+         The compression type used.
+
+    max_length : int, optional
+         The maximum size of each piece of decompressed data, for the
+         compression types that can limit it.  Pieces of lz4 data are
+         decompressed one compressed block at a time.
+
+    Yields
+    ------
+    decoded : bytes
+         A piece of the decompressed data.
+    """
+    compression = validate(compression)
+    decoder = _get_decoder(compression)
+
+    for block in blocks:
+        for decoded in _iter_decoded(decoder, block, max_length):
+            if decoded:
+                yield decoded
+
+    if hasattr(decoder, 'flush'):
+        decoded = decoder.flush()
+        if decoded:
+            yield decoded
+
+
 def decompress(fd, used_size, data_size, compression):
     """
     Decompress binary data in a file
@@ -183,19 +264,8 @@ def decompress(fd, used_size, data_size, compression):
     """
     buffer = np.empty((data_size,), np.uint8)
 
-    compression = validate(compression)
-    decoder = _get_decoder(compression)
-
     i = 0
-    for block in fd.read_blocks(used_size):
-        decoded = decoder.decompress(block)
-        if i + len(decoded) > data_size:
-            raise ValueError("Decompressed data too long")
-        buffer.data[i:i+len(decoded)] = decoded
-        i += len(decoded)
-
-    if hasattr(decoder, 'flush'):
-        decoded = decoder.flush()
+    for decoded in iter_decompress(fd.read_blocks(used_size), compression):
         if i + len(decoded) > data_size:
             raise ValueError("Decompressed data too long")
         buffer.data[i:i+len(decoded)] = decoded
@@ -228,14 +298,8 @@ def compress(fd, data, compression, block_size=DEFAULT_BLOCK_SIZE):
     compression = validate(compression)
     encoder = _get_encoder(compression)
 
-    # We can have numpy arrays here. While compress() will work with them,
-    # it is impossible to split them into fixed size blocks without converting
-    # them to bytes.
-    if isinstance(data, np.ndarray):
-        data = data.tobytes()
-
-    for i in range(0, len(data), block_size):
-        fd.write(encoder.compress(data[i:i+block_size]))
+    for block in _iter_blocks(data, block_size):
+        fd.write(encoder.compress(block))
     if hasattr(encoder, "flush"):
         fd.write(encoder.flush())
 
@@ -263,8 +327,8 @@ def get_compressed_size(data, compression, block_size=DEFAULT_BLOCK_SIZE):
     encoder = _get_encoder(compression)
 
     l = 0
-    for i in range(0, len(data), block_size):
-        l += len(encoder.compress(data[i:i+block_size]))
+    for block in _iter_blocks(data, block_size):
+        l += len(encoder.compress(block))
     if hasattr(encoder, "flush"):
         l += len(encoder.flush())
 
@@ -20,6 +20,9 @@ __all__ = ["AsdfConfig", "get_config", "config_context"]
 DEFAULT_VALIDATE_ON_READ = True
 DEFAULT_DEFAULT_VERSION = str(versioning.default_version)
 DEFAULT_LEGACY_FILL_SCHEMA_DEFAULTS = True
+DEFAULT_IO_CHUNK_SIZE = 1 << 24  #: 16 MiB
+DEFAULT_SCHEMA_CACHE_DIR = None
+DEFAULT_PLUGIN_CACHE_DIR = None
 
 
 class AsdfConfig:
@@ -36,6 +39,9 @@ class AsdfConfig:
         self._validate_on_read = DEFAULT_VALIDATE_ON_READ
         self._default_version = DEFAULT_DEFAULT_VERSION
         self._legacy_fill_schema_defaults = DEFAULT_LEGACY_FILL_SCHEMA_DEFAULTS
+        self._io_chunk_size = DEFAULT_IO_CHUNK_SIZE
+        self._schema_cache_dir = DEFAULT_SCHEMA_CACHE_DIR
+        self._plugin_cache_dir = DEFAULT_PLUGIN_CACHE_DIR
 
         self._lock = threading.RLock()
 
@@ -53,7 +59,7 @@ class AsdfConfig:
         if self._resource_mappings is None:
             with self._lock:
                 if self._resource_mappings is None:
-                    self._resource_mappings = entry_points.get_resource_mappings()
+                    self._resource_mappings = entry_points.get_resource_mappings(self.plugin_cache_dir)
         return self._resource_mappings
 
     def add_resource_mapping(self, mapping):
@@ -146,7 +152,7 @@ class AsdfConfig:
         if self._extensions is None:
             with self._lock:
                 if self._extensions is None:
-                    self._extensions = entry_points.get_extensions()
+                    self._extensions = entry_points.get_extensions(self.plugin_cache_dir)
         return self._extensions
 
     def add_extension(self, extension):
@@ -212,7 +218,7 @@ class AsdfConfig:
 
         Returns
         -------
-        bool
+        bool or str
         """
         return self._validate_on_read
 
@@ -221,12 +227,17 @@ class AsdfConfig:
         """
         Set the configuration that controls schema validation of
         ASDF files on read.  If `True`, newly opened files will
-        be validated.
+        be validated.  If ``'lazy'``, each tagged node of a newly
+        opened file will be validated against the schema for its
+        tag just before it is converted to a custom object, and
+        errors will be raised at that point.
 
         Parameters
         ----------
-        value : bool
+        value : bool or str
         """
+        if isinstance(value, str) and value != 'lazy':
+            raise ValueError("validate_on_read must be True, False or 'lazy'")
         self._validate_on_read = value
 
     @property
@@ -281,17 +292,106 @@ class AsdfConfig:
         """
         self._legacy_fill_schema_defaults = value
 
+    @property
+    def io_chunk_size(self):
+        """
+        Get the maximum size, in bytes, of the temporary buffers
+        used to copy array data that can not be written to a file
+        directly, such as non-contiguous or broadcast arrays.
+
+        Returns
+        -------
+        int
+        """
+        return self._io_chunk_size
+
+    @io_chunk_size.setter
+    def io_chunk_size(self, value):
+        """
+        Set the maximum size, in bytes, of the temporary buffers
+        used to copy array data.
+
+        Parameters
+        ----------
+        value : int
+        """
+        if value < 1:
+            raise ValueError("io_chunk_size must be a positive integer")
+        self._io_chunk_size = int(value)
+
+    @property
+    def schema_cache_dir(self):
+        """
+        Get the directory used to cache parsed schemas between
+        processes, or `None` if schemas are parsed from their
+        YAML content every time.  Only schemas provided by resource
+        mappings are cached.  The directory should not be writable
+        by other users.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._schema_cache_dir
+
+    @schema_cache_dir.setter
+    def schema_cache_dir(self, value):
+        """
+        Set the directory used to cache parsed schemas.  The
+        directory is created when the first schema is cached.
+
+        Parameters
+        ----------
+        value : str, pathlib.Path or None
+        """
+        self._schema_cache_dir = None if value is None else str(value)
+
+    @property
+    def plugin_cache_dir(self):
+        """
+        Get the directory used to cache the entry points of installed
+        plugins between processes, or `None` if they are read from the
+        metadata of the installed distributions in every process.
+        Entries are keyed by the names and versions of the installed
+        distributions, so installing, removing or upgrading a package
+        invalidates them.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._plugin_cache_dir
+
+    @plugin_cache_dir.setter
+    def plugin_cache_dir(self, value):
+        """
+        Set the directory used to cache the entry points of installed
+        plugins.  The directory is created when the entry points are
+        first cached.
+
+        Parameters
+        ----------
+        value : str, pathlib.Path or None
+        """
+        self._plugin_cache_dir = None if value is None else str(value)
+
     def __repr__(self):
         return (
             "<AsdfConfig\n"
             "  validate_on_read: {}\n"
             "  default_version: {}\n"
             "  legacy_fill_schema_defaults: {}\n"
+            "  io_chunk_size: {}\n"
+            "  schema_cache_dir: {}\n"
+            "  plugin_cache_dir: {}\n"
             ">"
         ).format(
             self.validate_on_read,
             self.default_version,
             self.legacy_fill_schema_defaults,
+            self.io_chunk_size,
+            self.schema_cache_dir,
+            self.plugin_cache_dir,
         )
 
 
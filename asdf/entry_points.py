@@ -1,6 +1,18 @@
-from pkg_resources import iter_entry_points
+from collections import namedtuple
+import functools
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
 import warnings
 
+if sys.version_info < (3, 10):
+    from importlib_metadata import entry_points, EntryPoint
+else:
+    from importlib.metadata import entry_points, EntryPoint
+
 from .exceptions import AsdfWarning
 from .resource import ResourceMappingProxy
 from .extension import ExtensionProxy
@@ -10,22 +22,230 @@ RESOURCE_MAPPINGS_GROUP = "asdf.resource_mappings"
 EXTENSIONS_GROUP = "asdf.extensions"
 LEGACY_EXTENSIONS_GROUP = "asdf_extensions"
 
+_GROUPS = [RESOURCE_MAPPINGS_GROUP, EXTENSIONS_GROUP, LEGACY_EXTENSIONS_GROUP]
+
+
+# An entry point of one of the groups above, with the name and
+# version of the distribution that registered it.
+_PluginEntryPoint = namedtuple("_PluginEntryPoint", ["name", "value", "package_name", "package_version"])
+
+
+# Fingerprint of the installed distributions, path of the file that
+# caches what was discovered about them, or `None`, and the discovered
+# content: the entry points of each group, and the metadata of the
+# extensions registered by each entry point of the extensions group
+# that has been loaded.
+_discovered = None
+_discovered_lock = threading.Lock()
+
 
-def get_resource_mappings():
-    return _list_entry_points(RESOURCE_MAPPINGS_GROUP, ResourceMappingProxy)
+def get_resource_mappings(cache_dir=None):
+    return _list_entry_points(RESOURCE_MAPPINGS_GROUP, ResourceMappingProxy, cache_dir)
 
 
-def get_extensions():
-    extensions = _list_entry_points(EXTENSIONS_GROUP, ExtensionProxy)
-    legacy_extensions = _list_entry_points(LEGACY_EXTENSIONS_GROUP, ExtensionProxy)
+def get_extensions(cache_dir=None):
+    extensions = _list_entry_points(EXTENSIONS_GROUP, ExtensionProxy, cache_dir)
+    legacy_extensions = _list_entry_points(LEGACY_EXTENSIONS_GROUP, ExtensionProxy, cache_dir)
 
     return extensions + legacy_extensions
 
 
-def _list_entry_points(group, proxy_class):
+def _distributions_fingerprint():
+    """
+    Get a summary of the distributions installed on `sys.path`.
+    The names of their metadata directories include the distribution
+    name and version, so listing the path entries is enough to tell
+    that a package has been installed, removed or upgraded, without
+    reading the metadata of every distribution.
+    """
+    fingerprint = []
+    for path in sys.path:
+        try:
+            with os.scandir(path or ".") as it:
+                for entry in it:
+                    if entry.name.endswith((".dist-info", ".egg-info", ".egg-link")):
+                        fingerprint.append((path, entry.name, entry.stat().st_mtime_ns))
+        except OSError:
+            fingerprint.append((path, None, None))
+    return fingerprint
+
+
+def _scan_entry_points():
+    """
+    Read the entry points of every plugin group from the installed
+    distributions' metadata.
+    """
+    points = entry_points()
+    result = {}
+    for group in _GROUPS:
+        result[group] = [
+            _PluginEntryPoint(e.name, e.value, e.dist.name, e.dist.version)
+            for e in points.select(group=group)
+        ]
+    return result
+
+
+def _get_cache_path(cache_dir, fingerprint):
+    key = hashlib.sha256(json.dumps(fingerprint).encode("utf-8"))
+    return os.path.join(cache_dir, "entry-points-{}.json".format(key.hexdigest()))
+
+
+def _read_cache(path):
+    """
+    Read discovered entry points and extension metadata from the
+    cache, or return `None` if they aren't there or can't be read.
+    """
+    try:
+        with open(path, "r") as fd:
+            content = json.load(fd)
+        return {
+            "entry_points": {
+                group: [_PluginEntryPoint(*e) for e in content["entry_points"][group]]
+                for group in _GROUPS
+            },
+            "metadata": dict(content["metadata"]),
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cache(path, content):
+    """
+    Write discovered entry points and extension metadata to the
+    cache.  Failures are ignored, since the cache is only an
+    optimization.
+    """
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so that other processes never
+        # see a partially written entry.
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(content, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _discover(cache_dir=None):
+    """
+    Get the discovered content for the installed distributions.  The
+    result of scanning them is kept for the lifetime of the process,
+    and in ``cache_dir`` between processes, and is discarded when the
+    fingerprint of the installed distributions changes.
+    """
+    global _discovered
+
+    fingerprint = _distributions_fingerprint()
+    with _discovered_lock:
+        if _discovered is None or _discovered[0] != fingerprint:
+            content = None
+            cache_path = None
+            if cache_dir is not None:
+                cache_path = _get_cache_path(cache_dir, fingerprint)
+                content = _read_cache(cache_path)
+            if content is None:
+                content = {"entry_points": _scan_entry_points(), "metadata": {}}
+                if cache_path is not None:
+                    _write_cache(cache_path, content)
+            _discovered = (fingerprint, cache_path, content)
+
+        return _discovered
+
+
+def _discover_entry_points(group, cache_dir=None):
+    """
+    Get the entry points of a plugin group.
+    """
+    return _discover(cache_dir)[2]["entry_points"][group]
+
+
+def _get_metadata_key(entry_point):
+    return "{} = {}".format(entry_point.name, entry_point.value)
+
+
+def _get_extension_metadata(entry_point, cache_dir=None):
+    """
+    Get the metadata recorded for the extensions of an entry point
+    of the extensions group, or `None` if it hasn't been loaded yet.
+    """
+    return _discover(cache_dir)[2]["metadata"].get(_get_metadata_key(entry_point))
+
+
+def _record_extension_metadata(entry_point, metadata, cache_dir=None):
+    """
+    Record the metadata of the extensions of an entry point of the
+    extensions group, so that later discoveries can defer loading it.
+    """
+    _, cache_path, content = _discover(cache_dir)
+    with _discovered_lock:
+        content["metadata"][_get_metadata_key(entry_point)] = metadata
+        if cache_path is not None:
+            _write_cache(cache_path, content)
+
+
+def _warn_load_failure(group, package_name, package_version, e):
+    warnings.warn(
+        "{} plugin from package {}=={} failed to load:\n\n"
+        "{}: {}".format(
+            group,
+            package_name,
+            package_version,
+            e.__class__.__name__,
+            e,
+        ),
+        AsdfWarning
+    )
+
+
+def _make_deferred_loader(entry_point, group, proxy_class):
+    """
+    Create a function that returns an element of an entry point's list
+    of plugins, loading the entry point the first time it is called.
+    Like a plugin that fails to load when it is listed, an element that
+    fails to load, or that ``proxy_class`` rejects, is warned about and
+    skipped, by returning `None`.
+    """
+    elements = None
+    lock = threading.Lock()
+
+    def load(index):
+        nonlocal elements
+        with lock:
+            if elements is None:
+                try:
+                    result = EntryPoint(entry_point.name, entry_point.value, group).load()()
+                    elements = result if isinstance(result, list) else [result]
+                except Exception as e:
+                    _warn_load_failure(group, entry_point.package_name, entry_point.package_version, e)
+                    elements = False
+        if elements is False:
+            return None
+
+        try:
+            if index >= len(elements):
+                raise ValueError(
+                    "Entry point returned {} elements, where {} were recorded; "
+                    "the cached plugin metadata may be out of date".format(len(elements), index + 1))
+            element = elements[index]
+            proxy_class(element)
+        except Exception as e:
+            _warn_load_failure(group, entry_point.package_name, entry_point.package_version, e)
+            return None
+        return element
+
+    return load
+
+
+def _list_entry_points(group, proxy_class, cache_dir=None):
     results = []
 
-    entry_points = list(iter_entry_points(group=group))
+    points = _discover_entry_points(group, cache_dir)
 
     # The order of plugins may be significant, since in the case of
     # duplicate functionality the first plugin in the list takes
@@ -33,37 +253,49 @@ def _list_entry_points(group, proxy_class):
     # in a consistent way across systems so we explicitly sort
     # by package name.  Plugins from this package are placed
     # at the end so that other packages can override them.
-    asdf_entry_points = [e for e in entry_points if e.dist.project_name == "asdf"]
-    other_entry_points = sorted([e for e in entry_points if e.dist.project_name != "asdf"], key=lambda e: e.dist.project_name)
+    asdf_entry_points = [e for e in points if e.package_name == "asdf"]
+    other_entry_points = sorted([e for e in points if e.package_name != "asdf"], key=lambda e: e.package_name)
 
     for entry_point in other_entry_points + asdf_entry_points:
-        package_name = entry_point.dist.project_name
-        package_version = entry_point.dist.version
+        package_name = entry_point.package_name
+        package_version = entry_point.package_version
+
+        # Extensions whose tags and types were recorded when the entry
+        # point was last loaded are only loaded when they are needed.
+        if group == EXTENSIONS_GROUP:
+            metadata = _get_extension_metadata(entry_point, cache_dir)
+            if metadata is not None:
+                load = _make_deferred_loader(entry_point, group, proxy_class)
+                for index, element_metadata in enumerate(metadata):
+                    results.append(proxy_class._deferred(
+                        functools.partial(load, index),
+                        element_metadata,
+                        package_name=package_name,
+                        package_version=package_version,
+                    ))
+                continue
 
         def _handle_error(e):
-            warnings.warn(
-                "{} plugin from package {}=={} failed to load:\n\n"
-                "{}: {}".format(
-                    group,
-                    package_name,
-                    package_version,
-                    e.__class__.__name__,
-                    e,
-                ),
-                AsdfWarning
-            )
+            _warn_load_failure(group, package_name, package_version, e)
 
         try:
-            elements = entry_point.load()()
+            elements = EntryPoint(entry_point.name, entry_point.value, group).load()()
 
             if not isinstance(elements, list):
                 elements = [elements]
 
+            proxies = []
             for element in elements:
                 try:
-                    results.append(proxy_class(element, package_name=package_name, package_version=package_version))
+                    proxies.append(proxy_class(element, package_name=package_name, package_version=package_version))
                 except Exception as e:
                     _handle_error(e)
+            results.extend(proxies)
+
+            if group == EXTENSIONS_GROUP and len(proxies) == len(elements):
+                metadata = [p._get_metadata() for p in proxies]
+                if all(m is not None for m in metadata):
+                    _record_extension_metadata(entry_point, metadata, cache_dir)
         except Exception as e:
             _handle_error(e)
     return results
@@ -107,6 +107,8 @@ class ExtensionProxy(Extension, AsdfExtension):
         self._delegate = delegate
         self._package_name = package_name
         self._package_version = package_version
+        self._load_delegate = None
+        self._metadata = None
 
         self._class_name = get_class_name(delegate)
 
@@ -147,6 +149,87 @@ class ExtensionProxy(Extension, AsdfExtension):
         # properties to already be available.
         self._converters = [ConverterProxy(c, self) for c in getattr(self._delegate, "converters", [])]
 
+    @classmethod
+    def _deferred(cls, load_delegate, metadata, package_name=None, package_version=None):
+        """
+        Create a proxy from metadata previously returned by
+        `_get_metadata`, which calls ``load_delegate`` to create
+        the extension the first time its tags or converters
+        are needed.  ``load_delegate`` returns `None` if the
+        extension fails to load.
+        """
+        proxy = cls.__new__(cls)
+        proxy._delegate = None
+        proxy._package_name = package_name
+        proxy._package_version = package_version
+        proxy._load_delegate = load_delegate
+        proxy._metadata = metadata
+
+        proxy._class_name = metadata["class_name"]
+        proxy._legacy = False
+        proxy._legacy_class_names = set(metadata["legacy_class_names"])
+        proxy._asdf_standard_requirement = SpecifierSet(metadata["asdf_standard_requirement"])
+        return proxy
+
+    def _load(self):
+        if self._delegate is None and self._load_delegate is not None:
+            delegate = self._load_delegate()
+            if delegate is None:
+                # The plugin failed to load, which has been warned
+                # about, so the extension is left without tags or
+                # converters.
+                self._load_delegate = None
+                self._tags = []
+                self._converters = []
+            else:
+                ExtensionProxy.__init__(self, delegate, self._package_name, self._package_version)
+
+    def _get_metadata(self):
+        """
+        Get the information that `ExtensionManager` needs to index
+        the extension without loading it, or `None` if the extension
+        can't be deferred, because it is (or has the features of) a
+        legacy extension.
+
+        Returns
+        -------
+        dict or None
+        """
+        if self._metadata is not None:
+            return self._metadata
+
+        if self.legacy or self.types or self.tag_mapping or self.url_mapping:
+            return None
+
+        return {
+            "class_name": self.class_name,
+            "extension_uri": self.extension_uri,
+            "legacy_class_names": sorted(self.legacy_class_names),
+            "asdf_standard_requirement": str(self.asdf_standard_requirement),
+            "tags": [t.tag_uri for t in self.tags],
+            "converters": [
+                {
+                    "tags": list(c.tags),
+                    "types": [t if isinstance(t, str) else get_class_name(t, instance=False) for t in c.types],
+                }
+                for c in self.converters
+            ],
+        }
+
+    @property
+    def deferred(self):
+        """
+        Get the extension's deferred flag.  `True` if the extension
+        was installed with a plugin that hasn't been loaded yet, in
+        which case its tags and converters are loaded the first
+        time they are accessed.
+
+        Returns
+        -------
+        bool
+        """
+        return self._delegate is None and self._load_delegate is not None
+
     @property
     def extension_uri(self):
         """
@@ -158,6 +241,8 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         str or None
         """
+        if self._delegate is None:
+            return self._metadata["extension_uri"]
         return getattr(self._delegate, "extension_uri", None)
 
     @property
@@ -194,6 +279,7 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         list of asdf.extension.Converter
         """
+        self._load()
         return self._converters
 
     @property
@@ -205,6 +291,7 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         list of asdf.extension.TagDefinition
         """
+        self._load()
         return self._tags
 
     @property
@@ -216,6 +303,8 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         iterable of asdf.type.ExtensionType
         """
+        if self._delegate is None:
+            return []
         return getattr(self._delegate, "types", [])
 
     @property
@@ -227,6 +316,8 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         iterable of tuple or callable
         """
+        if self._delegate is None:
+            return []
         return getattr(self._delegate, "tag_mapping", [])
 
     @property
@@ -238,6 +329,8 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         iterable of tuple or callable
         """
+        if self._delegate is None:
+            return []
         return getattr(self._delegate, "url_mapping", [])
 
     @property
@@ -249,6 +342,7 @@ class ExtensionProxy(Extension, AsdfExtension):
         -------
         asdf.extension.Extension or asdf.extension.AsdfExtension
         """
+        self._load()
         return self._delegate
 
     @property
@@ -300,12 +394,20 @@ class ExtensionProxy(Extension, AsdfExtension):
 
     def __eq__(self, other):
         if isinstance(other, ExtensionProxy):
+            if other is self:
+                return True
+            # Avoid loading deferred extensions that can't be equal
+            if hash(other) != hash(self):
+                return False
             return other.delegate is self.delegate
         else:
             return False
 
     def __hash__(self):
-        return hash(id(self.delegate))
+        # Hash values that are known without loading a deferred
+        # extension, and that are equal for proxies of the same
+        # extension instance.
+        return hash((self.extension_uri, self.class_name))
 
     def __repr__(self):
         if self.package_name is None:
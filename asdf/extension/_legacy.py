@@ -203,6 +203,10 @@ class BuiltinExtension:
     """
     @property
     def types(self):
+        # The built-in types register themselves when their modules
+        # are imported, which ``import asdf`` no longer does.
+        from .. import reference, stream  # noqa: F401
+        from ..tags.core import external_reference  # noqa: F401
         return types._all_asdftypes
 
     @property
@@ -1,14 +1,25 @@
+from collections import namedtuple
 from functools import lru_cache
 
 from ._extension import ExtensionProxy
 from ..util import get_class_name
 
 
+# Stands in for a tag definition or converter of a deferred extension
+# in the indexes, until the extension is loaded.  ``attribute`` is the
+# name of the ExtensionProxy property that lists the item.
+_DeferredItem = namedtuple("_DeferredItem", ["extension", "attribute", "index"])
+
+
 class ExtensionManager:
     """
     Wraps a list of extensions and indexes their converters
     by tag and by Python type.
 
+    Deferred extensions are indexed by the tags and type names recorded
+    when their plugin was last loaded, and are only loaded when one
+    of their tags or types is requested.
+
     Parameters
     ----------
     extensions : iterable of asdf.extension.Extension
@@ -23,7 +34,14 @@ class ExtensionManager:
         # This dict has both str and type keys:
         self._converters_by_type = {}
 
+        self._index_extensions()
+
+    def _index_extensions(self):
         for extension in self._extensions:
+            if extension.deferred:
+                self._index_deferred_extension(extension)
+                continue
+
             for tag_def in extension.tags:
                 if tag_def.tag_uri not in self._tag_defs_by_tag:
                     self._tag_defs_by_tag[tag_def.tag_uri] = tag_def
@@ -45,6 +63,48 @@ class ExtensionManager:
                                 self._converters_by_type[typ] = converter
                                 self._converters_by_type[type_class_name] = converter
 
+    def _index_deferred_extension(self, extension):
+        metadata = extension._get_metadata()
+        for index, tag in enumerate(metadata["tags"]):
+            if tag not in self._tag_defs_by_tag:
+                self._tag_defs_by_tag[tag] = _DeferredItem(extension, "tags", index)
+        for index, converter in enumerate(metadata["converters"]):
+            if len(converter["tags"]) > 0:
+                item = _DeferredItem(extension, "converters", index)
+                for tag in converter["tags"]:
+                    if tag not in self._converters_by_tag:
+                        self._converters_by_tag[tag] = item
+                # Deferred types are only known by class name
+                for type_class_name in converter["types"]:
+                    if type_class_name not in self._converters_by_type:
+                        self._converters_by_type[type_class_name] = item
+
+    def _resolve(self, index, key):
+        """
+        Get an item from one of the indexes, loading its
+        extension if it was deferred.
+        """
+        item = index[key]
+        if isinstance(item, _DeferredItem):
+            items = getattr(item.extension, item.attribute)
+            if item.index >= len(items):
+                # The extension failed to load (with a warning), or no
+                # longer matches the metadata it was indexed by, so it
+                # is dropped, as it would have been had it been loaded
+                # up front, and the key falls to the next extension.
+                self._drop_extension(item.extension)
+                return self._resolve(index, key)
+            item = items[item.index]
+            index[key] = item
+        return item
+
+    def _drop_extension(self, extension):
+        self._extensions = [e for e in self._extensions if e is not extension]
+        self._tag_defs_by_tag.clear()
+        self._converters_by_tag.clear()
+        self._converters_by_type.clear()
+        self._index_extensions()
+
     @property
     def extensions(self):
         """
@@ -109,7 +169,7 @@ class ExtensionManager:
             Unrecognized tag URI.
         """
         try:
-            return self._tag_defs_by_tag[tag]
+            return self._resolve(self._tag_defs_by_tag, tag)
         except KeyError:
             raise KeyError(
                 "No support available for YAML tag '{}'.  "
@@ -137,7 +197,7 @@ class ExtensionManager:
             Unrecognized tag URI.
         """
         try:
-            return self._converters_by_tag[tag]
+            return self._resolve(self._converters_by_tag, tag)
         except KeyError:
             raise KeyError(
                 "No support available for YAML tag '{}'.  "
@@ -164,11 +224,11 @@ class ExtensionManager:
             Unrecognized type.
         """
         try:
-            return self._converters_by_type[typ]
+            return self._resolve(self._converters_by_type, typ)
         except KeyError:
             class_name = get_class_name(typ, instance=False)
             try:
-                return self._converters_by_type[class_name]
+                return self._resolve(self._converters_by_type, class_name)
             except KeyError:
                 raise KeyError(
                     "No support available for Python type '{}'.  "
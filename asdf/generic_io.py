@@ -15,7 +15,6 @@ import math
 import pathlib
 import tempfile
 import platform
-from distutils.version import LooseVersion
 
 from os import SEEK_SET, SEEK_CUR, SEEK_END
 
@@ -23,6 +22,7 @@ import http.client
 from urllib.request import url2pathname
 
 import numpy as np
+from packaging.version import parse as parse_version
 
 from . import util
 from .extern import atomicfile
@@ -64,7 +64,7 @@ def _check_bytes(fd, mode):
 
 
 if (sys.platform == 'darwin' and
-    LooseVersion(platform.mac_ver()[0]) < LooseVersion('10.9')):  # pragma: no cover
+    parse_version(platform.mac_ver()[0]) < parse_version('10.9')):  # pragma: no cover
     def _array_fromfile(fd, size):
         chunk_size = 1024 ** 3
         if size < chunk_size:
@@ -138,6 +138,57 @@ array : Numpy array
 """
 
 
+def _iter_array_chunks(array):
+    """
+    Split an array into contiguous pieces that can be written to a
+    file, copying no more than the configured ``io_chunk_size`` at a
+    time.
+    """
+    # Imported here to avoid a circular import
+    from .config import get_config
+    return util.iter_array_chunks(array, get_config().io_chunk_size)
+
+
+def _copy_file_range(src, dst, src_offset, dst_offset, size):
+    """
+    Copy bytes between two file descriptors inside the kernel, using
+    `os.copy_file_range` or, failing that, `os.sendfile`, so that the
+    data never passes through user space.
+
+    Returns the number of bytes copied.  This is less than ``size``
+    when neither call is supported for this pair of files, in which
+    case the caller is expected to copy the remainder itself.
+    """
+    copied = 0
+
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < size:
+                count = os.copy_file_range(
+                    src, dst, size - copied,
+                    src_offset + copied, dst_offset + copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            pass
+
+    # sendfile can only write to regular files on Linux
+    if copied < size and sys.platform.startswith('linux'):
+        try:
+            os.lseek(dst, dst_offset + copied, SEEK_SET)
+            while copied < size:
+                count = os.sendfile(
+                    dst, src, src_offset + copied, size - copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            pass
+
+    return copied
+
+
 def resolve_uri(base, uri):
     """
     Resolve a URI against a base URI.
@@ -370,7 +421,36 @@ class GenericFile(metaclass=util.InheritDocstrings):
     """
 
     def write_array(self, array):
-        _array_tofile(None, self.write, array.ravel(order='K'))
+        for chunk in _iter_array_chunks(array):
+            _array_tofile(None, self.write, chunk)
+
+    def copy_from(self, fd, offset, size):
+        """
+        Copy a range of bytes from another file to the current
+        position in this file.  The position of the source file is
+        left unchanged.
+
+        Parameters
+        ----------
+        fd : GenericFile
+            The file to copy from.
+
+        offset : int
+            The offset of the first byte to copy in ``fd``.
+
+        size : int
+            The number of bytes to copy.
+        """
+        curpos = fd.tell()
+        try:
+            fd.seek(offset)
+            for block in fd.read_blocks(size):
+                self.write(block)
+                size -= len(block)
+            if size > 0:
+                raise IOError("Unexpected end of file")
+        finally:
+            fd.seek(curpos)
 
     def seek(self, offset, whence=0):
         """
@@ -749,7 +829,22 @@ class RealFile(RandomAccessFile):
             arr.flush()
             self.fast_forward(len(arr.data))
         else:
-            _array_tofile(self._fd, self._fd.write, arr.ravel(order='K'))
+            for chunk in _iter_array_chunks(arr):
+                _array_tofile(self._fd, self._fd.write, chunk)
+
+    def copy_from(self, fd, offset, size):
+        if isinstance(fd, RealFile) and fd is not self:
+            fd.flush()
+            self.flush()
+            start = self.tell()
+            copied = _copy_file_range(
+                fd._fd.fileno(), self._fd.fileno(), offset, start, size)
+            self.seek(start + copied)
+            offset += copied
+            size -= copied
+
+        if size > 0:
+            super(RealFile, self).copy_from(fd, offset, size)
 
     def can_memmap(self):
         return True
@@ -780,16 +875,88 @@ class MemoryIO(RandomAccessFile):
         self._size = fd.tell()
         fd.seek(tell, 0)
 
+    def can_memmap(self):
+        # Arrays can only share memory with the buffer when we're not
+        # going to write to it, since an `io.BytesIO` can not be
+        # resized while views of its content exist.
+        return self._mode == 'r' and hasattr(self._fd, 'getbuffer')
+
+    def memmap_array(self, offset, size):
+        # This isn't really a memmap, but a read-only view of the
+        # buffer, which serves the same purpose of avoiding a copy.
+        array = np.frombuffer(self._fd.getbuffer(), np.uint8, size, offset)
+        array.flags.writeable = False
+        return array
+
     def read_into_array(self, size):
-        buf = self._fd.getvalue()
+        if not hasattr(self._fd, 'getbuffer'):
+            return super(MemoryIO, self).read_into_array(size)
+
         offset = self._fd.tell()
-        result = np.frombuffer(buf, np.uint8, size, offset)
+        result = np.frombuffer(self._fd.getbuffer(), np.uint8, size, offset)
         # Copy the buffer so the original memory can be released.
         result = result.copy()
-        self.seek(size, SEEK_CUR)
+        self.seek(offset + len(result), SEEK_SET)
         return result
 
 
+class _BufferReader(io.RawIOBase):
+    """
+    A read-only, seekable file-like object over any object that
+    supports the buffer protocol (`bytes`, `bytearray`, `mmap.mmap`,
+    the ``buf`` of a `multiprocessing.shared_memory.SharedMemory`,
+    etc.) that does not copy the buffer.  Like `io.BytesIO`, it
+    exposes the content through ``getbuffer``, so that `MemoryIO` can
+    create arrays that are views of it.
+    """
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._pos = 0
+
+    def getbuffer(self):
+        return self._buffer
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        content = self._buffer[self._pos:self._pos + len(b)]
+        b[:len(content)] = content
+        self._pos += len(content)
+        return len(content)
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            pos = offset
+        elif whence == SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == SEEK_END:
+            pos = len(self._buffer) + offset
+        else:
+            raise ValueError("Invalid whence ({0})".format(whence))
+        if pos < 0:
+            raise ValueError("Negative seek position {0}".format(pos))
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+
+def _get_buffer(init):
+    """
+    Returns a flat, byte-oriented memoryview of ``init`` if it
+    supports the buffer protocol, otherwise `None`.
+    """
+    try:
+        return memoryview(init).cast('B')
+    except TypeError:
+        return None
+
+
 class InputStream(GenericFile):
     """
     Handles an input stream, such as stdin.
@@ -797,7 +964,12 @@ class InputStream(GenericFile):
     def __init__(self, fd, mode='r', close=False, uri=None):
         super(InputStream, self).__init__(fd, mode, close=close, uri=uri)
         self._fd = fd
-        self._buffer = b''
+        # Content that has been peeked at but not yet consumed.  This
+        # is a bytearray so that appending to it and consuming from
+        # its front (which CPython implements without moving the
+        # remaining content) are both amortized O(1) per byte, rather
+        # than copying the whole buffer on every read.
+        self._buffer = bytearray()
 
     def _peek(self, size=-1):
         if size < 0:
@@ -806,7 +978,20 @@ class InputStream(GenericFile):
             len_buffer = len(self._buffer)
             if len_buffer < size:
                 self._buffer += self._fd.read(size - len_buffer)
-        return self._buffer
+            else:
+                return self._consume(size, remove=False)
+        return bytes(self._buffer)
+
+    def _consume(self, size, remove=True):
+        """
+        Return the first ``size`` bytes of the buffer, optionally
+        removing them from the buffer.
+        """
+        with memoryview(self._buffer) as view, view[:size] as chunk:
+            content = chunk.tobytes()
+        if remove:
+            del self._buffer[:size]
+        return content
 
     def read(self, size=-1):
         # On Python 3, reading 0 bytes from a socket causes it to stop
@@ -819,19 +1004,14 @@ class InputStream(GenericFile):
             return self._fd.read(size)
         elif size < 0:
             self._buffer += self._fd.read()
-            buffer = self._buffer
-            self._buffer = b''
-            return buffer
         elif len_buffer < size:
-            if len_buffer < size:
-                self._buffer += self._fd.read(size - len(self._buffer))
-            buffer = self._buffer
-            self._buffer = b''
-            return buffer
+            self._buffer += self._fd.read(size - len_buffer)
         else:
-            buffer = self._buffer[:size]
-            self._buffer = self._buffer[size:]
-            return buffer
+            return self._consume(size)
+
+        buffer = bytes(self._buffer)
+        self._buffer.clear()
+        return buffer
 
     def reader_until(self, delimiter, readahead_bytes, delimiter_name=None,
                      include=True, initial_content=b'', exception=True):
@@ -845,20 +1025,25 @@ class InputStream(GenericFile):
             raise IOError("Read past end of file")
 
     def read_into_array(self, size):
-        try:
-            # See if Numpy can handle this as a real file first...
-            return np.fromfile(self._fd, np.uint8, size)
-        except (IOError, AttributeError):
-            # Else, fall back to reading into memory and then
-            # returning the Numpy array.
-            data = self.read(size)
-            # We need to copy the array, so it is writable
-            result = np.frombuffer(data, np.uint8, size)
-            # When creating an array from a buffer, it is read-only.
-            # If we need a read/write array, we have to copy it.
-            if 'w' in self._mode:
-                result = result.copy()
-            return result
+        # Numpy can only read directly from the underlying file when
+        # none of the requested content has already been buffered.
+        if not self._buffer:
+            try:
+                # See if Numpy can handle this as a real file first...
+                return np.fromfile(self._fd, np.uint8, size)
+            except (IOError, AttributeError):
+                pass
+
+        # Else, fall back to reading into memory and then
+        # returning the Numpy array.
+        data = self.read(size)
+        # We need to copy the array, so it is writable
+        result = np.frombuffer(data, np.uint8, size)
+        # When creating an array from a buffer, it is read-only.
+        # If we need a read/write array, we have to copy it.
+        if 'w' in self._mode:
+            result = result.copy()
+        return result
 
 
 class OutputStream(GenericFile):
@@ -875,6 +1060,53 @@ class OutputStream(GenericFile):
         self.clear(size)
 
 
+class BufferList(GenericFile):
+    """
+    Collects everything written to it as a list of `memoryview`
+    objects, suitable for `socket.socket.sendmsg` or `os.writev`.
+
+    The content of `write` calls is gathered into a single buffer
+    until the next `write_array`, while contiguous arrays are not
+    copied at all: the list holds a view of the array's own memory.
+    """
+    def __init__(self, uri=None):
+        super(BufferList, self).__init__(io.BytesIO(), 'w', uri=uri)
+        self._buffers = []
+        self._offset = 0
+
+    def _flush_content(self):
+        if self._fd.tell():
+            content = self._fd.getvalue()
+            self._buffers.append(memoryview(content))
+            self._offset += len(content)
+            self._fd = io.BytesIO()
+
+    def write_array(self, array):
+        if not (array.flags.c_contiguous or array.flags.f_contiguous):
+            return super(BufferList, self).write_array(array)
+
+        if array.nbytes:
+            self._flush_content()
+            self._buffers.append(memoryview(array.ravel(order='K').view(np.uint8)))
+            self._offset += array.nbytes
+
+    def tell(self):
+        return self._offset + self._fd.tell()
+
+    def fast_forward(self, size):
+        if size < 0:
+            return
+        self.clear(size)
+
+    @property
+    def buffers(self):
+        """
+        The list of buffers written so far.
+        """
+        self._flush_content()
+        return self._buffers
+
+
 class HTTPConnection(RandomAccessFile):
     """
     Uses a persistent HTTP connection to request specific ranges of
@@ -1119,6 +1351,10 @@ def get_file(init, mode='r', uri=None, close=False):
 
         - An `io.IOBase` object (the default file object on Python 3).
 
+        - When `mode` is ``"r"``, any object that supports the buffer
+          protocol, such as `bytes`, `bytearray`, `memoryview` or
+          `mmap.mmap`.  The content is read without copying it.
+
         - A ducktyped object that looks like a file object.  If `mode`
           is ``"r"``, it must have a ``read`` method.  If `mode` is
           ``"w"``, it must have a ``write`` method.  If `mode` is
@@ -1199,6 +1435,9 @@ def get_file(init, mode='r', uri=None, close=False):
         raise TypeError(
             "io.StringIO objects are not supported.  Use io.BytesIO instead.")
 
+    elif mode == 'r' and _get_buffer(init) is not None:
+        return MemoryIO(_BufferReader(_get_buffer(init)), mode, uri=uri)
+
     elif isinstance(init, io.IOBase):
         if (('r' in mode and not init.readable()) or
             ('w' in mode and not init.writable())):
@@ -0,0 +1,236 @@
+"""
+Mapping and sequence types that make up the tree of a file opened with
+``lazy_tree=True``.  Each wraps a container node of the tagged tree, and
+converts the node's children to custom data types the first time they
+are accessed, keeping the result in place of the tagged child.
+
+The conversion itself is done by a function supplied by
+``yamlutil._tagged_tree_to_lazy_tree``, which keeps the results for the
+lifetime of the tree, so that a node referenced from several places in
+the tree is converted to the same object each time.
+
+Methods that work on all of the data of a container at once, such as
+``repr`` or any modification other than setting or deleting a single
+item, convert all of the remaining children first.
+
+The nodes are also instances of `dict` and `list`, and the storage of
+the builtin type is kept in step with the data, for code, such as the
+C implementation of `json`, that reads that storage directly.
+"""
+
+from collections import UserDict, UserList
+from copy import deepcopy
+
+from .tags.core import AsdfObject
+
+
+__all__ = ['AsdfNode', 'AsdfDictNode', 'AsdfListNode', 'AsdfObjectNode']
+
+
+class AsdfNode:
+    """
+    Base class of the containers of a lazy tree.
+    """
+    def __init__(self, data, convert=None, json_id=None):
+        self._data = data
+        self._convert = convert
+        self._json_id = json_id
+        if convert is None:
+            self._pending = set()
+        else:
+            self._pending = set(self._keys())
+        self._update_storage()
+
+    def _keys(self):
+        raise NotImplementedError()
+
+    def _update_storage(self):
+        # Copy all of the data to the storage of the builtin type.
+        raise NotImplementedError()
+
+    def _store(self, key, value):
+        # Set a single item of the storage of the builtin type.
+        raise NotImplementedError()
+
+    def _convert_child(self, key):
+        value = self._convert(self._data[key], self._json_id)
+        self._data[key] = value
+        self._store(key, value)
+        self._pending.discard(key)
+        return value
+
+    @property
+    def data(self):
+        for key in list(self._pending):
+            self._convert_child(key)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._pending = set()
+        self._update_storage()
+
+    def copy(self):
+        return self.__copy__()
+
+    def __copy__(self):
+        return self.__class__(self)
+
+
+class AsdfDictNode(AsdfNode, UserDict, dict):
+    """
+    A Python dict whose values are converted on first access.
+    """
+    def __init__(self, data=None, convert=None, json_id=None):
+        data = {} if data is None else dict(data)
+        super().__init__(data, convert, json_id)
+
+    def _keys(self):
+        return self._data.keys()
+
+    def _update_storage(self):
+        dict.clear(self)
+        dict.update(self, self._data)
+
+    def _store(self, key, value):
+        dict.__setitem__(self, key, value)
+
+    def __getitem__(self, key):
+        if key in self._pending:
+            return self._convert_child(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._store(key, value)
+        self._pending.discard(key)
+
+    def __delitem__(self, key):
+        del self._data[key]
+        dict.__delitem__(self, key)
+        self._pending.discard(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __deepcopy__(self, memo):
+        result = self.__class__()
+        memo[id(self)] = result
+        for key, value in self.items():
+            result[key] = deepcopy(value, memo)
+        return result
+
+
+class AsdfListNode(AsdfNode, UserList, list):
+    """
+    A Python list whose items are converted on first access.
+    """
+    def __init__(self, data=None, convert=None, json_id=None):
+        data = [] if data is None else list(data)
+        super().__init__(data, convert, json_id)
+
+    def _keys(self):
+        return range(len(self._data))
+
+    def _update_storage(self):
+        list.clear(self)
+        list.extend(self, self._data)
+
+    def _store(self, index, value):
+        list.__setitem__(self, index, value)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(self.data[index])
+        if self._pending:
+            index = range(len(self._data))[index]
+            if index in self._pending:
+                return self._convert_child(index)
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.data[index] = value
+            self._update_storage()
+        else:
+            index = range(len(self._data))[index]
+            self._data[index] = value
+            self._store(index, value)
+            self._pending.discard(index)
+
+    def __delitem__(self, index):
+        del self.data[index]
+        list.__delitem__(self, index)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n):
+        self.data *= n
+        self._update_storage()
+        return self
+
+    def append(self, item):
+        self.data.append(item)
+        list.append(self, item)
+
+    def insert(self, index, item):
+        self.data.insert(index, item)
+        list.insert(self, index, item)
+
+    def pop(self, index=-1):
+        list.pop(self, index)
+        return self.data.pop(index)
+
+    def remove(self, item):
+        self.data.remove(item)
+        self._update_storage()
+
+    def clear(self):
+        self.data.clear()
+        list.clear(self)
+
+    def reverse(self):
+        self.data.reverse()
+        list.reverse(self)
+
+    def sort(self, *args, **kwargs):
+        self.data.sort(*args, **kwargs)
+        self._update_storage()
+
+    def extend(self, other):
+        self.data.extend(other)
+        self._update_storage()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        for index in range(len(self._data)):
+            yield self[index]
+
+    def __deepcopy__(self, memo):
+        result = self.__class__()
+        memo[id(self)] = result
+        for value in self:
+            result.append(deepcopy(value, memo))
+        return result
+
+
+class AsdfObjectNode(AsdfDictNode, AsdfObject):
+    """
+    The root of a lazy tree.
+    """
+    pass
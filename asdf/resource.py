@@ -59,6 +59,11 @@ class ResourceMappingProxy(Mapping):
     def __iter__(self):
         return self._delegate.__iter__()
 
+    def __contains__(self, uri):
+        # Implement __contains__ so that the check doesn't read
+        # the content of the resource.
+        return self._delegate.__contains__(uri)
+
     @property
     def delegate(self):
         """
@@ -149,9 +154,18 @@ class DirectoryResourceMapping(Mapping):
     stem_filename : bool, optional
         If `True`, remove the filename's extension when
         constructing its URI.
+
+    Notes
+    -----
+    Directories are listed the first time a URI that would be found
+    in them is requested, so that a mapping of a large directory tree
+    only pays for the directories that are actually used.  Iterating
+    over the mapping lists the whole tree.
     """
     def __init__(self, root, uri_prefix, recursive=False, filename_pattern="*.yaml", stem_filename=True):
-        self._uri_to_file = {}
+        # Map of tuple of path components to the directory's (files, subdirectories),
+        # where files maps URI to file and subdirectories maps name to directory.
+        self._listings = {}
         self._recursive = recursive
         self._filename_pattern = filename_pattern
         self._stem_filename = stem_filename
@@ -166,15 +180,53 @@ class DirectoryResourceMapping(Mapping):
         else:
             self._uri_prefix = uri_prefix
 
-        for file, path_components in self._iterate_files(self._root, []):
-            self._uri_to_file[self._make_uri(file, path_components)] = file
+    def _list_directory(self, path_components):
+        """
+        Get the files and subdirectories of the directory at a tuple
+        of path components, or `None` if there is no such directory.
+        """
+        if path_components in self._listings:
+            return self._listings[path_components]
+
+        if len(path_components) == 0:
+            directory = self._root
+        else:
+            parent = self._list_directory(path_components[:-1])
+            if parent is None or path_components[-1] not in parent[1]:
+                return None
+            directory = parent[1][path_components[-1]]
 
-    def _iterate_files(self, directory, path_components):
+        files = {}
+        subdirectories = {}
         for obj in directory.iterdir():
             if obj.is_file() and fnmatch.fnmatch(obj.name, self._filename_pattern):
-                yield obj, path_components
+                files[self._make_uri(obj, list(path_components))] = obj
             elif obj.is_dir() and self._recursive:
-                yield from self._iterate_files(obj, path_components + [obj.name])
+                subdirectories[obj.name] = obj
+
+        self._listings[path_components] = (files, subdirectories)
+        return files, subdirectories
+
+    def _find_file(self, uri):
+        """
+        Get the file for a URI, or `None` if the mapping doesn't
+        contain it.
+        """
+        if not isinstance(uri, str) or not uri.startswith(self._uri_prefix + "/"):
+            return None
+
+        path_components = tuple(uri[len(self._uri_prefix) + 1:].split("/")[:-1])
+        listing = self._list_directory(path_components)
+        if listing is None:
+            return None
+
+        return listing[0].get(uri)
+
+    def _iterate_uris(self, path_components):
+        files, subdirectories = self._list_directory(path_components)
+        yield from files
+        for name in subdirectories:
+            yield from self._iterate_uris(path_components + (name,))
 
     def _make_uri(self, file, path_components):
         if self._stem_filename:
@@ -185,13 +237,19 @@ class DirectoryResourceMapping(Mapping):
         return "/".join([self._uri_prefix] + path_components + [filename])
 
     def __getitem__(self, uri):
-        return self._uri_to_file[uri].read_bytes()
+        file = self._find_file(uri)
+        if file is None:
+            raise KeyError(uri)
+        return file.read_bytes()
 
     def __len__(self):
-        return len(self._uri_to_file)
+        return sum(1 for _ in self._iterate_uris(()))
 
     def __iter__(self):
-        yield from self._uri_to_file
+        yield from self._iterate_uris(())
+
+    def __contains__(self, uri):
+        return self._find_file(uri) is not None
 
     def __repr__(self):
         return "{}({!r}, {!r}, recursive={!r}, filename_pattern={!r}, stem_filename={!r})".format(
@@ -216,33 +274,58 @@ class ResourceManager(Mapping):
         the first mapping takes precedence.
     """
     def __init__(self, resource_mappings):
-        self._resource_mappings = resource_mappings
+        self._resource_mappings = list(resource_mappings)
 
+        # The mapping that provides each URI, filled in as URIs are
+        # requested, so that the mappings are only searched for the
+        # resources that are actually used.
         self._mappings_by_uri = {}
-        for mapping in resource_mappings:
-            for uri in mapping:
-                if uri not in self._mappings_by_uri:
-                    self._mappings_by_uri[uri] = mapping
 
     def __getitem__(self, uri):
-        if uri not in self._mappings_by_uri:
-            raise KeyError("Resource unavailable for URI: {}".format(uri))
-
-        content = self._mappings_by_uri[uri][uri]
+        content = self._get_mapping(uri)[uri]
         if isinstance(content, str):
             content = content.encode("utf-8")
 
         return content
 
+    def _find_mapping(self, uri):
+        """
+        Get the mapping that provides the content for a URI, or
+        `None` if no mapping provides it.
+        """
+        mapping = self._mappings_by_uri.get(uri)
+        if mapping is None:
+            for candidate in self._resource_mappings:
+                if uri in candidate:
+                    mapping = candidate
+                    self._mappings_by_uri[uri] = mapping
+                    break
+        return mapping
+
+    def _get_mapping(self, uri):
+        """
+        Get the mapping that provides the content for a URI.
+        """
+        mapping = self._find_mapping(uri)
+        if mapping is None:
+            raise KeyError("Resource unavailable for URI: {}".format(uri))
+
+        return mapping
+
     def __len__(self):
-        return len(self._mappings_by_uri)
+        return sum(1 for _ in self)
 
     def __iter__(self):
-        yield from self._mappings_by_uri
+        seen = set()
+        for mapping in self._resource_mappings:
+            for uri in mapping:
+                if uri not in seen:
+                    seen.add(uri)
+                    yield uri
 
     def __contains__(self, uri):
         # Implement __contains__ only for efficiency.
-        return uri in self._mappings_by_uri
+        return self._find_mapping(uri) is not None
 
     def __repr__(self):
         return "<ResourceManager len: {}>".format(self.__len__())
@@ -1,8 +1,12 @@
 import json
 import datetime
+import hashlib
+import marshal
+import os
+import tempfile
 import warnings
 import copy
-from numbers import Integral
+from numbers import Integral, Number
 from functools import lru_cache
 from collections import OrderedDict
 from collections.abc import Mapping
@@ -23,6 +27,7 @@ from . import extension
 from . import yamlutil
 from . import versioning
 from . import tagged
+from .version import version as asdf_version
 from .exceptions import AsdfDeprecationWarning, AsdfWarning
 
 from .util import patched_urllib_parse
@@ -104,6 +109,19 @@ def validate_tag(validator, tag_pattern, instance, schema):
                 tag_pattern, instance_tag))
 
 
+def _set_style(validator, instance, name, value):
+    """
+    Set a YAML style attribute on a tagged tree node, and let the
+    validation context know so that it can be reapplied to identical
+    subtrees that skip validation.
+    """
+    setattr(instance, name, value)
+
+    context = getattr(validator, '_context', None)
+    if context is not None:
+        context.record_style(instance, name, value)
+
+
 def validate_propertyOrder(validator, order, instance, schema):
     """
     Stores a value on the `tagged.TaggedDict` instance so that
@@ -119,7 +137,7 @@ def validate_propertyOrder(validator, order, instance, schema):
         # propertyOrder may be an empty list
         return
 
-    instance.property_order = order
+    _set_style(validator, instance, 'property_order', order)
 
 
 def validate_flowStyle(validator, flow_style, instance, schema):
@@ -134,7 +152,7 @@ def validate_flowStyle(validator, flow_style, instance, schema):
             validator.is_type(instance, 'array')):
         return
 
-    instance.flow_style = flow_style
+    _set_style(validator, instance, 'flow_style', flow_style)
 
 
 def validate_style(validator, style, instance, schema):
@@ -148,7 +166,7 @@ def validate_style(validator, style, instance, schema):
     if not validator.is_type(instance, 'string'):
         return
 
-    instance.style = style
+    _set_style(validator, instance, 'style', style)
 
 
 def validate_type(validator, types, instance, schema):
@@ -167,6 +185,52 @@ def validate_type(validator, types, instance, schema):
         validator, types, instance, schema)
 
 
+# Keywords whose result for every item of a `tagged.InlineArray` is
+# known from its first item and the items holding its smallest and
+# largest values.
+_SAMPLED_ITEMS_KEYWORDS = frozenset([
+    'type', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum',
+    'minItems', 'maxItems', 'items', 'title', 'description',
+])
+
+
+def _can_sample_items(items):
+    if not isinstance(items, dict) or not _SAMPLED_ITEMS_KEYWORDS.issuperset(items):
+        return False
+    return 'items' not in items or _can_sample_items(items['items'])
+
+
+def validate_items(validator, items, instance, schema):
+    """
+    The items of a `tagged.InlineArray` all have the same type and, for
+    multidimensional arrays, shape, so when the schema only checks the
+    type, range or shape of the items, rather than validating each one,
+    it is checked against the first item and the items holding the
+    smallest and largest values.  Otherwise falls back to the default
+    items validator.
+    """
+    if isinstance(instance, tagged.InlineArray) and _can_sample_items(items):
+        array = instance.array
+        if len(array) == 0:
+            return
+
+        rows = array.reshape(len(array), -1)
+        indices = sorted({0, int(rows.argmin()) // rows.shape[1], int(rows.argmax()) // rows.shape[1]})
+        for index in indices:
+            if array.ndim > 1:
+                item = tagged.InlineArray(array[index])
+            else:
+                item = array[index].item()
+            for error in validator.descend(item, items, path=index):
+                yield error
+        return
+
+    errors = mvalidators.Draft4Validator.VALIDATORS['items'](
+        validator, items, instance, schema)
+    for error in errors or ():
+        yield error
+
+
 YAML_VALIDATORS = util.HashableDict(
     mvalidators.Draft4Validator.VALIDATORS.copy())
 YAML_VALIDATORS.update({
@@ -174,7 +238,8 @@ YAML_VALIDATORS.update({
     'propertyOrder': validate_propertyOrder,
     'flowStyle': validate_flowStyle,
     'style': validate_style,
-    'type': validate_type
+    'type': validate_type,
+    'items': validate_items,
 })
 
 
@@ -183,8 +248,10 @@ def validate_fill_default(validator, properties, instance, schema):
         return
 
     for property, subschema in properties.items():
-        if "default" in subschema:
-            instance.setdefault(property, subschema["default"])
+        if "default" in subschema and property not in instance:
+            # Schemas are shared between validations, so copy the
+            # default rather than insert the schema's own object.
+            instance[property] = copy.deepcopy(subschema["default"])
 
     for err in mvalidators.Draft4Validator.VALIDATORS['properties'](
         validator, properties, instance, schema):
@@ -193,7 +260,7 @@ def validate_fill_default(validator, properties, instance, schema):
 
 FILL_DEFAULTS = util.HashableDict()
 for key in ('allOf', 'items'):
-    FILL_DEFAULTS[key] = mvalidators.Draft4Validator.VALIDATORS[key]
+    FILL_DEFAULTS[key] = YAML_VALIDATORS[key]
 FILL_DEFAULTS['properties'] = validate_fill_default
 
 
@@ -213,22 +280,66 @@ def validate_remove_default(validator, properties, instance, schema):
 
 REMOVE_DEFAULTS = util.HashableDict()
 for key in ('allOf', 'items'):
-    REMOVE_DEFAULTS[key] = mvalidators.Draft4Validator.VALIDATORS[key]
+    REMOVE_DEFAULTS[key] = YAML_VALIDATORS[key]
 REMOVE_DEFAULTS['properties'] = validate_remove_default
 
 
+# Maximum number of entries in the cache of validated subtrees kept by
+# an `AsdfFile`.  The cache is simply cleared when it fills up.
+_VALIDATION_CACHE_SIZE = 1 << 16
+
+# Leaf values that can't be modified in place, and so can be part of a
+# fingerprint.
+_FINGERPRINT_SCALAR_TYPES = (str, bytes, Number, np.generic, datetime.date, datetime.time)
+
+
+class _Fingerprint:
+    """
+    Structural fingerprint of a tagged tree node.  Two fingerprints
+    compare equal only when the nodes they were made from have the same
+    types, tags and values all the way down.  The hash is computed once,
+    so that the fingerprint of a node can be built from those of its
+    children without hashing the whole subtree again.
+    """
+    __slots__ = ('_key', '_hash')
+
+    def __init__(self, key):
+        self._key = key
+        self._hash = hash(key)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other or (
+            isinstance(other, _Fingerprint) and
+            self._hash == other._hash and
+            self._key == other._key
+        )
+
+
 class _ValidationContext:
     """
     Context that tracks (tree node, schema fragment) pairs that have
     already been validated.
 
+    When given a cache, usually the one owned by an `AsdfFile`, the
+    context also remembers the tagged subtrees that passed validation
+    against their schema, keyed on a structural fingerprint of the
+    subtree and the schema URI.  Identical subtrees seen later, for
+    example when a file that was read is written back out, are then
+    not validated again.
+
     Instances of this class are context managers that track
     how many times they have been entered, and only reset themselves
     when exiting the outermost context.
     """
-    def __init__(self):
+    def __init__(self, cache=None):
         self._depth = 0
         self._seen = set()
+        self._cache = cache
+        self._fingerprints = {}
+        self._styles = None
 
     def add(self, instance, schema):
         """
@@ -244,6 +355,141 @@ class _ValidationContext:
         """
         return self._make_seen_key(instance, schema) in self._seen
 
+    def fingerprint(self, instance):
+        """
+        Return the `_Fingerprint` of an instance, or None if it contains
+        values that can't be fingerprinted (arbitrary objects, or
+        reference cycles).
+        """
+        key = id(instance)
+        if key in self._fingerprints:
+            return self._fingerprints[key]
+
+        # Mark the node while its children are visited, so that a cycle
+        # leads back here and gives up.
+        self._fingerprints[key] = None
+
+        tag = getattr(instance, '_tag', None)
+        if isinstance(instance, dict):
+            items = []
+            for name, value in instance.items():
+                name_fingerprint = self.fingerprint(name)
+                value_fingerprint = self.fingerprint(value)
+                if name_fingerprint is None or value_fingerprint is None:
+                    return None
+                items.append((name_fingerprint, value_fingerprint))
+            result = (type(instance), tag, tuple(items))
+        elif isinstance(instance, (list, tuple)):
+            items = []
+            for value in instance:
+                value_fingerprint = self.fingerprint(value)
+                if value_fingerprint is None:
+                    return None
+                items.append(value_fingerprint)
+            result = (type(instance), tag, tuple(items))
+        elif instance is None or isinstance(instance, _FINGERPRINT_SCALAR_TYPES):
+            result = (type(instance), tag, instance)
+        elif isinstance(instance, tagged.InlineArray):
+            array = instance.array
+            result = (type(instance), array.dtype.str, array.shape, array.tobytes())
+        else:
+            return None
+
+        try:
+            result = _Fingerprint(result)
+        except TypeError:
+            return None
+
+        self._fingerprints[key] = result
+        return result
+
+    def lookup(self, instance, schema_key):
+        """
+        Return True if a subtree identical to instance has already
+        passed validation against the schema identified by schema_key.
+        The styles that were set on the subtree by that validation
+        are set on instance.
+        """
+        if self._cache is None:
+            return False
+
+        fingerprint = self.fingerprint(instance)
+        if fingerprint is None:
+            return False
+
+        styles = self._cache.get((schema_key, fingerprint))
+        if styles is None:
+            return False
+
+        for path, name, value in styles:
+            node = instance
+            for key in path:
+                node = node[key]
+            setattr(node, name, value)
+
+        return True
+
+    def start_recording(self):
+        """
+        Start recording the styles set by the validators, to be
+        stored with the subtree by `store`.
+        """
+        if self._cache is not None:
+            self._styles = []
+
+    def record_style(self, instance, name, value):
+        """
+        Inform the context that a validator has set a style attribute
+        on an instance.
+        """
+        if self._styles is not None:
+            self._styles.append((instance, name, value))
+
+    def store(self, instance, schema_key):
+        """
+        Remember that instance passed validation against the schema
+        identified by schema_key, along with the styles recorded since
+        `start_recording` was called.
+        """
+        styles, self._styles = self._styles, None
+        if styles is None:
+            return
+
+        fingerprint = self.fingerprint(instance)
+        if fingerprint is None:
+            return
+
+        # Find the path of each styled node from the root of the subtree,
+        # which is free of cycles since it has a fingerprint.
+        paths = {id(instance): ()}
+        wanted = {id(node) for node, _, _ in styles} - set(paths)
+        stack = [(instance, ())]
+        while wanted and stack:
+            node, path = stack.pop()
+            if isinstance(node, dict):
+                children = node.items()
+            elif isinstance(node, (list, tuple)):
+                children = enumerate(node)
+            else:
+                continue
+            for key, child in children:
+                child_path = path + (key,)
+                if id(child) in wanted:
+                    paths[id(child)] = child_path
+                    wanted.discard(id(child))
+                stack.append((child, child_path))
+
+        if wanted:
+            # A validator styled something outside of the subtree, so
+            # don't try to replay it.
+            return
+
+        if len(self._cache) >= _VALIDATION_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[(schema_key, fingerprint)] = tuple(
+            (paths[id(node)], name, value) for node, name, value in styles
+        )
+
     def __enter__(self):
         self._depth += 1
         return self
@@ -253,17 +499,194 @@ class _ValidationContext:
 
         if self._depth == 0:
             self._seen = set()
+            self._fingerprints = {}
+            self._styles = None
 
     def _make_seen_key(self, instance, schema):
         return (id(instance), id(schema))
 
 
+# Quick checks for the JSON types, matching the type checker defined in
+# `_create_validator`.  They allow compiled schemas to skip calling the
+# 'type' validator for instances that are obviously of the right type.
+_JSON_TYPE_CHECKS = {
+    'array': lambda instance: isinstance(instance, (list, tuple, tagged.InlineArray)),
+    'boolean': lambda instance: isinstance(instance, bool),
+    'integer': lambda instance: isinstance(instance, Integral) and not isinstance(instance, bool),
+    'null': lambda instance: instance is None,
+    'number': lambda instance: isinstance(instance, Number) and not isinstance(instance, bool),
+    'object': lambda instance: isinstance(instance, dict),
+    'string': lambda instance: isinstance(instance, (str, np.str_)),
+}
+
+
+def _make_type_check(types):
+    if isinstance(types, str):
+        types = [types]
+    if not isinstance(types, list):
+        return None
+    checks = [_JSON_TYPE_CHECKS.get(t) for t in types]
+    if None in checks:
+        return None
+    return lambda instance: any(check(instance) for check in checks)
+
+
+def _make_tag_check(tag_pattern):
+    if not isinstance(tag_pattern, str) or '*' in tag_pattern:
+        return None
+    return lambda instance: getattr(instance, '_tag', None) == tag_pattern
+
+
+def _compile_schema(schema, validators, id_of):
+    """
+    Compile a schema into a function that yields the errors found in
+    an instance, in the same way as the ``iter_errors`` method of a
+    `jsonschema` validator class.
+
+    The keywords of the schema are looked up in ``validators`` once,
+    here, rather than on every call, and the 'type' and 'tag' keywords
+    get a quick check that skips the validator function altogether
+    when the instance obviously passes.  The validator functions are
+    still responsible for reporting errors, so the errors are exactly
+    the same as those produced by `jsonschema`.
+
+    Parameters
+    ----------
+    schema : dict
+        The schema to compile.
+
+    validators : dict
+        Map of keyword to validator function.
+
+    id_of : callable
+        Returns the ``id`` of a schema.
+
+    Returns
+    -------
+    callable
+        Function that takes a validator instance and the instance
+        to validate and returns an iterator of errors.
+    """
+    scope = id_of(schema)
+
+    ref = schema.get('$ref')
+    if ref is not None:
+        items = [('$ref', ref)]
+    else:
+        items = schema.items()
+
+    steps = []
+    for keyword, value in items:
+        func = validators.get(keyword)
+        if func is None:
+            continue
+
+        check = None
+        if keyword == 'type' and func is validate_type:
+            check = _make_type_check(value)
+        elif keyword == 'tag' and func is validate_tag:
+            check = _make_tag_check(value)
+
+        steps.append((keyword, value, func, check))
+
+    def iter_errors(validator, instance):
+        if scope:
+            validator.resolver.push_scope(scope)
+        try:
+            for keyword, value, func, check in steps:
+                if check is not None and check(instance):
+                    continue
+
+                errors = func(validator, value, instance, schema) or ()
+                for error in errors:
+                    # set details if not already set by the called fn
+                    error._set(
+                        validator=keyword,
+                        validator_value=value,
+                        instance=instance,
+                        schema=schema,
+                    )
+                    if keyword != '$ref':
+                        error.schema_path.appendleft(keyword)
+                    yield error
+        finally:
+            if scope:
+                validator.resolver.pop_scope()
+
+    return iter_errors
+
+
+# Maximum number of compiled schemas kept by each validator class
+_COMPILED_SCHEMA_CACHE_SIZE = 4096
+
+# Schemas that are never modified, keyed on their id, such as those
+# returned by `_load_schema_cached` and the documents loaded by shared
+# `$ref` resolvers.  Only these are safe to compile.
+_static_schemas = {}
+_STATIC_SCHEMA_CACHE_SIZE = 16384
+
+
+def _mark_static(schema):
+    """
+    Record that a schema, and every subschema within it, will not be
+    modified and may be compiled.
+    """
+    if _static_schemas.get(id(schema)) is schema:
+        return
+
+    if len(_static_schemas) >= _STATIC_SCHEMA_CACHE_SIZE:
+        _static_schemas.clear()
+
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if _static_schemas.get(id(node)) is node:
+                continue
+            _static_schemas[id(node)] = node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _load_tag_schema(ctx, extension_manager, tag):
+    """
+    Find and load the schema for a tag.
+
+    Returns
+    -------
+    (str or None, dict or None)
+        The schema URI and the schema, or `None` for both if the tag
+        doesn't have a schema.  The schema is an empty dict if it
+        can't be found.
+    """
+    if extension_manager.handles_tag(tag):
+        schema_uri = extension_manager.get_tag_definition(tag).schema_uri
+    else:
+        schema_uri = ctx.tag_mapping(tag)
+        if schema_uri == tag:
+            schema_uri = None
+
+    s = None
+    if schema_uri is not None:
+        try:
+            s = _load_schema_cached(schema_uri, ctx.resolver, False, False)
+        except FileNotFoundError:
+            msg = "Unable to locate schema file for '{}': '{}'"
+            warnings.warn(msg.format(tag, schema_uri), AsdfWarning)
+            s = {}
+        if s:
+            _mark_static(s)
+
+    return schema_uri, s
+
+
 @lru_cache()
 def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
     meta_schema = _load_schema_cached(YAML_SCHEMA_METASCHEMA_ID, extension.get_default_resolver(), False, False)
 
     type_checker = mvalidators.Draft4Validator.TYPE_CHECKER.redefine_many({
-        'array': lambda checker, instance: isinstance(instance, list) or isinstance(instance, tuple),
+        'array': lambda checker, instance: isinstance(instance, (list, tuple, tagged.InlineArray)),
         'integer': lambda checker, instance: not isinstance(instance, bool) and isinstance(instance, Integral),
         'string': lambda checker, instance: isinstance(instance, (str, np.str_)),
     })
@@ -276,9 +699,66 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
     )
 
     class ASDFValidator(base_cls):
+        # Compiled schemas, shared by all instances of this class.  Keyed
+        # on the id of the schema, with the schema itself kept alongside
+        # so that the id can't be reused while the entry exists.
+        _compiled_schemas = {}
+
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self._context = _ValidationContext()
+            self._tag_schemas = {}
+
+        def _iter_schema_errors(self, instance, schema):
+            entry = self._compiled_schemas.get(id(schema))
+            if entry is None or entry[0] is not schema:
+                # Only schemas that are known not to change are compiled
+                if _static_schemas.get(id(schema)) is not schema:
+                    return super(ASDFValidator, self).iter_errors(instance, schema)
+
+                if len(self._compiled_schemas) >= _COMPILED_SCHEMA_CACHE_SIZE:
+                    self._compiled_schemas.clear()
+                entry = (schema, _compile_schema(schema, self.VALIDATORS, id_of))
+                self._compiled_schemas[id(schema)] = entry
+
+            return entry[1](self, instance)
+
+        def _get_tag_schema(self, tag):
+            if tag not in self._tag_schemas:
+                self._tag_schemas[tag] = _load_tag_schema(
+                    self.ctx, self.serialization_context.extension_manager, tag)
+            return self._tag_schemas[tag]
+
+        def _iter_tag_errors(self, instance):
+            schema_uri, s = self._get_tag_schema(instance._tag)
+            if not s:
+                return
+
+            context = self._context
+            schema_key = (ASDFValidator, schema_uri)
+            if context.lookup(instance, schema_key):
+                return
+
+            context.start_recording()
+            valid = True
+            with self.resolver.in_scope(schema_uri):
+                for x in self._iter_schema_errors(instance, s):
+                    valid = False
+                    yield x
+            if valid:
+                context.store(instance, schema_key)
+
+        def iter_tag_errors(self, instance):
+            """
+            Validate an instance against the schema for its tag,
+            without visiting the tags of its children.
+            """
+            if getattr(instance, '_tag', None) is None:
+                return
+
+            with self._context:
+                for x in self._iter_tag_errors(instance):
+                    yield x
 
         def iter_errors(self, instance, _schema=None):
             # We can't validate anything that looks like an external reference,
@@ -291,54 +771,52 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
                 else:
                     schema = _schema
 
-                if self._context.seen(instance, schema):
-                    # We've already validated this instance against this schema,
-                    # no need to do it again.
-                    return
-
-                if not visit_repeat_nodes:
-                    self._context.add(instance, schema)
-
-                if ((isinstance(instance, dict) and '$ref' in instance) or
-                        isinstance(instance, reference.Reference)):
-                    return
-
-                if _schema is None:
-                    tag = getattr(instance, '_tag', None)
-                    if tag is not None:
-                        if self.serialization_context.extension_manager.handles_tag(tag):
-                            tag_def = self.serialization_context.extension_manager.get_tag_definition(tag)
-                            schema_uri = tag_def.schema_uri
-                        else:
-                            schema_uri = self.ctx.tag_mapping(tag)
-                            if schema_uri == tag:
-                                schema_uri = None
-
-                        if schema_uri is not None:
-                            try:
-                                s = _load_schema_cached(schema_uri, self.ctx.resolver, False, False)
-                            except FileNotFoundError:
-                                msg = "Unable to locate schema file for '{}': '{}'"
-                                warnings.warn(msg.format(tag, schema_uri), AsdfWarning)
-                                s = {}
-                            if s:
-                                with self.resolver.in_scope(schema_uri):
-                                    for x in super(ASDFValidator, self).iter_errors(instance, s):
-                                        yield x
-
-
-                    if isinstance(instance, dict):
-                        for val in instance.values():
+                # Walk the tree with an explicit stack rather than a
+                # generator per node.  Nodes are visited in the same
+                # (depth-first) order as a recursive walk.
+                seen = self._context._seen
+                schema_id = id(schema)
+                stack = [instance]
+                while stack:
+                    node = stack.pop()
+
+                    key = (id(node), schema_id)
+                    if key in seen:
+                        # We've already validated this instance against this schema,
+                        # no need to do it again.
+                        continue
+
+                    if not visit_repeat_nodes:
+                        seen.add(key)
+
+                    if ((isinstance(node, dict) and '$ref' in node) or
+                            isinstance(node, reference.Reference)):
+                        continue
+
+                    if _schema is not None:
+                        for x in self._iter_schema_errors(node, schema):
+                            yield x
+                        continue
+
+                    if getattr(node, '_tag', None) is not None:
+                        for x in self._iter_tag_errors(node):
+                            yield x
+
+                    if isinstance(node, dict):
+                        children = node.values()
+                    elif isinstance(node, list):
+                        children = node
+                    else:
+                        continue
+
+                    if visit_repeat_nodes:
+                        # Nodes aren't marked as seen, so recurse to
+                        # keep failing with RecursionError on cycles.
+                        for val in children:
                             for x in self.iter_errors(val):
                                 yield x
-
-                    elif isinstance(instance, list):
-                        for val in instance:
-                            for x in self.iter_errors(val):
-                                yield x
-                else:
-                    for x in super(ASDFValidator, self).iter_errors(instance, _schema=schema):
-                        yield x
+                    else:
+                        stack.extend(reversed(list(children)))
 
     return ASDFValidator
 
@@ -356,6 +834,69 @@ def _load_schema(url):
     return result, fd.uri
 
 
+def _get_schema_cache_path(resource_manager, url, content):
+    """
+    Get the path of the file in the schema cache directory that
+    holds the parsed content of a resource.  The name is derived
+    from the URI, the package that provides it and the content
+    itself, so that edited schemas in development installs don't
+    pick up stale entries.
+    """
+    mapping = resource_manager._get_mapping(url)
+    key = hashlib.sha256()
+    for part in (
+        url,
+        getattr(mapping, 'package_name', None),
+        getattr(mapping, 'package_version', None),
+        asdf_version,
+    ):
+        key.update(str(part).encode('utf-8'))
+        key.update(b'\0')
+    key.update(content)
+
+    return os.path.join(get_config().schema_cache_dir, key.hexdigest() + '.marshal')
+
+
+def _read_schema_cache(path):
+    """
+    Read a parsed schema from the cache, or return `None` if it
+    isn't there or can't be read.
+    """
+    try:
+        with open(path, 'rb') as fd:
+            return marshal.load(fd)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_schema_cache(path, schema):
+    """
+    Write a parsed schema to the cache.  Failures are ignored, since
+    the cache is only an optimization.
+    """
+    try:
+        content = marshal.dumps(schema)
+    except ValueError:
+        # Contains values that marshal doesn't support
+        return
+
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so that other processes never
+        # see a partially written entry.
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
+
+
 def _make_schema_loader(resolver):
     def load_schema(url):
         # Check if this is a URI provided by the new
@@ -363,11 +904,21 @@ def _make_schema_loader(resolver):
         resource_manager = get_config().resource_manager
         if url in resource_manager:
             content = resource_manager[url]
+            cache_path = None
+            if get_config().schema_cache_dir is not None:
+                cache_path = _get_schema_cache_path(resource_manager, url, content)
+                result = _read_schema_cache(cache_path)
+                if result is not None:
+                    return result, url
+
             # The jsonschema metaschemas are JSON, but pyyaml
             # doesn't mind.
             # The following call to yaml.load is safe because we're
             # using a loader that inherits from pyyaml's SafeLoader.
             result = yaml.load(content, Loader=yamlutil.AsdfLoader) # nosec
+
+            if cache_path is not None:
+                _write_schema_cache(cache_path, result)
             return result, url
 
         # If not, fall back to fetching the schema the old way:
@@ -376,13 +927,35 @@ def _make_schema_loader(resolver):
     return load_schema
 
 
-def _make_resolver(url_mapping):
-    handlers = {}
+# Shared parts of the `$ref` resolvers, keyed on (url_mapping, id of the
+# resource manager).  A new resource manager is created whenever the
+# resource mappings in the config change, which leaves the old entries
+# unused.
+_resolver_caches = {}
+_RESOLVER_CACHE_SIZE = 16
+
+
+def _get_resolver_caches(url_mapping):
+    """
+    Get the handlers and caches shared by all `$ref` resolvers for
+    the given URL mapping and the current resource manager.  Each
+    referenced document is loaded, and each reference resolved, once
+    per combination rather than once per validation.
+    """
+    resource_manager = get_config().resource_manager
+    key = (url_mapping, id(resource_manager))
+    entry = _resolver_caches.get(key)
+    if entry is not None and entry[0] is resource_manager:
+        return entry[1:]
+
     schema_loader = _make_schema_loader(url_mapping)
 
     def get_schema(url):
-        return schema_loader(url)[0]
+        result = schema_loader(url)[0]
+        _mark_static(result)
+        return result
 
+    handlers = {}
     for x in ['http', 'https', 'file', 'tag', 'asdf']:
         handlers[x] = get_schema
 
@@ -390,9 +963,31 @@ def _make_resolver(url_mapping):
     # allows asdf:// URIs to be resolved correctly.
     urljoin_cache = lru_cache(1024)(patched_urllib_parse.urljoin)
 
-    # We set cache_remote=False here because we do the caching of
-    # remote schemas here in `load_schema`, so we don't need
-    # jsonschema to do it on our behalf.  Setting it to `True`
+    # jsonschema caches resolved references per resolver; this
+    # cache is shared by all of them instead.
+    base_resolver = mvalidators.RefResolver(
+        '',
+        {},
+        cache_remote=False,
+        handlers=handlers,
+        urljoin_cache=urljoin_cache,
+    )
+    remote_cache = lru_cache(None)(base_resolver.resolve_from_url)
+
+    if len(_resolver_caches) >= _RESOLVER_CACHE_SIZE:
+        _resolver_caches.clear()
+    entry = (resource_manager, handlers, urljoin_cache, remote_cache)
+    _resolver_caches[key] = entry
+    return entry[1:]
+
+
+def _make_resolver(url_mapping):
+    handlers, urljoin_cache, remote_cache = _get_resolver_caches(url_mapping)
+
+    # Each validator gets its own resolver, since the resolver tracks
+    # the current resolution scope, but the resolved references are
+    # shared.  We set cache_remote=False here because we do the caching
+    # of remote schemas ourselves.  Setting it to `True`
     # counterintuitively makes things slower.
     return mvalidators.RefResolver(
         '',
@@ -400,6 +995,7 @@ def _make_resolver(url_mapping):
         cache_remote=False,
         handlers=handlers,
         urljoin_cache=urljoin_cache,
+        remote_cache=remote_cache,
     )
 
 
@@ -508,7 +1104,7 @@ def _load_schema_cached(url, resolver, resolve_references, resolve_local_refs):
 
 def get_validator(schema={}, ctx=None, validators=None, url_mapping=None,
                   *args, _visit_repeat_nodes=False, _serialization_context=None,
-                  **kwargs):
+                  _validation_cache=None, **kwargs):
     """
     Get a JSON schema validator object for the given schema.
 
@@ -538,6 +1134,11 @@ def get_validator(schema={}, ctx=None, validators=None, url_mapping=None,
         Setting `True` is discouraged and will lead to RecursionError
         in trees containing reference cycles.
 
+    _validation_cache : dict, optional
+        Cache of tagged subtrees that have already passed validation,
+        usually the one owned by ``ctx``.  Only valid for the default
+        validators, since custom ones may modify the tree.
+
     Returns
     -------
     validator : jsonschema.Validator
@@ -562,6 +1163,8 @@ def get_validator(schema={}, ctx=None, validators=None, url_mapping=None,
     # through the running of the unit tests, not at run time.
     cls = _create_validator(validators=validators, visit_repeat_nodes=_visit_repeat_nodes)
     validator = cls(schema, *args, **kwargs)
+    if _validation_cache is not None:
+        validator._context = _ValidationContext(_validation_cache)
     validator.ctx = ctx
     validator.serialization_context = _serialization_context
     return validator
@@ -590,6 +1193,10 @@ def _validate_large_literals(instance, reading):
 
     if isinstance(instance, Integral):
         _validate(instance)
+    elif isinstance(instance, tagged.InlineArray):
+        if instance.array.dtype.kind in 'iu' and instance.array.size:
+            _validate(int(instance.array.min()))
+            _validate(int(instance.array.max()))
     elif isinstance(instance, Mapping):
         for key in instance:
             if isinstance(key, Integral):
@@ -655,6 +1262,12 @@ def validate(instance, ctx=None, schema={}, validators=None, reading=False,
         from .asdf import AsdfFile
         ctx = AsdfFile()
 
+    # Validation results can only be reused when the tree is checked
+    # against the schemas of its tags, using validators that don't
+    # modify it.
+    if validators is None and not schema and not kwargs.get('_visit_repeat_nodes'):
+        kwargs.setdefault('_validation_cache', getattr(ctx, '_validation_cache', None))
+
     validator = get_validator(schema, ctx, validators, ctx.resolver,
                               *args, **kwargs)
     validator.validate(instance, _schema=(schema or None))
@@ -670,6 +1283,209 @@ def validate(instance, ctx=None, schema={}, validators=None, reading=False,
     treeutil.walk(instance, _callback)
 
 
+def _get_node_validator(ctx, reading=False):
+    """
+    Get a function that validates a single node of a tagged tree
+    against the schema for its tag, without visiting its children.
+    This is used to validate a tree lazily, one node at a time as
+    the nodes are converted to custom types.
+
+    Parameters
+    ----------
+    ctx : AsdfFile context
+        Used to resolve tags and urls
+
+    reading: bool, optional
+        Indicates whether validation is being performed when the file is being
+        read.
+
+    Returns
+    -------
+    callable
+        Function that takes a node and raises `ValidationError` if
+        it is invalid.
+    """
+    validator = get_validator(
+        {}, ctx, None, ctx.resolver,
+        _validation_cache=getattr(ctx, '_validation_cache', None),
+    )
+
+    additional_validators = [_validate_large_literals]
+    if ctx.version >= versioning.RESTRICTED_KEYS_MIN_VERSION:
+        additional_validators.append(_validate_mapping_keys)
+
+    def _validate_node(node):
+        if isinstance(node, reference.Reference):
+            return
+
+        for error in validator.iter_tag_errors(node):
+            raise error
+
+        for additional_validator in additional_validators:
+            additional_validator(node, reading)
+
+    return _validate_node
+
+
+# Steps in the paths of compiled defaults.  Each is a (kind, key) tuple,
+# where kind is one of:
+_PROPERTY_STEP = 0  # the value of property 'key' of an object
+_ITEMS_STEP = 1  # every item of an array
+_ITEM_STEP = 2  # item number 'key' of an array
+
+# Compiled defaults, keyed on (id of the schema, remove).  The schema is
+# kept alongside so that the id can't be reused while the entry exists.
+_compiled_defaults = {}
+
+
+def _compile_defaults(schema, remove=False):
+    """
+    Flatten the default values in a schema into a list of
+    (path, property, default) tuples.  The path leads from the
+    instance validated against the schema to an object whose property
+    has the default.  The list is ordered so that applying it from
+    start to end has the same effect as walking the schema with the
+    `FILL_DEFAULTS` or `REMOVE_DEFAULTS` validators: only ``allOf``,
+    ``items`` and ``properties`` are followed, and defaults are
+    handled before descending into the properties that have them.
+    """
+    defaults = []
+
+    def _compile(schema, path):
+        # jsonschema ignores everything else in a schema with a $ref,
+        # and the default-handling validators don't follow them.
+        if not isinstance(schema, dict) or '$ref' in schema:
+            return
+
+        for keyword, value in schema.items():
+            if keyword == 'allOf':
+                for subschema in value:
+                    _compile(subschema, path)
+            elif keyword == 'items':
+                if isinstance(value, dict):
+                    _compile(value, path + ((_ITEMS_STEP, None),))
+                else:
+                    for index, subschema in enumerate(value):
+                        _compile(subschema, path + ((_ITEM_STEP, index),))
+            elif keyword == 'properties':
+                for name, subschema in value.items():
+                    if remove:
+                        if subschema.get('default', None) is not None:
+                            defaults.append((path, name, subschema['default']))
+                    elif 'default' in subschema:
+                        defaults.append((path, name, subschema['default']))
+                for name, subschema in value.items():
+                    _compile(subschema, path + ((_PROPERTY_STEP, name),))
+
+    _compile(schema, ())
+    return defaults
+
+
+def _get_compiled_defaults(schema, remove):
+    key = (id(schema), remove)
+    entry = _compiled_defaults.get(key)
+    if entry is None or entry[0] is not schema:
+        if len(_compiled_defaults) >= _COMPILED_SCHEMA_CACHE_SIZE:
+            _compiled_defaults.clear()
+        entry = (schema, _compile_defaults(schema, remove))
+        _compiled_defaults[key] = entry
+    return entry[1]
+
+
+def _iter_default_targets(instance, path):
+    """
+    Yield the objects reached by following a path of compiled
+    defaults from an instance.
+    """
+    nodes = [instance]
+    for kind, key in path:
+        next_nodes = []
+        for node in nodes:
+            if kind == _PROPERTY_STEP:
+                if isinstance(node, dict) and key in node:
+                    next_nodes.append(node[key])
+            elif isinstance(node, (list, tuple)):
+                if kind == _ITEMS_STEP:
+                    next_nodes.extend(node)
+                elif key < len(node):
+                    next_nodes.append(node[key])
+        nodes = next_nodes
+
+    for node in nodes:
+        if isinstance(node, dict):
+            yield node
+
+
+def _get_node_defaults_applier(ctx, remove=False):
+    """
+    Get a function that fills or removes, in a single node of a tagged
+    tree, the default values from the schema for the node's tag.
+    Nodes further down the tree are only modified when the schema
+    describes them.
+    """
+    extension_manager = ctx.extension_manager
+    tag_defaults = {}
+
+    def _apply(node):
+        tag = getattr(node, '_tag', None)
+        if tag is None:
+            return
+
+        defaults = tag_defaults.get(tag)
+        if defaults is None:
+            _, s = _load_tag_schema(ctx, extension_manager, tag)
+            defaults = _get_compiled_defaults(s, remove) if s else []
+            tag_defaults[tag] = defaults
+
+        for path, name, default in defaults:
+            for target in _iter_default_targets(node, path):
+                if remove:
+                    if target.get(name, None) == default:
+                        del target[name]
+                elif name not in target:
+                    # Schemas are shared between validations, so copy
+                    # the default rather than insert the schema's own
+                    # object.
+                    target[name] = copy.deepcopy(default)
+
+    return _apply
+
+
+def _apply_defaults(instance, ctx, remove=False, reading=False):
+    """
+    Fill or remove the default values in a tagged tree, using the
+    defaults compiled from the schema of each tag, in a single walk
+    over the tree.
+    """
+    apply_defaults = _get_node_defaults_applier(ctx, remove)
+
+    additional_validators = [_validate_large_literals]
+    if ctx.version >= versioning.RESTRICTED_KEYS_MIN_VERSION:
+        additional_validators.append(_validate_mapping_keys)
+
+    seen = set()
+    stack = [instance]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+
+        for validator in additional_validators:
+            validator(node, reading)
+
+        if ((isinstance(node, dict) and '$ref' in node) or
+                isinstance(node, reference.Reference)):
+            continue
+
+        apply_defaults(node)
+
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
 def fill_defaults(instance, ctx, reading=False):
     """
     For any default values in the schema, add them to the tree if they
@@ -686,7 +1502,7 @@ def fill_defaults(instance, ctx, reading=False):
         Indicates whether the ASDF file is being read (in contrast to being
         written).
     """
-    validate(instance, ctx, validators=FILL_DEFAULTS, reading=reading)
+    _apply_defaults(instance, ctx, reading=reading)
 
 
 def remove_defaults(instance, ctx):
@@ -701,7 +1517,7 @@ def remove_defaults(instance, ctx):
     ctx : AsdfFile context
         Used to resolve tags and urls
     """
-    validate(instance, ctx, validators=REMOVE_DEFAULTS)
+    _apply_defaults(instance, ctx, remove=True)
 
 
 def check_schema(schema, validate_default=True):
@@ -108,6 +108,41 @@ class TaggedString(Tagged, UserString, str):
                 self._tag == other._tag)
 
 
+class InlineArray:
+    """
+    A YAML sequence of numbers or booleans, nested for multidimensional
+    arrays, held as a numpy array rather than as lists of Python
+    scalars.  This is how the data of arrays stored inline is kept in
+    the tagged tree, so that it can be written and read without a
+    Python object for each element.
+    """
+    flow_style = None
+
+    def __init__(self, array):
+        self.array = array
+
+    def tolist(self):
+        return self.array.tolist()
+
+    def __len__(self):
+        return len(self.array)
+
+    def __iter__(self):
+        if self.array.ndim > 1:
+            return (InlineArray(row) for row in self.array)
+        else:
+            return iter(self.array.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, InlineArray):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __repr__(self):
+        # Shown in validation errors the way the nested lists would be
+        return repr(self.tolist())
+
+
 def tag_object(tag, instance, ctx=None):
     """
     Tag an object by wrapping it in a ``Tagged`` instance.
@@ -6,7 +6,9 @@ from numpy import ma
 from jsonschema import ValidationError
 
 from ...types import AsdfType
+from ... import tagged
 from ... import util
+from ...config import get_config
 
 
 _datatype_names = {
@@ -127,6 +129,16 @@ def numpy_dtype_to_asdf_datatype(dtype, include_byteorder=True):
 
 
 def inline_data_asarray(inline, dtype=None):
+    if isinstance(inline, tagged.InlineArray):
+        if dtype is None:
+            return inline.array
+        elif np.can_cast(inline.array.dtype, dtype, 'safe'):
+            return inline.array.astype(dtype)
+        # Other casts, such as of floats to ints, go through Python
+        # scalars as before, so that values that don't fit the dtype
+        # still raise rather than silently wrap or truncate.
+        inline = inline.tolist()
+
     # np.asarray doesn't handle structured arrays unless the innermost
     # elements are tuples.  To do that, we drill down the first
     # element of each level until we find a single item that
@@ -205,6 +217,20 @@ def numpy_array_to_list(array):
     return result
 
 
+def _is_inline_array_dtype(array):
+    # Whether the data of an array stored inline can be written as a
+    # `tagged.InlineArray`, rather than converted to nested lists.
+    # Masked values are written as nulls, so masked arrays are excluded,
+    # as are types whose elements are not Python numbers or booleans.
+    return (
+        not isinstance(array, ma.MaskedArray) and
+        array.ndim > 0 and
+        array.size > 0 and
+        array.dtype.fields is None and
+        (array.dtype.kind in 'biu' or array.dtype.kind == 'f' and array.dtype.itemsize <= 8)
+    )
+
+
 class NDArrayType(AsdfType):
     name = 'core/ndarray'
     version = '1.0.0'
@@ -218,7 +244,7 @@ class NDArrayType(AsdfType):
         self._array = None
         self._mask = mask
 
-        if isinstance(source, list):
+        if isinstance(source, (list, tagged.InlineArray)):
             self._array = inline_data_asarray(source, dtype)
             self._array = self._apply_mask(self._array, self._mask)
             self._block = asdffile.blocks.add_inline(self._array)
@@ -234,6 +260,7 @@ class NDArrayType(AsdfType):
         self._offset = offset
         self._strides = strides
         self._order = order
+        self._copy_on_write = False
         if not asdffile.blocks.lazy_load:
             self._make_array()
 
@@ -262,11 +289,38 @@ class NDArrayType(AsdfType):
                 shape, dtype, block.data,
                 self._offset, self._strides, self._order)
             self._array = self._apply_mask(self._array, self._mask)
-            if block.readonly:
+            if block.readonly or self._copy_on_write:
                 self._array.setflags(write=False)
         return self._array
 
-    def _apply_mask(self, array, mask):
+    def _get_writable_array(self):
+        # The first modification of a copy-on-write array copies its
+        # data, after which the array no longer refers to its block.
+        array = self._make_array()
+        if self._copy_on_write:
+            self._array = array = array.copy()
+            self._shape = list(array.shape)
+            self._source = None
+            self._block = None
+            self._copy_on_write = False
+        return array
+
+    def _make_copy_on_write(self):
+        """
+        Get an array that shares this array's data, without loading it,
+        and copies the data the first time it is modified.  See
+        `asdf.AsdfFile.copy`.
+        """
+        result = object.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        if self._array is not None:
+            result._array = self._array.view()
+            result._array.setflags(write=False)
+        result._copy_on_write = True
+        return result
+
+    @staticmethod
+    def _apply_mask(array, mask):
         if isinstance(mask, (np.ndarray, NDArrayType)):
             # Use "mask.view()" here so the underlying possibly
             # memmapped mask array is freed properly when the masked
@@ -284,6 +338,139 @@ class NDArrayType(AsdfType):
     def __array__(self):
         return self._make_array()
 
+    def __reduce__(self):
+        # Pickle a handle to the block rather than the whole file, see
+        # Block.__reduce__.  The result is unpickled as a numpy array.
+        if self._source is None or isinstance(self._source, (list, tagged.InlineArray)):
+            return self._make_array().__reduce__()
+
+        block = self.block
+        shape = self.get_actual_shape(
+            self._shape, self._strides, self._dtype, len(block))
+        if block.trust_data_dtype:
+            dtype = block.data.dtype
+        else:
+            dtype = self._dtype
+
+        return (_restore_array, (
+            block, tuple(shape), dtype, self._offset,
+            self._strides, self._order, self._mask))
+
+    def iter_chunks(self, rows=None, nbytes=None):
+        """
+        Iterate over the array in pieces along its first axis, without
+        loading the whole array into memory.
+
+        Arrays stored contiguously in a binary block that isn't already
+        in memory are read from the file a piece at a time, and
+        compressed blocks are decompressed as they are read, so memory
+        use is bounded by the size of a piece whatever the storage of
+        the block.  Pieces of other arrays are views of the whole array.
+
+        Parameters
+        ----------
+        rows : int, optional
+            The number of items along the first axis in each piece.
+
+        nbytes : int, optional
+            The maximum size of each piece in bytes, although each piece
+            has at least one item along the first axis.  If neither
+            ``rows`` nor ``nbytes`` is given, defaults to the configured
+            ``io_chunk_size``.
+
+        Yields
+        ------
+        chunk : numpy.ndarray
+        """
+        if rows is not None and rows < 1:
+            raise ValueError("rows must be a positive integer")
+        if nbytes is not None and nbytes < 1:
+            raise ValueError("nbytes must be a positive integer")
+
+        shape = self.shape
+        if len(shape) == 0:
+            raise TypeError("iteration over a 0-d array")
+        if shape[0] == 0:
+            return
+
+        if self._array is None and self._mask is None and self._source is not None:
+            block = self.block
+            if block.trust_data_dtype:
+                dtype = block.data.dtype
+            else:
+                dtype = self._dtype
+        else:
+            block = dtype = None
+
+        if dtype is not None:
+            row_shape = tuple(shape[1:])
+            row_nbytes = int(np.prod(row_shape, dtype=np.int64)) * dtype.itemsize
+            contiguous_strides = np.empty((0,) + row_shape, dtype).strides[1:]
+            if self._strides is not None and (
+                    len(shape) > 1 and tuple(self._strides[1:]) != contiguous_strides or
+                    shape[0] > 1 and self._strides[0] != row_nbytes):
+                block = None
+        else:
+            row_nbytes = self._make_array()[:1].nbytes
+
+        if rows is None:
+            if nbytes is None:
+                nbytes = get_config().io_chunk_size
+            rows = max(1, nbytes // max(row_nbytes, 1))
+        elif nbytes is not None:
+            rows = max(1, min(rows, nbytes // max(row_nbytes, 1)))
+
+        if block is None or row_nbytes == 0:
+            array = self._make_array()
+            for i in range(0, shape[0], rows):
+                yield array[i:i + rows]
+            return
+
+        # Gather the pieces of the block's data into chunks of whole
+        # rows, which are views of the pieces whenever they line up.
+        chunk_size = rows * row_nbytes
+        remaining = shape[0] * row_nbytes
+        size = min(chunk_size, remaining)
+        pending = []
+        pending_size = 0
+        for piece in block.iter_data(self._offset, chunk_size):
+            while len(piece):
+                used = piece[:size - pending_size]
+                piece = piece[len(used):]
+                pending.append(used)
+                pending_size += len(used)
+                if pending_size == size:
+                    data = pending[0] if len(pending) == 1 else np.concatenate(pending)
+                    yield np.ndarray((size // row_nbytes,) + row_shape, dtype, data)
+                    remaining -= size
+                    if remaining == 0:
+                        return
+                    size = min(chunk_size, remaining)
+                    pending = []
+                    pending_size = 0
+
+        raise ValueError("The block is too small for the array")
+
+    def to_shared_memory(self):
+        """
+        Move the data of the array's block into shared memory, so that
+        pickling the array, for example to send it to the workers of a
+        `multiprocessing.Pool`, attaches to the same memory instead of
+        copying the data.  See `asdf.block.Block.to_shared_memory`.
+
+        Returns
+        -------
+        multiprocessing.shared_memory.SharedMemory
+            The segment, which the caller should ``unlink`` once no
+            process needs the data any longer.
+        """
+        if self._source is None or isinstance(self._source, (list, tagged.InlineArray)):
+            raise ValueError("Only arrays stored in a binary block can be shared")
+
+        segment = self.block.to_shared_memory()
+        self._array = None
+        return segment
+
     def __repr__(self):
         # repr alone should not force loading of the data
         if self._array is None:
@@ -321,7 +508,7 @@ class NDArrayType(AsdfType):
 
     @property
     def block(self):
-        if self._block is None:
+        if self._block is None and self._source is not None:
             self._block = self._asdffile.blocks.get_block(self._source)
         return self._block
 
@@ -360,9 +547,10 @@ class NDArrayType(AsdfType):
         # in the case that array assignment causes an exception. The segfault
         # originates from the call to __repr__ inside the traceback report.
         try:
-            self._make_array().__setitem__(*args)
+            self._get_writable_array().__setitem__(*args)
         except Exception as e:
-            self._array = None
+            if self._source is not None:
+                self._array = None
             raise e from None
 
     @classmethod
@@ -409,17 +597,24 @@ class NDArrayType(AsdfType):
     @classmethod
     def to_tree(cls, data, ctx):
         if any(stride == 0 for stride in data.strides):
-            data = np.ascontiguousarray(data)
+            # Zero strides are not permitted, so broadcast arrays are
+            # given their own block, which the block manager writes
+            # out in C order without first copying it in memory.
+            offset = 0
+            strides = None
+        else:
+            base = ctx.blocks.get_array_base(data)
+            offset = data.ctypes.data - base.ctypes.data
+
+            if data.flags.c_contiguous:
+                strides = None
+            else:
+                strides = data.strides
 
-        base = util.get_array_base(data)
+        # Read these after the array has been loaded above, since a lazy
+        # NDArrayType may report a different dtype before then.
         shape = data.shape
         dtype = data.dtype
-        offset = data.ctypes.data - base.ctypes.data
-
-        if data.flags.c_contiguous:
-            strides = None
-        else:
-            strides = data.strides
 
         block = ctx.blocks.find_or_create_block_for_array(data, ctx)
 
@@ -435,8 +630,10 @@ class NDArrayType(AsdfType):
         byteorder = block.override_byteorder(byteorder)
 
         if block.array_storage == 'inline':
-            listdata = numpy_array_to_list(data)
-            result['data'] = listdata
+            if _is_inline_array_dtype(data):
+                result['data'] = tagged.InlineArray(np.asarray(data))
+            else:
+                result['data'] = numpy_array_to_list(data)
             result['datatype'] = dtype
         else:
             result['shape'] = list(shape)
@@ -506,18 +703,36 @@ class NDArrayType(AsdfType):
     def copy_to_new_asdf(cls, node, asdffile):
         if isinstance(node, NDArrayType):
             array = node._make_array()
-            asdffile.blocks.set_array_storage(asdffile.blocks[array],
-                                              node.block.array_storage)
+            if node.block is not None:
+                asdffile.blocks.set_array_storage(asdffile.blocks[array],
+                                                  node.block.array_storage)
             return node._make_array()
         return node
 
 
+def _restore_array(block, shape, dtype, offset, strides, order, mask):
+    """
+    Create an array from the handle made by `NDArrayType.__reduce__`.
+    """
+    array = np.ndarray(shape, dtype, block.data, offset, strides, order)
+    array = NDArrayType._apply_mask(array, mask)
+    if block.readonly:
+        array.setflags(write=False)
+    return array
+
+
 def _make_operation(name):
     def __operation__(self, *args):
         return getattr(self._make_array(), name)(*args)
     return __operation__
 
 
+def _make_inplace_operation(name):
+    def __operation__(self, *args):
+        return getattr(self._get_writable_array(), name)(*args)
+    return __operation__
+
+
 for op in [
         '__neg__', '__pos__', '__abs__', '__invert__', '__complex__',
         '__int__', '__long__', '__float__', '__oct__', '__hex__',
@@ -528,14 +743,19 @@ for op in [
         '__div__', '__truediv__', '__radd__', '__rsub__', '__rmul__',
         '__rdiv__', '__rtruediv__', '__rfloordiv__', '__rmod__',
         '__rdivmod__', '__rpow__', '__rlshift__', '__rrshift__',
-        '__rand__', '__rxor__', '__ror__', '__iadd__', '__isub__',
-        '__imul__', '__idiv__', '__itruediv__', '__ifloordiv__',
-        '__imod__', '__ipow__', '__ilshift__', '__irshift__',
-        '__iand__', '__ixor__', '__ior__', '__getitem__',
+        '__rand__', '__rxor__', '__ror__', '__getitem__',
         '__delitem__', '__contains__']:
     setattr(NDArrayType, op, _make_operation(op))
 
 
+for op in [
+        '__iadd__', '__isub__',
+        '__imul__', '__idiv__', '__itruediv__', '__ifloordiv__',
+        '__imod__', '__ipow__', '__ilshift__', '__irshift__',
+        '__iand__', '__ixor__', '__ior__']:
+    setattr(NDArrayType, op, _make_inplace_operation(op))
+
+
 def _get_ndim(instance):
     if isinstance(instance, list):
         array = inline_data_asarray(instance)
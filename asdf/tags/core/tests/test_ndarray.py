@@ -1,5 +1,6 @@
 import io
 import os
+import pickle
 import re
 import sys
 
@@ -14,11 +15,14 @@ import jsonschema
 import yaml
 
 import asdf
-from asdf import util
+from asdf import tagged, util, yamlutil
 from asdf.tests import helpers, CustomTestType
 from asdf.tags.core import ndarray
 
 from . import data as test_data
+
+
+NDARRAY_TAG = 'tag:stsci.edu:asdf/core/ndarray-1.0.0'
 TEST_DATA_PATH = helpers.get_test_data_path('', module=test_data)
 
 
@@ -297,6 +301,101 @@ def test_inline_bare():
         assert_array_equal(ff.tree['arr'], [[1, 2, 3, 4], [5, 6, 7, 8]])
 
 
+@pytest.mark.parametrize('array', [
+    np.array([[1.5, -0.0, 1e16, 1e-20], [np.nan, np.inf, -np.inf, 3.0]]),
+    np.array([0.1, 2.5, 1e30], dtype=np.float32),
+    np.arange(24, dtype='>i4').reshape(2, 3, 4),
+    np.array([0, 2**62], dtype=np.uint64),
+    np.array([[True, False], [False, True]]),
+])
+def test_inline_array_yaml(array):
+    # Inline data is written exactly as its nested lists would be
+    # written, and read back as an InlineArray
+    tree = {'data': tagged.InlineArray(array)}
+    content = yaml.dump(tree, Dumper=yamlutil.AsdfDumper)
+    assert content == yaml.dump({'data': array.tolist()}, Dumper=yamlutil.AsdfDumper)
+
+    content = yaml.dump(tagged.TaggedDict({'data': array.tolist()}, NDARRAY_TAG), Dumper=yamlutil.AsdfDumper)
+    data = yamlutil.load_tree(content)['data']
+    assert isinstance(data, tagged.InlineArray)
+    assert_array_equal(data.array, array)
+
+
+@pytest.mark.parametrize('data', [
+    '[017, 1, 2]',
+    '[0x1F, 2]',
+    '[1:30, 2]',
+    '[1, 2.5]',
+    '[[1, 2], [3]]',
+    '[99999999999999999999, 1]',
+])
+def test_inline_array_yaml_fallback(data):
+    # Data that numpy would read differently from YAML, or that doesn't
+    # form an array of a single type, is read as nested lists
+    content = "--- !<{}>\ndata: {}\n".format(NDARRAY_TAG, data)
+    tree = yamlutil.load_tree(content)
+    assert tree['data'] == yaml.safe_load(data)
+    assert not isinstance(tree['data'], tagged.InlineArray)
+
+
+def test_inline_array_validation():
+    schema = {
+        'type': 'array',
+        'items': {'type': 'array', 'items': {'type': 'integer', 'maximum': 10}},
+    }
+    array = np.arange(12).reshape(3, 4)
+    af = asdf.AsdfFile()
+    asdf.schema.validate(tagged.InlineArray(array - 2), af, schema=schema)
+    with pytest.raises(jsonschema.ValidationError):
+        asdf.schema.validate(tagged.InlineArray(array), af, schema=schema)
+    with pytest.raises(jsonschema.ValidationError):
+        asdf.schema.validate(tagged.InlineArray(array.astype(float)), af, schema=schema)
+
+
+@pytest.mark.parametrize('items, data', [
+    ({'type': 'integer', 'multipleOf': 2}, [2, 3, 4]),
+    ({'enum': [1, 2, 3, 9]}, [1, 5, 9]),
+    ({'not': {'enum': [5]}}, [1, 5, 9]),
+    ({'type': 'array', 'items': {'multipleOf': 2}}, [[2, 4], [3, 6]]),
+])
+def test_inline_array_validation_all_items(items, data):
+    # Keywords that don't depend only on the type and range of the items
+    # are checked against every item, and errors show the plain list
+    schema = {'type': 'array', 'items': items}
+    af = asdf.AsdfFile()
+    asdf.schema.validate(data, af, schema={'type': 'array'})
+    with pytest.raises(jsonschema.ValidationError) as list_error:
+        asdf.schema.validate(data, af, schema=schema)
+    with pytest.raises(jsonschema.ValidationError) as array_error:
+        asdf.schema.validate(tagged.InlineArray(np.array(data)), af, schema=schema)
+    assert str(array_error.value) == str(list_error.value)
+
+
+def test_inline_array_datatype_cast():
+    # Casts that could lose values are checked as they are for lists
+    content = """
+    arr: !core/ndarray-1.0.0
+      datatype: int8
+      data: [1.5, .inf, -.inf, .nan]
+    """
+    buff = helpers.yaml_to_asdf(content)
+
+    with pytest.raises(OverflowError):
+        with asdf.open(buff) as ff:
+            ff.tree['arr']
+
+    content = """
+    arr: !core/ndarray-1.0.0
+      datatype: float64
+      data: [1, 2, 3]
+    """
+    buff = helpers.yaml_to_asdf(content)
+
+    with asdf.open(buff) as ff:
+        assert ff.tree['arr'].dtype == np.float64
+        assert_array_equal(ff.tree['arr'], [1, 2, 3])
+
+
 def test_mask_roundtrip(tmpdir):
     x = np.arange(0, 10, dtype=float)
     m = ma.array(x, mask=x > 5)
@@ -826,6 +925,52 @@ def test_broadcasted_offset_array(tmpdir):
     helpers.assert_roundtrip_tree(tree, tmpdir)
 
 
+def test_broadcasted_array_single_block(tmpdir):
+    broadcasted = np.broadcast_to(np.arange(10), (1000, 10))
+    tree = {'broadcasted': broadcasted}
+
+    with asdf.config_context() as config:
+        config.io_chunk_size = 64
+        helpers.assert_roundtrip_tree(tree, tmpdir)
+
+        path = str(tmpdir.join('broadcasted.asdf'))
+        asdf.AsdfFile(tree).write_to(path)
+
+    with asdf.open(path) as af:
+        blocks = list(af.blocks.internal_blocks)
+        assert len(blocks) == 1
+        assert len(blocks[0]) == broadcasted.nbytes
+        assert_array_equal(af.tree['broadcasted'], broadcasted)
+
+
+@pytest.mark.parametrize('make_array', [
+    # Broadcast, so it gets a block of its own rather than its base's
+    lambda: np.broadcast_to(np.arange(100, dtype='>f8'), (30, 100))[::2, ::3],
+    # Owns its data, which is neither C nor Fortran contiguous
+    lambda: np.arange(3000, dtype='>f8').reshape(10, 30, 10).transpose(2, 0, 1) * 1,
+])
+@pytest.mark.parametrize('compression', [None, 'zlib'])
+def test_non_contiguous_array_chunked_write(tmpdir, compression, make_array):
+    array = make_array()
+    assert not (array.flags.c_contiguous or array.flags.f_contiguous)
+    assert util.get_array_base(array) is array or 0 in array.strides
+    tree = {'array': array}
+    path = str(tmpdir.join('non_contiguous.asdf'))
+
+    with asdf.config_context() as config:
+        config.io_chunk_size = 100
+        af = asdf.AsdfFile(tree)
+        af.set_array_compression(array, compression)
+        af.write_to(path)
+
+    with asdf.open(path) as af:
+        blocks = list(af.blocks.internal_blocks)
+        assert len(blocks) == 1
+        assert blocks[0].data.nbytes == array.nbytes
+        assert_array_equal(af.tree['array'], array)
+        assert af.tree['array'].dtype == array.dtype
+
+
 def test_non_contiguous_base_array(tmpdir):
     base = np.arange(60).reshape(5, 4, 3).transpose(2, 0, 1) * 1
     contiguous = base.transpose(1, 2, 0)
@@ -892,3 +1037,99 @@ def test_block_data_change(tmpdir):
         af.update()
         array_after = af.tree["data"].__array__()
         assert array_before is not array_after
+
+
+def test_pickle(tmpdir):
+    tree = {
+        'array': np.arange(100.0),
+        'strided': np.arange(300).reshape(30, 10)[:, ::2],
+        'masked': ma.array(np.arange(200), mask=np.arange(200) % 3 == 0),
+        'inline': np.arange(5),
+    }
+    path = str(tmpdir.join('test.asdf'))
+    compressed_path = str(tmpdir.join('compressed.asdf'))
+    asdf.AsdfFile(tree).write_to(path)
+    asdf.AsdfFile(tree).write_to(compressed_path, all_array_compression='zlib')
+
+    with asdf.open(path) as af:
+        for key, value in tree.items():
+            result = pickle.loads(pickle.dumps(af[key]))
+            assert_array_equal(result, value)
+            if key != 'inline':
+                # Uncompressed blocks are memory mapped again
+                assert isinstance(util.get_array_base(result), np.memmap)
+                assert not result.flags.writeable
+
+    with asdf.open(compressed_path) as af:
+        result = pickle.loads(pickle.dumps(af['array']))
+        assert_array_equal(result, tree['array'])
+        assert not isinstance(util.get_array_base(result), np.memmap)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires multiprocessing.shared_memory")
+def test_to_shared_memory(tmpdir):
+    path = str(tmpdir.join('test.asdf'))
+    asdf.AsdfFile({'array': np.arange(1000.0)}).write_to(path, all_array_compression='zlib')
+
+    with asdf.open(path) as af:
+        segment = af['array'].to_shared_memory()
+        try:
+            content = pickle.dumps(af['array'])
+            assert len(content) < 1000
+            result = pickle.loads(content)
+            assert_array_equal(result, np.arange(1000.0))
+            assert np.shares_memory(result, np.asarray(af['array']))
+        finally:
+            segment.unlink()
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'bzp2'])
+def test_iter_chunks(tmpdir, compression):
+    path = str(tmpdir.join('test.asdf'))
+    array = np.arange(7000, dtype='>f8').reshape(1000, 7)
+    tree = {'array': array, 'strided': array[:, ::2]}
+    asdf.AsdfFile(tree).write_to(path, all_array_compression=compression)
+
+    with asdf.open(path, copy_arrays=True) as af:
+        chunks = list(af['array'].iter_chunks(rows=300))
+        assert [c.shape for c in chunks] == [(300, 7)] * 3 + [(100, 7)]
+        assert_array_equal(np.concatenate(chunks), array)
+
+        chunks = list(af['array'].iter_chunks(nbytes=1000))
+        assert all(c.nbytes <= 1000 for c in chunks)
+        assert_array_equal(np.concatenate(chunks), array)
+
+        # The data was read a piece at a time, not loaded in full
+        assert af['array'].block._data is None
+
+        chunks = list(af['strided'].iter_chunks(rows=300, nbytes=1000))
+        assert [len(c) for c in chunks[:2]] == [31, 31]
+        assert_array_equal(np.concatenate(chunks), tree['strided'])
+
+        with pytest.raises(ValueError):
+            next(af['array'].iter_chunks(rows=0))
+
+
+@pytest.mark.parametrize('shape', [(0,), (0, 3), (4, 0)])
+def test_iter_chunks_empty(tmpdir, shape):
+    path = str(tmpdir.join('test.asdf'))
+    asdf.AsdfFile({'array': np.zeros(shape)}).write_to(path, auto_inline=None)
+
+    with asdf.open(path) as af:
+        chunks = list(af['array'].iter_chunks(rows=2))
+        assert [c.shape for c in chunks] == [(2,) + shape[1:]] * (shape[0] // 2)
+
+
+def test_iter_chunks_streamed(tmpdir):
+    from asdf import stream
+
+    path = str(tmpdir.join('test.asdf'))
+    with open(path, 'wb') as fd:
+        asdf.AsdfFile({'stream': stream.Stream([3], np.float64)}).write_to(fd)
+        for i in range(10):
+            fd.write(np.full(3, i, np.float64).tobytes())
+
+    with asdf.open(path) as af:
+        chunks = list(af['stream'].iter_chunks(rows=4))
+        assert [c.shape for c in chunks] == [(4, 3), (4, 3), (2, 3)]
+        assert_array_equal(np.concatenate(chunks)[:, 0], np.arange(10))
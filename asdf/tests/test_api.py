@@ -1,7 +1,9 @@
+import copy
 import os
 import io
 import getpass
 import pathlib
+import subprocess
 import sys
 
 import numpy as np
@@ -17,6 +19,7 @@ from asdf import constants
 from asdf import get_config, config_context
 from asdf import treeutil
 from asdf import extension
+from asdf import util
 from asdf import resolver
 from asdf import schema
 from asdf import versioning
@@ -117,6 +120,36 @@ invalid_software: !core/software-1.0.0
         assert af["invalid_software"]["version"] == 3
 
 
+def test_open_validate_on_read_lazy(monkeypatch):
+    content = """
+software: !core/software-1.0.0
+  name: Minesweeper
+  version: "3"
+nested:
+  invalid_software: !core/software-1.0.0
+    name: Minesweeper
+    version: 3
+"""
+    buff = yaml_to_asdf(content)
+
+    with asdf.config_context() as config:
+        config.validate_on_read = 'lazy'
+        with pytest.raises(ValidationError):
+            with asdf.open(buff):
+                pass
+
+        # Nodes are validated as they are converted, instead of
+        # validating the whole tree up front
+        config.legacy_fill_schema_defaults = False
+        def fail_validate(*args, **kwargs):
+            raise AssertionError("tree validated up front")
+        monkeypatch.setattr(asdf.schema, "validate", fail_validate)
+        buff = yaml_to_asdf(content.replace("version: 3", "version: '3'"))
+        with asdf.open(buff) as af:
+            assert af["software"]["version"] == "3"
+            assert af["nested"]["invalid_software"]["name"] == "Minesweeper"
+
+
 def test_atomic_write(tmpdir, small_tree):
     tmpfile = os.path.join(str(tmpdir), 'test.asdf')
 
@@ -257,6 +290,78 @@ def test_copy(tmpdir):
     assert_array_equal(ff2.tree['my_array'], ff2.tree['my_array'])
 
 
+@pytest.mark.parametrize('copy_arrays', [False, True])
+@pytest.mark.parametrize('compression', [None, 'zlib'])
+def test_copy_after_close(tmpdir, copy_arrays, compression):
+    path = str(tmpdir.join('test.asdf'))
+    tree = {'a': np.arange(10), 'meta': {'name': 'original'}}
+    asdf.AsdfFile(tree).write_to(path, all_array_compression=compression)
+
+    # By default, the copy doesn't depend on the original staying open
+    with asdf.open(path, copy_arrays=copy_arrays) as af:
+        new = af.copy()
+
+    assert_array_equal(new['a'], tree['a'])
+    buff = io.BytesIO()
+    new.write_to(buff)
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        assert_array_equal(af['a'], tree['a'])
+        assert af['meta']['name'] == 'original'
+
+
+def test_copy_on_write(tmpdir):
+    path = str(tmpdir.join('test.asdf'))
+    tree = {
+        'small': np.arange(10),
+        'large': np.arange(1000.0),
+        'untouched': np.arange(1000.0),
+        'meta': {'name': 'original'},
+    }
+    asdf.AsdfFile(tree).write_to(path, all_array_compression='zlib')
+
+    with asdf.open(path) as af:
+        copy = af.copy(copy_on_write=True)
+        copy['meta']['name'] = 'copy'
+        copy['small'][0] = 100
+        copy['large'][:] = copy['large'] * 2
+        assert af['meta']['name'] == 'original'
+        assert af['small'][0] == 0
+        assert_array_equal(af['large'], tree['large'])
+        assert_array_equal(copy['large'], tree['large'] * 2)
+        # The data of arrays that aren't modified is shared, and not loaded
+        assert copy['untouched'].block is af['untouched'].block
+        assert copy['untouched']._array is None
+
+        buff = io.BytesIO()
+        copy.write_to(buff)
+
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        assert af['meta']['name'] == 'copy'
+        assert af['small'][0] == 100
+        assert_array_equal(af['large'], tree['large'] * 2)
+        assert_array_equal(af['untouched'], tree['untouched'])
+
+
+def test_copy_in_memory_arrays():
+    tree = {'array': np.arange(10), 'nested': {'array': np.arange(10.0)}}
+    af = asdf.AsdfFile(tree)
+    copy = af.copy(copy_on_write=True)
+
+    # Arrays that are not read from a file can be written to in the
+    # copy, and writes to either tree don't show up in the other
+    copy['array'][0] = 100
+    copy['nested']['array'] *= 2
+    assert af['array'][0] == 0
+    assert_array_equal(af['nested']['array'], np.arange(10.0))
+
+    af['array'][1] = 200
+    assert copy['array'][1] == 1
+    assert_array_equal(copy['array'], [100] + list(range(1, 10)))
+    assert_array_equal(copy['nested']['array'], np.arange(10.0) * 2)
+
+
 def test_tag_to_schema_resolver_deprecation():
     ff = asdf.AsdfFile()
     with pytest.warns(AsdfDeprecationWarning):
@@ -573,3 +678,214 @@ def test_none_values(tmpdir):
     with asdf.open(path) as af:
         assert "foo" in af
         assert af["foo"] is None
+
+
+def test_open_select(tmpdir):
+    path = str(tmpdir.join("test.asdf"))
+    shared = {"value": 1}
+    tree = {
+        "meta": {"exposure": 5, "other": {"array": np.arange(4)}},
+        "data": np.arange(10),
+        "table": [{"row": i} for i in range(10)],
+        "a": shared,
+        "b": shared,
+    }
+    asdf.AsdfFile(tree).write_to(path)
+
+    with asdf.open(path, select=["/meta/exposure", "/data"]) as af:
+        assert set(af.tree.keys()) == {"meta", "data"}
+        assert af["meta"] == {"exposure": 5}
+        assert_array_equal(af["data"], np.arange(10))
+
+        af["meta"]["exposure"] = 6
+        af["table"] = []
+        out_path = str(tmpdir.join("out.asdf"))
+        af.write_to(out_path)
+
+    with asdf.open(out_path) as af:
+        assert af["meta"]["exposure"] == 6
+        assert_array_equal(af["meta"]["other"]["array"], np.arange(4))
+        assert af["table"] == []
+        assert af["a"] is af["b"]
+
+
+def test_open_select_alias(tmpdir):
+    path = str(tmpdir.join("test.asdf"))
+    shared = {"value": 1}
+    asdf.AsdfFile({"a": shared, "b": shared, "c": 1}).write_to(path)
+
+    # The alias can't be resolved when its anchor is skipped, so the
+    # whole tree is read instead.
+    with asdf.open(path, select=["/b"]) as af:
+        assert af["a"] is af["b"]
+        assert af["c"] == 1
+
+
+def test_open_select_set_tree(tmpdir):
+    path = str(tmpdir.join("test.asdf"))
+    asdf.AsdfFile({"a": 1, "b": 2}).write_to(path)
+
+    # A new tree replaces the entries that were left out, too
+    with asdf.open(path, select=["/a"]) as af:
+        af.tree = {"c": 3}
+        out_path = str(tmpdir.join("out.asdf"))
+        af.write_to(out_path)
+
+    with asdf.open(out_path) as af:
+        assert "a" not in af
+        assert "b" not in af
+        assert af["c"] == 3
+
+
+def test_open_select_relative_reference(tmpdir):
+    tmpdir.mkdir("sub")
+    asdf.AsdfFile({"data": [1, 2, 3]}).write_to(str(tmpdir.join("sub", "external.asdf")))
+
+    path = str(tmpdir.join("test.asdf"))
+    tree = {
+        "a": 1,
+        "meta": {
+            "id": util.filepath_to_url(str(tmpdir.join("sub"))) + "/",
+            "selected": {"$ref": "external.asdf#/data"},
+            "unselected": {"$ref": "external.asdf#/data"},
+        },
+    }
+    asdf.AsdfFile(tree).write_to(path)
+
+    # The references are relative to the id of the mapping that holds
+    # them, whether or not they were selected.
+    with asdf.open(path, select=["/a", "/meta/selected"]) as af:
+        assert "unselected" not in af["meta"]
+        result = af.copy()
+        result.resolve_references()
+        assert result["meta"]["selected"] == [1, 2, 3]
+        assert result["meta"]["unselected"] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("copy_func", [copy.copy, copy.deepcopy])
+def test_open_select_copy(tmpdir, copy_func):
+    path = str(tmpdir.join("test.asdf"))
+    asdf.AsdfFile({"a": 1, "b": {"array": np.arange(4)}}).write_to(path)
+
+    with asdf.open(path, select=["/a"]) as af:
+        result = copy_func(af)
+        assert_array_equal(result["b"]["array"], np.arange(4))
+        out_path = str(tmpdir.join("out.asdf"))
+        result.write_to(out_path)
+
+    with asdf.open(out_path) as af:
+        assert af["a"] == 1
+        assert_array_equal(af["b"]["array"], np.arange(4))
+
+
+def test_lazy_attributes():
+    assert set(asdf.__all__) <= set(dir(asdf))
+    for name in asdf.__all__:
+        assert getattr(asdf, name) is not None
+    assert asdf.open is asdf.asdf.open_asdf
+    assert asdf.ValidationError is ValidationError
+
+    with pytest.raises(AttributeError):
+        asdf.nonexistent
+
+
+def test_submodule_attributes():
+    code = (
+        "import asdf\n"
+        "assert asdf.stream.Stream is asdf.Stream\n"
+        "assert asdf.schema.load_schema\n"
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, asdf\n"
+        "assert 'asdf.asdf' not in sys.modules\n"
+        "assert 'asdf.commands' not in sys.modules\n"
+        "assert 'numpy' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_command_functions():
+    from asdf import commands
+    from asdf.commands.diff import diff
+
+    assert commands.diff is diff
+    for name in commands.__all__:
+        assert callable(getattr(commands, name))
+
+
+@pytest.mark.parametrize('version', ['1.0.0', '1.5.0'])
+def test_dumps_loads(version):
+    tree = {
+        'items': [1, 'two', {'three': 3.0}],
+        'software': asdf.tags.core.Software(name='foo', version='1.0'),
+    }
+    buff = io.BytesIO()
+    asdf.AsdfFile(tree, version=version).write_to(buff)
+
+    content = asdf.dumps(tree, version=version)
+    assert content == buff.getvalue()
+    # The second call reuses the cached context
+    assert asdf.dumps(tree, version=version) == content
+
+    result = asdf.loads(content)
+    assert isinstance(result, asdf.tags.core.AsdfObject)
+    assert result['items'] == tree['items']
+    assert result['software'] == tree['software']
+    assert 'asdf_library' in result
+
+
+def test_dumps_loads_arrays():
+    tree = {'array': np.arange(10), 'history': {'entries': []}}
+    buff = io.BytesIO()
+    asdf.AsdfFile(tree).write_to(buff)
+
+    content = asdf.dumps(tree)
+    assert content == buff.getvalue()
+    assert_array_equal(asdf.loads(content)['array'], tree['array'])
+
+
+def test_loads_validation():
+    content = b"""#ASDF 1.0.0
+#ASDF_STANDARD 1.5.0
+%YAML 1.1
+%TAG ! tag:stsci.edu:asdf/
+--- !core/asdf-1.1.0
+software: !core/software-1.0.0 {name: 5}
+...
+"""
+    with pytest.raises(ValidationError):
+        asdf.loads(content)
+
+    with config_context() as config:
+        config.validate_on_read = False
+        assert asdf.loads(content)['software']['name'] == 5
+
+    with pytest.raises(ValueError):
+        asdf.loads(b"not an asdf file")
+
+
+def test_write_to_buffers():
+    tree = {
+        'contiguous': np.arange(1000.0),
+        'strided': np.arange(100)[::2],
+        'nested': {'big_endian': np.ones((30, 30), dtype='>i4')},
+    }
+    buff = io.BytesIO()
+    asdf.AsdfFile(tree).write_to(buff)
+
+    buffers = asdf.AsdfFile(tree).write_to_buffers(checksums=True)
+    assert all(isinstance(b, memoryview) for b in buffers)
+    assert b''.join(buffers) == buff.getvalue()
+    # The data of contiguous arrays isn't copied
+    assert any(np.shares_memory(np.frombuffer(b, np.uint8), tree['contiguous']) for b in buffers)
+
+    buffers = asdf.AsdfFile(tree).write_to_buffers(all_array_compression='zlib')
+    with asdf.open(io.BytesIO(b''.join(buffers)), validate_checksums=True) as af:
+        assert af.blocks[af['contiguous']].checksum is None
+        assert_array_equal(af['contiguous'], tree['contiguous'])
+        assert_array_equal(af['strided'], tree['strided'])
+        assert_array_equal(af['nested']['big_endian'], tree['nested']['big_endian'])
@@ -1,5 +1,6 @@
 import io
 import os
+import pickle
 
 import numpy as np
 from numpy.testing import assert_array_equal
@@ -540,6 +541,94 @@ def test_block_index():
                 assert isinstance(ff2.blocks._internal_blocks[i], block.UnloadedBlock)
 
 
+@pytest.mark.parametrize('copy_arrays', [True, False])
+def test_coalesced_block_reads(tmpdir, monkeypatch, copy_arrays):
+    tmpfile = os.path.join(str(tmpdir), 'many_blocks.asdf')
+
+    arrays = [np.arange(i, i + 16, dtype=np.float64) for i in range(100)]
+    ff = asdf.AsdfFile({'arrays': arrays})
+    ff.set_array_compression(arrays[50], 'zlib')
+    ff.write_to(tmpfile, auto_inline=None)
+
+    reads = []
+    for name in ['read_into_array', 'memmap_array']:
+        method = getattr(generic_io.RealFile, name)
+        def wrapper(self, *args, _method=method, _name=name):
+            reads.append(_name)
+            return _method(self, *args)
+        monkeypatch.setattr(generic_io.RealFile, name, wrapper)
+
+    with asdf.open(tmpfile, lazy_load=False, copy_arrays=copy_arrays,
+                   validate_checksums=True) as af:
+        assert not any(isinstance(b, block.UnloadedBlock)
+                       for b in af.blocks.blocks)
+        # The first and last blocks are read on their own, the
+        # compressed block is decompressed on its own, and everything
+        # in between is read in one go.
+        assert len(reads) <= 4
+        for expected, array in zip(arrays, af.tree['arrays']):
+            assert_array_equal(array, expected)
+        assert all(b.array_storage == 'internal' for b in af.blocks.blocks)
+
+
+def test_coalesced_block_reads_update(tmpdir):
+    tmpfile = os.path.join(str(tmpdir), 'many_blocks.asdf')
+
+    arrays = [np.arange(i, i + 16, dtype=np.float64) for i in range(20)]
+    asdf.AsdfFile({'arrays': arrays}).write_to(tmpfile, auto_inline=None)
+
+    with asdf.open(tmpfile, mode='rw', lazy_load=False) as af:
+        af.tree['arrays'][10][:] = -1
+        af.tree['arrays'].append(np.zeros(16))
+        af.update(auto_inline=None)
+
+    arrays[10][:] = -1
+    with asdf.open(tmpfile, validate_checksums=True) as af:
+        assert len(af.tree['arrays']) == 21
+        for expected, array in zip(arrays, af.tree['arrays']):
+            assert_array_equal(array, expected)
+
+
+def test_coalesced_block_reads_memmap(tmpdir, monkeypatch):
+    tmpfile = os.path.join(str(tmpdir), 'many_blocks.asdf')
+    outfile = os.path.join(str(tmpdir), 'copy.asdf')
+
+    arrays = [np.arange(i, i + 16, dtype=np.float64) for i in range(20)]
+    asdf.AsdfFile({'arrays': arrays}).write_to(tmpfile, auto_inline=None)
+
+    calls = []
+    copy_file_range = generic_io._copy_file_range
+    def _copy_file_range(*args):
+        calls.append(args)
+        return copy_file_range(*args)
+    monkeypatch.setattr(generic_io, '_copy_file_range', _copy_file_range)
+
+    with asdf.open(tmpfile, lazy_load=False) as af:
+        blocks = list(af.blocks.internal_blocks)
+        assert all(type(b) is block.Block for b in blocks)
+        middle = blocks[10]
+        # A slice of the memory map shared with its neighbours
+        assert isinstance(middle._data, np.memmap)
+        assert middle._data.base is blocks[9]._data.base
+        with open(tmpfile, 'rb') as fd:
+            fd.seek(middle.data_offset)
+            assert fd.read(middle._size) == arrays[10].tobytes()
+        assert af.blocks[af.tree['arrays'][10]] is middle
+        assert af.blocks[af.tree['arrays'][10][2:]] is middle
+
+        # Unchanged blocks are copied by the kernel, and pickled as
+        # handles to the file
+        af.write_to(outfile, auto_inline=None)
+        assert len(calls) == len(arrays)
+        result = pickle.loads(pickle.dumps(af.tree['arrays'][10]))
+        assert isinstance(result.base, np.memmap)
+        assert_array_equal(result, arrays[10])
+
+    with asdf.open(outfile, validate_checksums=True) as af:
+        for expected, array in zip(arrays, af.tree['arrays']):
+            assert_array_equal(array, expected)
+
+
 def test_large_block_index():
     # This test is designed to test reading of a block index that is
     # larger than a single file system block, which is why we create
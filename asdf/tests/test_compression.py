@@ -112,6 +112,28 @@ def test_bzp2(tmpdir):
     _roundtrip(tmpdir, tree, 'bzp2')
 
 
+@pytest.mark.parametrize('compression_type', ['zlib', 'bzp2'])
+def test_non_contiguous(compression_type):
+    broadcast = np.broadcast_to(np.arange(100.0), (50, 100))
+    buff = io.BytesIO()
+    asdf.AsdfFile({'a': broadcast}).write_to(buff, all_array_compression=compression_type)
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        np.testing.assert_array_equal(af['a'], broadcast)
+
+    strided = np.arange(20000.0).reshape(200, 100)[:, ::2]
+    assert not strided.flags.c_contiguous
+    assert (compression.get_compressed_size(strided, compression_type) ==
+            compression.get_compressed_size(strided.copy(), compression_type))
+    fio = io.BytesIO()
+    compression.compress(fio, strided, compression_type)
+    size = fio.tell()
+    fio.seek(0)
+    fio.read_blocks = lambda us: [fio.read(us)]
+    result = compression.decompress(fio, size, strided.nbytes, compression_type)
+    np.testing.assert_array_equal(result.view(strided.dtype).reshape(strided.shape), strided)
+
+
 def test_lz4(tmpdir):
     pytest.importorskip('lz4')
     tree = _get_large_tree()
@@ -19,6 +19,14 @@ def test_config_context():
     assert get_config().validate_on_read is True
 
 
+def test_validate_on_read_lazy():
+    with asdf.config_context() as config:
+        config.validate_on_read = 'lazy'
+        assert get_config().validate_on_read == 'lazy'
+        with pytest.raises(ValueError):
+            config.validate_on_read = 'sometimes'
+
+
 def test_config_context_nested():
     assert get_config().validate_on_read is True
 
@@ -99,6 +107,33 @@ def test_legacy_fill_schema_defaults():
         assert get_config().legacy_fill_schema_defaults is True
 
 
+def test_io_chunk_size():
+    with asdf.config_context() as config:
+        assert config.io_chunk_size == asdf.config.DEFAULT_IO_CHUNK_SIZE
+        config.io_chunk_size = 1024
+        assert get_config().io_chunk_size == 1024
+        with pytest.raises(ValueError):
+            config.io_chunk_size = 0
+
+
+def test_schema_cache_dir(tmpdir):
+    with asdf.config_context() as config:
+        assert config.schema_cache_dir == asdf.config.DEFAULT_SCHEMA_CACHE_DIR
+        config.schema_cache_dir = tmpdir
+        assert get_config().schema_cache_dir == str(tmpdir)
+        config.schema_cache_dir = None
+        assert get_config().schema_cache_dir is None
+
+
+def test_plugin_cache_dir(tmpdir):
+    with asdf.config_context() as config:
+        assert config.plugin_cache_dir == asdf.config.DEFAULT_PLUGIN_CACHE_DIR
+        config.plugin_cache_dir = tmpdir
+        assert get_config().plugin_cache_dir == str(tmpdir)
+        config.plugin_cache_dir = None
+        assert get_config().plugin_cache_dir is None
+
+
 def test_resource_mappings():
     with asdf.config_context() as config:
         core_mappings = resource.get_core_resource_mappings()
@@ -278,7 +313,13 @@ def test_config_repr():
         config.validate_on_read = True
         config.default_version = "1.5.0"
         config.legacy_fill_schema_defaults = False
+        config.io_chunk_size = 1024
+        config.schema_cache_dir = "/tmp/schemas"
+        config.plugin_cache_dir = "/tmp/plugins"
 
         assert "validate_on_read: True" in repr(config)
         assert "default_version: 1.5.0" in repr(config)
         assert "legacy_fill_schema_defaults: False" in repr(config)
+        assert "io_chunk_size: 1024" in repr(config)
+        assert "schema_cache_dir: /tmp/schemas" in repr(config)
+        assert "plugin_cache_dir: /tmp/plugins" in repr(config)
@@ -1,5 +1,9 @@
-from pkg_resources import EntryPoint
-import pkg_resources
+import sys
+
+if sys.version_info < (3, 10):
+    import importlib_metadata
+else:
+    import importlib.metadata as importlib_metadata
 
 import pytest
 
@@ -17,16 +21,25 @@ def mock_entry_points():
 
 @pytest.fixture(autouse=True)
 def monkeypatch_entry_points(monkeypatch, mock_entry_points):
-    def _iter_entry_points(*, group):
-        for candidate_group, name, func_name in mock_entry_points:
-            if candidate_group == group:
-                yield EntryPoint(
-                    name, "asdf.tests.test_entry_points",
-                    attrs=(func_name,),
-                    dist=pkg_resources.get_distribution("asdf"),
-                )
-
-    monkeypatch.setattr(entry_points, "iter_entry_points", _iter_entry_points)
+    def _entry_points():
+        points = []
+        for group, name, func_name in mock_entry_points:
+            entry_point = importlib_metadata.EntryPoint(
+                name=name,
+                value="asdf.tests.test_entry_points:{}".format(func_name),
+                group=group,
+            )
+            # EntryPoint instances are immutable, and only know their
+            # distribution when listed from one.
+            vars(entry_point).update(dist=importlib_metadata.distribution("asdf"))
+            points.append(entry_point)
+        return importlib_metadata.EntryPoints(points)
+
+    monkeypatch.setattr(entry_points, "entry_points", _entry_points)
+    # Discard the entry points discovered by previous tests, and have
+    # the mock entry points stand in for the installed distributions.
+    monkeypatch.setattr(entry_points, "_discovered", None)
+    monkeypatch.setattr(entry_points, "_distributions_fingerprint", lambda: list(mock_entry_points))
 
 
 def resource_mappings_entry_point_successful():
@@ -144,3 +157,107 @@ def test_get_extensions(mock_entry_points):
     with pytest.warns(AsdfWarning, match="TypeError"):
         extensions = entry_points.get_extensions()
     assert len(extensions) == 0
+
+
+def test_discovery_cache(mock_entry_points, monkeypatch, tmpdir):
+    mock_entry_points.append(("asdf.resource_mappings", "successful", "resource_mappings_entry_point_successful"))
+    assert len(entry_points.get_resource_mappings(str(tmpdir))) == 2
+    assert len(tmpdir.listdir()) == 1
+
+    # Discovered entry points are reused until the installed
+    # distributions change, within a process and between processes.
+    def _fail():
+        raise AssertionError("entry points were scanned again")
+    monkeypatch.setattr(entry_points, "entry_points", _fail)
+    assert len(entry_points.get_resource_mappings()) == 2
+    monkeypatch.setattr(entry_points, "_discovered", None)
+    assert len(entry_points.get_resource_mappings(str(tmpdir))) == 2
+
+    mock_entry_points.append(("asdf.extensions", "successful", "extensions_entry_point_successful"))
+    with pytest.raises(AssertionError, match="scanned again"):
+        entry_points.get_extensions(str(tmpdir))
+
+
+LOADED_EXTENSIONS = []
+
+
+def extensions_entry_point_recorded():
+    LOADED_EXTENSIONS.append(True)
+    return [
+        MinimumExtension("http://somewhere.org/extensions/foo-1.0"),
+        MinimumExtension("http://somewhere.org/extensions/bar-1.0"),
+    ]
+
+
+def test_deferred_extensions(mock_entry_points, monkeypatch, tmpdir):
+    LOADED_EXTENSIONS.clear()
+    mock_entry_points.append(("asdf.extensions", "recorded", "extensions_entry_point_recorded"))
+    extensions = entry_points.get_extensions(str(tmpdir))
+    assert [e.deferred for e in extensions] == [False, False]
+    assert len(LOADED_EXTENSIONS) == 1
+
+    # Once the entry point has been loaded, its extensions are deferred
+    # until they're needed, within a process and between processes.
+    for discovered in [entry_points._discovered, None]:
+        monkeypatch.setattr(entry_points, "_discovered", discovered)
+        extensions = entry_points.get_extensions(str(tmpdir))
+        assert [e.extension_uri for e in extensions] == [
+            "http://somewhere.org/extensions/foo-1.0",
+            "http://somewhere.org/extensions/bar-1.0",
+        ]
+        assert [e.deferred for e in extensions] == [True, True]
+        assert len(LOADED_EXTENSIONS) == 1
+
+    assert extensions[1].delegate.extension_uri == "http://somewhere.org/extensions/bar-1.0"
+    assert extensions[0].deferred is True
+    assert extensions[0].delegate.extension_uri == "http://somewhere.org/extensions/foo-1.0"
+    assert len(LOADED_EXTENSIONS) == 2
+
+
+class TaggedExtension(MinimumExtension):
+    @property
+    def tags(self):
+        return [self._extension_uri.replace("extensions", "tags")]
+
+
+def extensions_entry_point_tagged():
+    return [
+        TaggedExtension("http://somewhere.org/extensions/foo-1.0"),
+        TaggedExtension("http://somewhere.org/extensions/bar-1.0"),
+    ]
+
+
+def _extensions_entry_point_fewer():
+    return [TaggedExtension("http://somewhere.org/extensions/foo-1.0")]
+
+
+def _extensions_entry_point_bad_element():
+    return [TaggedExtension("http://somewhere.org/extensions/foo-1.0"), object()]
+
+
+@pytest.mark.parametrize("replacement, message", [
+    (extensions_entry_point_failing, "Exception: NOPE"),
+    (_extensions_entry_point_fewer, "ValueError: Entry point returned 1 elements"),
+    (_extensions_entry_point_bad_element, "TypeError: Extension must implement"),
+])
+def test_deferred_extensions_failing(mock_entry_points, monkeypatch, tmpdir, replacement, message):
+    from asdf.extension import ExtensionManager
+
+    mock_entry_points.append(("asdf.extensions", "tagged", "extensions_entry_point_tagged"))
+    entry_points.get_extensions(str(tmpdir))
+
+    # The plugin breaks after its metadata was recorded
+    monkeypatch.setattr(sys.modules[__name__], "extensions_entry_point_tagged", replacement)
+    extensions = entry_points.get_extensions(str(tmpdir))
+    assert [e.deferred for e in extensions] == [True, True]
+
+    # It is skipped with a warning, as when it fails to load up front,
+    # and other extensions with the same tag take over
+    fallback = ExtensionProxy(TaggedExtension("http://somewhere.org/extensions/bar-1.0"))
+    manager = ExtensionManager(extensions + [fallback])
+    with pytest.warns(AsdfWarning, match=message):
+        tag_def = manager.get_tag_definition("http://somewhere.org/tags/bar-1.0")
+    assert tag_def is fallback.tags[0]
+    assert extensions[1] not in manager.extensions
+    assert extensions[1].deferred is False
+    assert extensions[1].tags == []
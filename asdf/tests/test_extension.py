@@ -389,6 +389,58 @@ def test_extension_manager():
         manager.get_converter_for_type(object)
 
 
+def test_extension_manager_deferred():
+    converter1 = FullConverter(
+        tags=["asdf://somewhere.org/extensions/full/tags/foo-*"],
+        types=[FooType],
+    )
+    converter2 = FullConverter(
+        tags=["asdf://somewhere.org/extensions/full/tags/baz-*"],
+        types=["asdf.tests.test_extension.BazType"],
+    )
+    extension = FullExtension(
+        converters=[converter1, converter2],
+        tags=[
+            "asdf://somewhere.org/extensions/full/tags/foo-1.0",
+            "asdf://somewhere.org/extensions/full/tags/baz-1.0",
+        ],
+        asdf_standard_requirement=">=1.4.0",
+    )
+    metadata = ExtensionProxy(extension, package_name="foo", package_version="1.2.3")._get_metadata()
+
+    loaded = []
+    def _load():
+        loaded.append(True)
+        return extension
+
+    proxy = ExtensionProxy._deferred(_load, metadata, package_name="foo", package_version="1.2.3")
+    assert proxy.deferred is True
+    assert proxy.extension_uri == extension.extension_uri
+    assert proxy.class_name == "asdf.tests.test_extension.FullExtension"
+    assert proxy.asdf_standard_requirement == SpecifierSet(">=1.4.0")
+    assert proxy.types == []
+    assert hash(proxy) == hash(ExtensionProxy(extension))
+
+    manager = ExtensionManager([proxy])
+    assert manager.handles_tag("asdf://somewhere.org/extensions/full/tags/foo-1.0") is True
+    assert manager.handles_tag("asdf://somewhere.org/extensions/full/tags/bar-1.0") is False
+    assert manager.handles_type(FooType) is True
+    assert manager.handles_type(BazType) is True
+    assert loaded == []
+
+    assert manager.get_converter_for_type(BazType).delegate is converter2
+    assert loaded == [True]
+    assert proxy.deferred is False
+    assert proxy.delegate is extension
+    assert proxy == ExtensionProxy(extension)
+    assert manager.get_converter_for_tag("asdf://somewhere.org/extensions/full/tags/foo-1.0").delegate is converter1
+    assert manager.get_tag_definition("asdf://somewhere.org/extensions/full/tags/baz-1.0").tag_uri == "asdf://somewhere.org/extensions/full/tags/baz-1.0"
+    assert loaded == [True]
+
+    # Legacy extensions can't be deferred
+    assert ExtensionProxy(LegacyExtension())._get_metadata() is None
+
+
 def test_get_cached_extension_manager():
     extension = MinimumExtension()
     extension_manager = get_cached_extension_manager([extension])
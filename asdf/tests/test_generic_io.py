@@ -1,4 +1,5 @@
 import io
+import mmap
 import os
 import sys
 
@@ -7,6 +8,7 @@ import pytest
 import urllib.request as urllib_request
 
 import numpy as np
+from numpy.testing import assert_array_equal
 
 import asdf
 from asdf import util
@@ -206,6 +208,52 @@ def test_bytes_io(tree):
         ff.tree['science_data'][0] = 42
 
 
+def test_bytes_io_readonly_view():
+    buff = io.BytesIO()
+    asdf.AsdfFile({'data': np.arange(10)}).write_to(buff, auto_inline=None)
+
+    buff.seek(0)
+    with asdf.open(buff, mode='r') as af:
+        data = af.tree['data']
+        assert np.shares_memory(data, np.frombuffer(buff.getbuffer(), np.uint8))
+        assert not data.flags.writeable
+        assert_array_equal(data, np.arange(10))
+        del data
+
+    buff.seek(0)
+    with asdf.open(buff, mode='r', copy_arrays=True) as af:
+        data = af.tree['data']
+        assert not np.shares_memory(data, np.frombuffer(buff.getbuffer(), np.uint8))
+        assert_array_equal(data, np.arange(10))
+        del data
+
+
+@pytest.mark.parametrize('buffer_type', [bytes, bytearray, memoryview, 'mmap'])
+def test_buffer_protocol(tmpdir, buffer_type):
+    path = str(tmpdir.join('test.asdf'))
+    asdf.AsdfFile({'data': np.arange(10)}).write_to(path, auto_inline=None)
+
+    with open(path, 'rb') as fd:
+        if buffer_type == 'mmap':
+            content = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            content = buffer_type(fd.read())
+
+    assert isinstance(generic_io.get_file(content, mode='r'), generic_io.MemoryIO)
+    with pytest.raises(ValueError):
+        generic_io.get_file(content, mode='w')
+
+    with asdf.open(content) as af:
+        data = af.tree['data']
+        assert np.shares_memory(data, np.frombuffer(content, np.uint8))
+        assert not data.flags.writeable
+        assert_array_equal(data, np.arange(10))
+        del data
+
+    with asdf.open(content, lazy_load=False, copy_arrays=True) as af:
+        assert_array_equal(af.tree['data'], np.arange(10))
+
+
 def test_streams(tree):
     buff = io.BytesIO()
 
@@ -234,6 +282,78 @@ def test_streams2():
     assert len(x) == 60
 
 
+def test_stream_buffer():
+    content = bytes(range(256)) * 64
+    fd = generic_io.InputStream(io.BytesIO(content), 'r')
+
+    assert fd._peek(10) == content[:10]
+    assert fd._peek(100) == content[:100]
+    # Peeking at less than is buffered doesn't return the whole buffer
+    assert fd._peek(20) == content[:20]
+
+    assert fd.read(7) == content[:7]
+    assert fd.read(200) == content[7:207]
+    assert fd._peek(5) == content[207:212]
+
+    fd.fast_forward(5)
+    assert fd.read(3) == content[212:215]
+
+    array = fd.read_into_array(100)
+    assert array.tobytes() == content[215:315]
+
+    assert fd.read() == content[315:]
+    assert fd.read() == b''
+
+
+@pytest.mark.parametrize('kernel_copy', [True, False])
+def test_copy_from(tmpdir, monkeypatch, kernel_copy):
+    if not kernel_copy:
+        monkeypatch.setattr(generic_io, '_copy_file_range',
+                            lambda *args: 0)
+
+    content = bytes(range(256)) * 64
+    src_path = os.path.join(str(tmpdir), 'src.bin')
+    dst_path = os.path.join(str(tmpdir), 'dst.bin')
+    with open(src_path, 'wb') as fd:
+        fd.write(content)
+
+    with generic_io.get_file(src_path, 'r') as src, \
+         generic_io.get_file(dst_path, 'w') as dst:
+        src.seek(10)
+        dst.write(b'head')
+        dst.copy_from(src, 1000, 5000)
+        dst.write(b'tail')
+        assert src.tell() == 10
+
+        with pytest.raises(IOError):
+            dst.copy_from(src, len(content) - 10, 100)
+
+    with open(dst_path, 'rb') as fd:
+        assert fd.read(5008) == b'head' + content[1000:6000] + b'tail'
+
+
+def test_write_to_copies_blocks(tmpdir, monkeypatch):
+    calls = []
+    copy_file_range = generic_io._copy_file_range
+    def _copy_file_range(*args):
+        calls.append(args)
+        return copy_file_range(*args)
+    monkeypatch.setattr(generic_io, '_copy_file_range', _copy_file_range)
+
+    tree = {'a': np.arange(1000), 'b': np.arange(2000, dtype=np.float32)}
+    src_path = os.path.join(str(tmpdir), 'src.asdf')
+    dst_path = os.path.join(str(tmpdir), 'dst.asdf')
+    asdf.AsdfFile(tree).write_to(src_path)
+    assert len(calls) == 0
+
+    with asdf.open(src_path) as af:
+        af.write_to(dst_path)
+    assert len(calls) == 2
+
+    with asdf.open(dst_path, validate_checksums=True) as af:
+        helpers.assert_tree_match(tree, af.tree)
+
+
 @pytest.mark.remote_data
 def test_urlopen(tree, httpserver):
     path = os.path.join(httpserver.tmpdir, 'test.asdf')
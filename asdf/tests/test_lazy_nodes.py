@@ -0,0 +1,177 @@
+import copy
+import json
+import io
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+import asdf
+from asdf import lazy_nodes
+from asdf.tags.core import Software
+
+
+def _roundtrip_lazy(tree, **kwargs):
+    buff = io.BytesIO()
+    asdf.AsdfFile(tree).write_to(buff)
+    buff.seek(0)
+    return asdf.open(buff, lazy_tree=True, **kwargs)
+
+
+def test_lazy_tree_conversion():
+    tree = {
+        'software': Software(name='foo', version='1.0'),
+        'items': [1, {'array': np.arange(10)}],
+    }
+
+    with _roundtrip_lazy(tree) as af:
+        assert isinstance(af.tree, lazy_nodes.AsdfObjectNode)
+        assert isinstance(af.tree, asdf.tags.core.AsdfObject)
+        assert 'software' in af.tree._pending
+
+        items = af.tree['items']
+        assert isinstance(items, lazy_nodes.AsdfListNode)
+        assert items._pending == {0, 1}
+        assert items[-1]._pending == {'array'}
+        assert items._pending == {0}
+        assert_array_equal(items[1]['array'], np.arange(10))
+
+        assert 'software' in af.tree._pending
+        assert isinstance(af.tree['software'], Software)
+        assert af.tree['software']['name'] == 'foo'
+
+
+def test_lazy_tree_identity():
+    shared = {'value': 1}
+    software = Software(name='foo', version='1.0')
+    tree = {
+        'a': shared,
+        'b': shared,
+        'software': [software, {'again': software}],
+    }
+    tree['self'] = tree['software']
+    tree['software'].append(tree['software'])
+
+    with _roundtrip_lazy(tree) as af:
+        assert af.tree['a'] is af.tree['b']
+        assert af.tree['self'] is af.tree['software']
+        software = af.tree['software']
+        assert software[-1] is software
+        assert software[1]['again'] is software[0]
+        assert isinstance(software[0], Software)
+
+
+@pytest.mark.parametrize('validate_on_read', [True, 'lazy'])
+def test_lazy_tree_validation(validate_on_read):
+    content = b"""#ASDF 1.0.0
+#ASDF_STANDARD 1.5.0
+%YAML 1.1
+%TAG ! tag:stsci.edu:asdf/
+--- !core/asdf-1.1.0
+good: 1
+bad: {software: !core/software-1.0.0 {name: 5}}
+...
+"""
+    with asdf.config_context() as config:
+        config.validate_on_read = validate_on_read
+        if validate_on_read is True:
+            with pytest.raises(asdf.ValidationError):
+                asdf.open(io.BytesIO(content), lazy_tree=True)
+        else:
+            with asdf.open(io.BytesIO(content), lazy_tree=True) as af:
+                assert af['good'] == 1
+                bad = af['bad']
+                with pytest.raises(asdf.ValidationError):
+                    bad['software']
+
+
+@pytest.mark.parametrize('validate_on_read', [True, 'lazy'])
+def test_lazy_tree_custom_schema_defaults(tmpdir, validate_on_read):
+    # The column's description is only present once the defaults
+    # from its tag's schema have been filled.
+    custom_schema = tmpdir.join('custom.yaml')
+    custom_schema.write("""%YAML 1.1
+---
+$schema: "http://stsci.edu/schemas/yaml-schema/draft-01"
+type: object
+properties:
+  col:
+    required: [description]
+required: [col]
+...
+""")
+    content = b"""#ASDF 1.0.0
+#ASDF_STANDARD 1.5.0
+%YAML 1.1
+%TAG ! tag:stsci.edu:asdf/
+--- !core/asdf-1.1.0
+col: !core/column-1.0.0 {name: a, data: !core/ndarray-1.0.0 [1, 2, 3]}
+...
+"""
+    with asdf.config_context() as config:
+        config.validate_on_read = validate_on_read
+        with asdf.open(io.BytesIO(content), lazy_tree=True, custom_schema=str(custom_schema)) as af:
+            assert 'col' in af.tree._pending
+
+
+def test_lazy_tree_write():
+    tree = {
+        'software': Software(name='foo', version='1.0'),
+        'items': [1, 'two', {'array': np.arange(10)}],
+    }
+    buff = io.BytesIO()
+    asdf.AsdfFile(tree).write_to(buff)
+
+    buff.seek(0)
+    with asdf.open(buff, lazy_tree=True) as af:
+        af.tree['items'][2]['new'] = [3]
+        af.tree['items'].append(4)
+        lazy_buff = io.BytesIO()
+        af.write_to(lazy_buff)
+
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        af.tree['items'][2]['new'] = [3]
+        af.tree['items'].append(4)
+        eager_buff = io.BytesIO()
+        af.write_to(eager_buff)
+
+    assert lazy_buff.getvalue() == eager_buff.getvalue()
+
+
+def test_lazy_tree_copy():
+    tree = {'nested': {'items': [1, Software(name='foo', version='1.0')]}}
+    tree['nested']['self'] = tree['nested']
+
+    with _roundtrip_lazy(tree) as af:
+        result = copy.deepcopy(af.tree)
+        assert isinstance(result['nested']['items'][1], Software)
+        assert result['nested']['self'] is result['nested']
+        assert result['nested'] is not af.tree['nested']
+
+        result = copy.copy(af.tree['nested']['items'])
+        assert result == af.tree['nested']['items']
+        assert result is not af.tree['nested']['items']
+
+
+def test_lazy_tree_builtin_storage():
+    tree = {'meta': {'c': {'a': 1, 'b': [1, 'two', {'x': 3.5}]}}}
+
+    with _roundtrip_lazy(tree) as af:
+        # The C json encoder reads the storage of the builtin type
+        node = af.tree['meta']['c']
+        assert json.dumps(node) == json.dumps(tree['meta']['c'])
+
+        items = node['b']
+        items.append(4)
+        items.insert(0, 0)
+        items += [5]
+        del items[1]
+        items[0:1] = [-1, -2]
+        items.pop()
+        node['d'] = {'e': [6]}
+        del node['a']
+        assert list(list.__iter__(items)) == items.data
+        assert dict(dict.items(node)) == node.data
+        assert json.loads(json.dumps(af.tree['meta'])) == {
+            'c': {'b': [-1, -2, 'two', {'x': 3.5}, 4], 'd': {'e': [6]}}}
@@ -218,6 +218,42 @@ def test_resource_manager():
     assert "len: 4" in repr(manager)
 
 
+def test_directory_resource_mapping_lazy(tmpdir):
+    for directory in ["a", "b"]:
+        (tmpdir/"schemas"/directory).ensure(dir=True)
+        with (tmpdir/"schemas"/directory/"foo-1.0.0.yaml").open("w") as f:
+            f.write("id: http://somewhere.org/schemas/{}/foo-1.0.0\n".format(directory))
+
+    mapping = DirectoryResourceMapping(str(tmpdir/"schemas"), "http://somewhere.org/schemas", recursive=True)
+    assert mapping._listings == {}
+
+    # Only the directories on the way to the requested file are listed
+    assert b"a/foo-1.0.0" in mapping["http://somewhere.org/schemas/a/foo-1.0.0"]
+    assert set(mapping._listings) == {(), ("a",)}
+    assert "http://somewhere.org/schemas/c/foo-1.0.0" not in mapping
+    assert "http://somewhere.org/elsewhere/a/foo-1.0.0" not in mapping
+    assert set(mapping._listings) == {(), ("a",)}
+
+    assert len(mapping) == 2
+    assert set(mapping._listings) == {(), ("a",), ("b",)}
+
+
+def test_resource_manager_lazy():
+    class FailingMapping(Mapping):
+        def __getitem__(self, uri):
+            raise AssertionError("searched the second mapping")
+
+        def __len__(self):
+            raise AssertionError("searched the second mapping")
+
+        def __iter__(self):
+            raise AssertionError("searched the second mapping")
+
+    manager = ResourceManager([{"http://somewhere.org/schemas/foo-1.0.0": b"foo"}, FailingMapping()])
+    assert manager["http://somewhere.org/schemas/foo-1.0.0"] == b"foo"
+    assert "http://somewhere.org/schemas/foo-1.0.0" in manager
+
+
 def test_jsonschema_resource_mapping():
     mapping = JsonschemaResourceMapping()
     assert isinstance(mapping, Mapping)
@@ -204,6 +204,89 @@ properties:
             schema.validate({"bar": 12}, schema=schema_tree)
 
 
+def test_resolver_caching():
+    subschema_content = """%YAML 1.1
+---
+$schema: http://stsci.edu/schemas/asdf/asdf-schema-1.0.0
+id: asdf://somewhere.org/schemas/baz
+
+baz:
+  type: {}
+...
+"""
+    schema_tree = {
+        "type": "object",
+        "properties": {
+            "baz": {"$ref": "asdf://somewhere.org/schemas/baz#/baz"},
+        },
+    }
+
+    with asdf.config_context() as config:
+        config.add_resource_mapping(
+            {"asdf://somewhere.org/schemas/baz": subschema_content.format("string")})
+
+        # Resolved references are shared between validators
+        resolver1 = schema.get_validator(schema_tree).resolver
+        resolver2 = schema.get_validator(schema_tree).resolver
+        assert resolver1 is not resolver2
+        assert resolver1.resolve("asdf://somewhere.org/schemas/baz")[1] is \
+            resolver2.resolve("asdf://somewhere.org/schemas/baz")[1]
+
+        schema.validate({"baz": "foo"}, schema=schema_tree)
+        with pytest.raises(ValidationError):
+            schema.validate({"baz": 12}, schema=schema_tree)
+
+        # Changing the resource mappings drops the resolved references
+        config.add_resource_mapping(
+            {"asdf://somewhere.org/schemas/baz": subschema_content.format("integer")})
+        schema.validate({"baz": 12}, schema=schema_tree)
+        with pytest.raises(ValidationError):
+            schema.validate({"baz": "foo"}, schema=schema_tree)
+
+
+def test_schema_cache_dir(tmpdir, monkeypatch):
+    content = """%YAML 1.1
+---
+$schema: http://stsci.edu/schemas/asdf/asdf-schema-1.0.0
+id: asdf://somewhere.org/schemas/cached
+type: {}
+...
+"""
+    uri = "asdf://somewhere.org/schemas/cached"
+    cache_dir = tmpdir.join("schemas")
+
+    with asdf.config_context() as config:
+        config.add_resource_mapping({uri: content.format("string")})
+        loader = schema._make_schema_loader(extension.get_default_resolver())
+
+        # Nothing is written unless the cache is enabled
+        loader(uri)
+        assert not cache_dir.exists()
+
+        config.schema_cache_dir = cache_dir
+        result, url = loader(uri)
+        assert url == uri
+        assert result["type"] == "string"
+        assert len(cache_dir.listdir()) == 1
+
+        # The cached copy is used instead of parsing the content again
+        def fail_load(*args, **kwargs):
+            raise AssertionError("schema parsed again")
+        monkeypatch.setattr(schema.yaml, "load", fail_load)
+        assert loader(uri)[0] == result
+        monkeypatch.undo()
+
+        # Changed content gets an entry of its own
+        config.add_resource_mapping({uri: content.format("integer")})
+        assert loader(uri)[0]["type"] == "integer"
+        assert len(cache_dir.listdir()) == 2
+
+        # Unreadable entries are replaced
+        for path in cache_dir.listdir():
+            path.write(b"garbage")
+        assert loader(uri)[0]["type"] == "integer"
+
+
 def test_schema_caching():
     # Make sure that if we request the same URL, we get a different object
     # (despite the caching internal to load_schema).  Changes to a schema
@@ -216,6 +299,81 @@ def test_schema_caching():
     assert s1 is not s2
 
 
+def test_compiled_schema_errors(monkeypatch):
+    # Validating against compiled schemas should produce exactly the same
+    # errors as the generic jsonschema machinery.
+    software_tag = 'tag:stsci.edu:asdf/core/software-1.0.0'
+    tree = tagged.TaggedDict({
+        'good': tagged.TaggedDict({'name': 'foo', 'version': '1.0'}, software_tag),
+        'bad': [
+            tagged.TaggedDict({'name': 5, 'version': '1.0'}, software_tag),
+            tagged.TaggedDict({'name': 'foo', 'homepage': ['x']}, software_tag),
+            tagged.TaggedDict({'real': 1.0, 'imaginary': 'x'},
+                              'tag:stsci.edu:asdf/core/complex-1.0.0'),
+        ],
+    })
+
+    def get_errors():
+        validator = schema.get_validator(ctx=asdf.AsdfFile())
+        return type(validator), [
+            (e.message, list(e.path), list(e.schema_path), e.validator)
+            for e in validator.iter_errors(tree)
+        ]
+
+    cls, compiled_errors = get_errors()
+    assert len(compiled_errors) > 0
+    software_schema = schema._load_schema_cached(
+        'http://stsci.edu/schemas/asdf/core/software-1.0.0',
+        asdf.AsdfFile().resolver, False, False)
+    assert cls._compiled_schemas[id(software_schema)][0] is software_schema
+
+    def iter_generic_errors(self, instance, schema):
+        return super(cls, self).iter_errors(instance, schema)
+    monkeypatch.setattr(cls, '_iter_schema_errors', iter_generic_errors)
+    _, generic_errors = get_errors()
+
+    assert compiled_errors == generic_errors
+
+
+def test_validation_cache(monkeypatch):
+    af = asdf.AsdfFile({'a': np.arange(10), 'b': np.arange(20)})
+
+    cls = type(schema.get_validator(ctx=af))
+    validated = []
+    iter_schema_errors = cls._iter_schema_errors
+    def counting_iter_schema_errors(self, instance, schema):
+        # Only count whole tag schemas, not the fragments they descend into
+        if 'id' in schema:
+            validated.append(getattr(instance, '_tag', None))
+        return iter_schema_errors(self, instance, schema)
+    monkeypatch.setattr(cls, '_iter_schema_errors', counting_iter_schema_errors)
+
+    buff1 = io.BytesIO()
+    af.write_to(buff1)
+    assert validated.count('tag:stsci.edu:asdf/core/ndarray-1.0.0') == 2
+
+    # Nothing has changed, so nothing is validated again, but the styles
+    # set by the schemas are still applied.
+    validated.clear()
+    buff2 = io.BytesIO()
+    af.write_to(buff2)
+    assert validated == []
+    assert buff2.getvalue() == buff1.getvalue()
+
+    # Only the changed array and its parents are validated again
+    af['a'] = np.arange(5)
+    validated.clear()
+    af.write_to(io.BytesIO())
+    assert validated.count('tag:stsci.edu:asdf/core/ndarray-1.0.0') == 1
+    assert 'tag:stsci.edu:asdf/core/asdf-1.1.0' in validated
+
+    # Values that compare equal but differ in type aren't confused
+    software_tag = 'tag:stsci.edu:asdf/core/software-1.0.0'
+    schema.validate(tagged.TaggedDict({'name': 'foo', 'version': '1'}, software_tag), af)
+    with pytest.raises(ValidationError):
+        schema.validate(tagged.TaggedDict({'name': 'foo', 'version': 1}, software_tag), af)
+
+
 def test_asdf_file_resolver_hashing():
     # Confirm that resolvers from distinct AsdfFile instances
     # hash to the same value (this allows schema caching to function).
@@ -387,6 +545,51 @@ def test_defaults():
     assert t == {}
 
 
+def test_compiled_defaults():
+    s = {
+        'type': 'object',
+        'properties': {
+            'a': {'default': 42},
+            'b': {
+                'allOf': [
+                    {'properties': {'c': {'default': None}}},
+                    {'properties': {'d': {'default': 'foo'}}},
+                ],
+            },
+            'e': {
+                'items': {'properties': {'f': {'default': [1]}}},
+            },
+            'g': {
+                'items': [{}, {'properties': {'h': {'default': 1.0}}}],
+            },
+            'i': {
+                '$ref': 'http://somewhere.org/schemas/i',
+                'properties': {'j': {'default': 0}},
+            },
+            'k': {
+                'anyOf': [{'properties': {'l': {'default': 0}}}],
+            },
+        },
+    }
+
+    P, ITEMS, ITEM = schema._PROPERTY_STEP, schema._ITEMS_STEP, schema._ITEM_STEP
+    assert schema._compile_defaults(s) == [
+        ((), 'a', 42),
+        (((P, 'b'),), 'c', None),
+        (((P, 'b'),), 'd', 'foo'),
+        (((P, 'e'), (ITEMS, None)), 'f', [1]),
+        (((P, 'g'), (ITEM, 1)), 'h', 1.0),
+    ]
+
+    # Null defaults are never removed
+    assert schema._compile_defaults(s, remove=True) == [
+        ((), 'a', 42),
+        (((P, 'b'),), 'd', 'foo'),
+        (((P, 'e'), (ITEMS, None)), 'f', [1]),
+        (((P, 'g'), (ITEM, 1)), 'h', 1.0),
+    ]
+
+
 def test_default_check_in_schema():
     s = {
         'type': 'object',
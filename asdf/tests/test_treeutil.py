@@ -1,3 +1,7 @@
+import sys
+
+import pytest
+
 from asdf import treeutil
 
 
@@ -48,3 +52,54 @@ def test_walk_and_modify_shared_references():
     assert result["target"]["foo"] == "baz"
     assert result["target"] is result["nested_in_dict"]["target"]
     assert result["target"] is result["nested_in_list"][0]
+
+
+def test_walk_and_modify_pre_callback():
+    tree = {"a": {"b": [1, 2]}}
+    visited = []
+
+    def _pre_callback(node, json_id):
+        visited.append(("pre", node))
+
+    def _callback(node):
+        visited.append(("post", node))
+        return node
+
+    treeutil.walk_and_modify(tree, _callback, postorder=True, _pre_callback=_pre_callback)
+
+    pre = [node for kind, node in visited if kind == "pre"]
+    assert pre == [tree, tree["a"], tree["a"]["b"], 1, 2]
+    assert visited.index(("pre", tree["a"])) < visited.index(("post", 1))
+    assert visited[-1] == ("post", tree)
+
+
+@pytest.mark.parametrize("postorder", [True, False])
+def test_walk_and_modify_deep_tree(postorder):
+    depth = sys.getrecursionlimit() * 2
+    tree = leaf = {}
+    for _ in range(depth):
+        leaf["child"] = [{}]
+        leaf = leaf["child"][0]
+    leaf["value"] = 1
+
+    def _callback(node):
+        if node == 1:
+            return 2
+        return node
+
+    result = treeutil.walk_and_modify(tree, _callback, postorder=postorder)
+    for _ in range(depth):
+        result = result["child"][0]
+    assert result == {"value": 2}
+
+    assert sum(1 for _ in treeutil.iter_tree(tree)) == depth * 2 + 2
+
+
+def test_iter_tree_order():
+    tree = {"a": [1, (2, 3)], "b": {"c": 4}}
+    nodes = list(treeutil.iter_tree(tree))
+    assert nodes == [1, 2, 3, (2, 3), [1, (2, 3)], 4, {"c": 4}, tree]
+
+    tree["b"]["d"] = tree
+    nodes = list(treeutil.iter_tree(tree))
+    assert nodes == [1, 2, 3, (2, 3), [1, (2, 3)], 4, tree["b"], tree]
@@ -1,5 +1,8 @@
 import pytest
 
+import numpy as np
+from numpy.testing import assert_array_equal
+
 from asdf import util
 from asdf.extension import BuiltinExtension
 
@@ -62,3 +65,17 @@ def test_patched_urllib_parse():
 ])
 def test_uri_match(pattern, uri, result):
     assert util.uri_match(pattern, uri) is result
+
+
+@pytest.mark.parametrize("array", [
+    np.arange(24).reshape(2, 3, 4),
+    np.arange(24).reshape(2, 3, 4)[:, ::2, 1:],
+    np.arange(24).reshape(2, 3, 4).transpose(2, 0, 1)[::-1],
+    np.broadcast_to(np.arange(4), (6, 4)),
+])
+def test_iter_array_chunks(array):
+    chunks = [np.array(c) for c in util.iter_array_chunks(array, 16)]
+    if not (array.flags.c_contiguous or array.flags.f_contiguous):
+        assert all(c.nbytes <= 16 for c in chunks)
+    expected = array.ravel(order='C' if 0 in array.strides else 'K')
+    assert_array_equal(np.concatenate(chunks), expected)
@@ -14,6 +14,7 @@ from asdf import treeutil
 from asdf import yamlutil
 from asdf.compat.numpycompat import NUMPY_LT_1_14
 from asdf.exceptions import AsdfWarning
+from asdf.tags.core import Software
 
 from . import helpers
 
@@ -307,3 +308,36 @@ def test_numpy_scalar(numpy_value, expected_value):
         assert yamlutil.load_tree(buffer)["value"] == pytest.approx(expected_value, rel=0.001)
     else:
         assert yamlutil.load_tree(buffer)["value"] == expected_value
+
+
+def test_conversion_dispatch_cache(monkeypatch):
+    ctx = asdf.AsdfFile()
+    extension_manager = ctx.extension_manager
+    tree = {"items": [{"value": i, "software": Software(name="foo", version="1.0")} for i in range(10)]}
+
+    types = []
+    handles_type = extension_manager.handles_type
+    monkeypatch.setattr(extension_manager, "handles_type", lambda typ: types.append(typ) or handles_type(typ))
+    tags = []
+    handles_tag = extension_manager.handles_tag
+    monkeypatch.setattr(extension_manager, "handles_tag", lambda tag: tags.append(tag) or handles_tag(tag))
+
+    serialization_context = ctx._create_serialization_context()
+    tagged_tree = yamlutil.custom_tree_to_tagged_tree(tree, ctx, _serialization_context=serialization_context)
+    assert len(types) == len(set(types))
+    assert set(types) == {dict, list, int, str, Software}
+
+    serialization_context = ctx._create_serialization_context()
+    result = yamlutil.tagged_tree_to_custom_tree(tagged_tree, ctx, _serialization_context=serialization_context)
+    assert tags == [tagged_tree["items"][0]["software"]._tag]
+    assert result == tree
+
+
+def test_parse_select():
+    assert yamlutil._parse_select(['/a/b', '/a/c', '/d~1e']) == {
+        'a': {'b': True, 'c': True},
+        'd/e': True,
+    }
+    assert yamlutil._parse_select(['/a', '/a/b']) == {'a': True}
+    assert yamlutil._parse_select(['/a/b', '/a']) == {'a': True}
+    assert yamlutil._parse_select(['/a', '/']) is True
@@ -4,7 +4,6 @@ Utility functions for managing tree-like data structures.
 
 import warnings
 import types
-from contextlib import contextmanager
 
 from . import tagged
 from .exceptions import AsdfWarning
@@ -57,30 +56,46 @@ def iter_tree(top):
     tree : object
         The modified tree.
     """
-    seen = set()
-
-    def recurse(tree):
-        tree_id = id(tree)
+    return _iter_tree(top)
 
-        if tree_id in seen:
-            return
 
-        if isinstance(tree, (list, tuple)):
-            seen.add(tree_id)
-            for val in tree:
-                for sub in recurse(val):
-                    yield sub
-            seen.remove(tree_id)
-        elif isinstance(tree, dict):
-            seen.add(tree_id)
-            for val in tree.values():
-                for sub in recurse(val):
-                    yield sub
-            seen.remove(tree_id)
+def _iter_children(node):
+    if isinstance(node, (list, tuple)):
+        return iter(node)
+    elif isinstance(node, dict):
+        return iter(node.values())
+    else:
+        return None
 
-        yield tree
 
-    return recurse(top)
+def _iter_tree(top):
+    # Traverse the tree with an explicit stack of (container, iterator
+    # over its children) pairs, rather than recursion, so that deep
+    # trees neither re-yield each node through every ancestor nor run
+    # into the recursion limit.  Containers that are ancestors of the
+    # current node are skipped, to avoid following reference cycles.
+    seen = set()
+    stack = []
+    node = top
+    while True:
+        if id(node) not in seen:
+            children = _iter_children(node)
+            if children is None:
+                yield node
+            else:
+                seen.add(id(node))
+                stack.append((node, children))
+
+        while stack:
+            parent, children = stack[-1]
+            node = next(children, _NO_RESULT)
+            if node is not _NO_RESULT:
+                break
+            stack.pop()
+            seen.remove(id(parent))
+            yield parent
+        else:
+            return
 
 
 class _TreeModificationContext:
@@ -95,12 +110,18 @@ class _TreeModificationContext:
     generators and reset themselves when exiting the outermost
     context.  They are also collections that map unmodified
     nodes to the corresponding modified result.
+
+    With ``keep_results=True``, the map is kept when exiting the
+    outermost context, so that nodes shared between several calls to
+    walk_and_modify are only modified once.
     """
-    def __init__(self):
+    def __init__(self, keep_results=False):
+        self._keep_results = keep_results
         self._map = {}
         self._generators = []
         self._depth = 0
         self._pending = set()
+        self._pending_nodes = []
 
     def add_generator(self, generator):
         """
@@ -117,11 +138,10 @@ class _TreeModificationContext:
         """
         return id(node) in self._pending
 
-    @contextmanager
-    def pending(self, node):
+    def push_pending(self, node):
         """
-        Context manager that marks a node as pending for the
-        duration of the context.
+        Mark a node as pending, until the matching call to
+        `pop_pending`.
         """
         if id(node) in self._pending:
             raise RuntimeError(
@@ -131,10 +151,29 @@ class _TreeModificationContext:
             )
 
         self._pending.add(id(node))
-        try:
-            yield self
-        finally:
-            self._pending.remove(id(node))
+        self._pending_nodes.append(node)
+
+    def pop_pending(self):
+        """
+        Unmark the node most recently marked as pending.
+        """
+        node = self._pending_nodes.pop()
+        self._pending.remove(id(node))
+
+    def pending_depth(self):
+        """
+        Return the number of nodes currently marked as pending.
+        """
+        return len(self._pending_nodes)
+
+    def current_node(self):
+        """
+        Return the unmodified node that was most recently marked
+        as pending.  When called from a postorder callback, this is
+        the original of the node passed to the callback, with its
+        children not yet modified.
+        """
+        return self._pending_nodes[-1]
 
     def __enter__(self):
         self._depth += 1
@@ -151,8 +190,10 @@ class _TreeModificationContext:
             if exc_type is None:
                 self._drain_generators()
             self._generators = []
-            self._map = {}
+            if not self._keep_results:
+                self._map = {}
             self._pending = set()
+            self._pending_nodes = []
 
     def _drain_generators(self):
         """
@@ -204,6 +245,18 @@ class _PendingValue:
 PendingValue = _PendingValue()
 
 
+class _NoResult:
+    """
+    Class of the _NO_RESULT singleton instance, used internally by
+    the tree traversals to mark the absence of a value.
+    """
+    def __repr__(self):
+        return "_NO_RESULT"
+
+
+_NO_RESULT = _NoResult()
+
+
 class _RemoveNode:
     """
     Class of the RemoveNode singleton instance.  This instance is used
@@ -217,7 +270,8 @@ class _RemoveNode:
 RemoveNode = _RemoveNode()
 
 
-def walk_and_modify(top, callback, ignore_implicit_conversion=False, postorder=True, _context=None):
+def walk_and_modify(top, callback, ignore_implicit_conversion=False, postorder=True, _context=None,
+                    _pre_callback=None, _json_id=None):
     """Modify a tree by walking it with a callback function.  It also has
     the effect of doing a deep copy.
 
@@ -256,6 +310,15 @@ def walk_and_modify(top, callback, ignore_implicit_conversion=False, postorder=T
 
         Defaults to `False`.
 
+    _pre_callback : callable, optional
+        A function that takes a node and a json id, and is called on
+        each node before its children are visited, when ``postorder``
+        is `True`.  It may modify the node in place.
+
+    _json_id : str, optional
+        The json id of the context in which ``top`` is found, when
+        walking a subtree.
+
     Returns
     -------
     tree : object
@@ -285,98 +348,13 @@ def walk_and_modify(top, callback, ignore_implicit_conversion=False, postorder=T
 
         return _handle_generator(result)
 
-    def _handle_mapping(node, json_id):
-        result = node.__class__()
-        if isinstance(node, tagged.Tagged):
-            result._tag = node._tag
-
-        pending_items = {}
-        for key, value in node.items():
-            if _context.is_pending(value):
-                # The child node is pending modification, which means
-                # it must be its own ancestor.  Assign the special
-                # PendingValue instance for now, and note that we'll
-                # need to fill in the real value later.
-                pending_items[key] = value
-                result[key] = PendingValue
-            else:
-                value = _recurse(value, json_id)
-                if value is not RemoveNode:
-                    result[key] = value
-
-        yield result
-
-        if len(pending_items) > 0:
-            # Now that we've yielded, the pending children should
-            # be available.
-            for key, value in pending_items.items():
-                value = _recurse(value, json_id)
-                if value is not RemoveNode:
-                    result[key] = value
-                else:
-                    # The callback may have decided to delete
-                    # this node after all.
-                    del result[key]
-
-    def _handle_mutable_sequence(node, json_id):
-        result = node.__class__()
-        if isinstance(node, tagged.Tagged):
-            result._tag = node._tag
-
-        pending_items = {}
-        for i, value in enumerate(node):
-            if _context.is_pending(value):
-                # The child node is pending modification, which means
-                # it must be its own ancestor.  Assign the special
-                # PendingValue instance for now, and note that we'll
-                # need to fill in the real value later.
-                pending_items[i] = value
-                result.append(PendingValue)
-            else:
-                result.append(_recurse(value, json_id))
-
-        yield result
-
-        for i, value in pending_items.items():
-            # Now that we've yielded, the pending children should
-            # be available.
-            result[i] = _recurse(value, json_id)
-
-    def _handle_immutable_sequence(node, json_id):
-        # Immutable sequences containing themselves are impossible
-        # to construct (well, maybe possible in a C extension, but
-        # we're not going to worry about that), so we don't need
-        # to yield here.
-        contents = [_recurse(value, json_id) for value in node]
-
-        try:
-            result = node.__class__(contents)
-            if isinstance(node, tagged.Tagged):
-                result._tag = node._tag
-        except TypeError:
-            # The derived class signature is different, so simply store the
-            # list representing the contents. Currently this is primarly
-            # intended to handle namedtuple and NamedTuple instances.
-            if not ignore_implicit_conversion:
-                msg = "Failed to serialize instance of {}, converting to list instead"
-                warnings.warn(msg.format(type(node)), AsdfWarning)
-            result = contents
-
-        return result
-
-    def _handle_children(node, json_id):
-        if isinstance(node, dict):
-            result = _handle_mapping(node, json_id)
-        elif isinstance(node, tuple):
-            result = _handle_immutable_sequence(node, json_id)
-        elif isinstance(node, list):
-            result = _handle_mutable_sequence(node, json_id)
-        else:
-            result = node
-
-        return _handle_generator(result)
+    # The tree is walked with an explicit stack of _WalkFrame, one for
+    # each container node whose children are being modified, so that
+    # deep trees don't run into the recursion limit.
 
-    def _recurse(node, json_id=None):
+    def _begin(node, json_id, stack):
+        # Start modifying the node.  Returns its result, or _NO_RESULT
+        # if a frame was pushed to modify its children first.
         if node in _context:
             # The node's modified result has already been
             # created, all we need to do is return it.  This
@@ -386,25 +364,51 @@ def walk_and_modify(top, callback, ignore_implicit_conversion=False, postorder=T
 
         # Inform the context that we're going to start modifing
         # this node.
-        with _context.pending(node):
-            # Take note of the "id" field, in case we're modifying
-            # a schema and need to know the namespace for resolving
-            # URIs.  Ignore an id that is not a string, since it may
-            # be an object defining an id property and not an id
-            # itself (this is common in metaschemas).
-            if isinstance(node, dict) and "id" in node and isinstance(node["id"], str):
-                json_id = node["id"]
-
-            if postorder:
-                # If this is a postorder modification, invoke the
-                # callback on this node's children first.
-                result = _handle_children(node, json_id)
-                result = _handle_callback(result, json_id)
-            else:
-                # Otherwise, invoke the callback on the node first,
-                # then its children.
-                result = _handle_callback(node, json_id)
-                result = _handle_children(result, json_id)
+        _context.push_pending(node)
+
+        # Take note of the "id" field, in case we're modifying
+        # a schema and need to know the namespace for resolving
+        # URIs.  Ignore an id that is not a string, since it may
+        # be an object defining an id property and not an id
+        # itself (this is common in metaschemas).
+        if isinstance(node, dict) and "id" in node and isinstance(node["id"], str):
+            json_id = node["id"]
+
+        if postorder:
+            # If this is a postorder modification, invoke the
+            # callback on this node's children first.
+            if _pre_callback is not None:
+                _pre_callback(node, json_id)
+            container = node
+        else:
+            # Otherwise, invoke the callback on the node first,
+            # then its children.
+            container = _handle_callback(node, json_id)
+
+        if isinstance(container, dict):
+            frame = _WalkFrame(node, container, json_id, _MAPPING, container.__class__(),
+                               iter(container.items()))
+        elif isinstance(container, tuple):
+            frame = _WalkFrame(node, container, json_id, _TUPLE, [], iter(enumerate(container)))
+        elif isinstance(container, list):
+            frame = _WalkFrame(node, container, json_id, _LIST, container.__class__(),
+                               iter(enumerate(container)))
+        else:
+            return _finish(node, _handle_generator(container), json_id)
+
+        if frame.kind != _TUPLE and isinstance(container, tagged.Tagged):
+            frame.result._tag = container._tag
+
+        stack.append(frame)
+        return _NO_RESULT
+
+    def _finish(node, result, json_id):
+        # Complete the modification of a node, given the result
+        # of modifying its children.
+        if postorder:
+            result = _handle_callback(result, json_id)
+
+        _context.pop_pending()
 
         # Store the result in the context, in case there are
         # additional references to the same node elsewhere in
@@ -413,15 +417,133 @@ def walk_and_modify(top, callback, ignore_implicit_conversion=False, postorder=T
 
         return result
 
+    def _handle_children(frame):
+        if frame.kind == _TUPLE:
+            # Immutable sequences containing themselves are impossible
+            # to construct (well, maybe possible in a C extension, but
+            # we're not going to worry about that), so we don't need
+            # to yield here.
+            contents = frame.result
+            node = frame.container
+            try:
+                result = node.__class__(contents)
+                if isinstance(node, tagged.Tagged):
+                    result._tag = node._tag
+            except TypeError:
+                # The derived class signature is different, so simply store the
+                # list representing the contents. Currently this is primarly
+                # intended to handle namedtuple and NamedTuple instances.
+                if not ignore_implicit_conversion:
+                    msg = "Failed to serialize instance of {}, converting to list instead"
+                    warnings.warn(msg.format(type(node)), AsdfWarning)
+                result = contents
+
+            return result
+
+        if frame.pending_items is not None:
+            return _handle_generator(_handle_pending_items(frame))
+
+        return frame.result
+
+    def _handle_pending_items(frame):
+        yield frame.result
+
+        # Now that we've yielded, the pending children should
+        # be available.
+        for key, value in frame.pending_items.items():
+            value = _modify(value, frame.json_id)
+            if frame.kind == _LIST:
+                frame.result[key] = value
+            elif value is not RemoveNode:
+                frame.result[key] = value
+            else:
+                # The callback may have decided to delete
+                # this node after all.
+                del frame.result[key]
+
+    def _modify(top, json_id=None):
+        stack = []
+        depth = _context.pending_depth()
+        try:
+            result = _begin(top, json_id, stack)
+            while stack:
+                frame = stack[-1]
+
+                if result is not _NO_RESULT:
+                    # The previous child of this frame's node has
+                    # been modified.
+                    if frame.kind == _MAPPING:
+                        if result is not RemoveNode:
+                            frame.result[frame.key] = result
+                    else:
+                        frame.result.append(result)
+
+                for frame.key, child in frame.items:
+                    if frame.kind != _TUPLE and _context.is_pending(child):
+                        # The child node is pending modification, which means
+                        # it must be its own ancestor.  Assign the special
+                        # PendingValue instance for now, and note that we'll
+                        # need to fill in the real value later.
+                        if frame.pending_items is None:
+                            frame.pending_items = {}
+                        frame.pending_items[frame.key] = child
+                        if frame.kind == _MAPPING:
+                            frame.result[frame.key] = PendingValue
+                        else:
+                            frame.result.append(PendingValue)
+                    else:
+                        break
+                else:
+                    stack.pop()
+                    result = _finish(frame.node, _handle_children(frame), frame.json_id)
+                    continue
+
+                result = _begin(child, frame.json_id, stack)
+
+            return result
+        except BaseException:
+            while _context.pending_depth() > depth:
+                _context.pop_pending()
+            raise
+
     if _context is None:
         _context = _TreeModificationContext()
 
     with _context:
-        return _recurse(top)
+        return _modify(top, _json_id)
         # Generators will be drained here, if this is the outermost
         # call to walk_and_modify.
 
 
+_MAPPING = 0
+_LIST = 1
+_TUPLE = 2
+
+
+class _WalkFrame:
+    """
+    A container node whose children are being modified by
+    `walk_and_modify`.
+    """
+    __slots__ = ("node", "container", "json_id", "kind", "result", "items", "key", "pending_items")
+
+    def __init__(self, node, container, json_id, kind, result, items):
+        # The original node, and the node whose children are modified
+        # (which differ when the callback is invoked in preorder)
+        self.node = node
+        self.container = container
+        self.json_id = json_id
+        self.kind = kind
+        # The new container, or the list of modified children of a tuple
+        self.result = result
+        # Iterator over (key, child) pairs not yet visited, and the
+        # key of the child being modified
+        self.items = items
+        self.key = None
+        # Map of key to child that is an ancestor of the node
+        self.pending_items = None
+
+
 def get_children(node):
     """
     Retrieve the children (and their dict keys or list/tuple indices) of
@@ -26,9 +26,9 @@ patched_urllib_parse.uses_relative.append('asdf')
 patched_urllib_parse.uses_netloc.append('asdf')
 
 
-__all__ = ['human_list', 'get_array_base', 'get_base_uri', 'filepath_to_url',
-           'iter_subclasses', 'calculate_padding', 'resolve_name', 'NotSet',
-           'is_primitive', 'uri_match']
+__all__ = ['human_list', 'get_array_base', 'iter_array_chunks', 'get_base_uri',
+           'filepath_to_url', 'iter_subclasses', 'calculate_padding',
+           'resolve_name', 'NotSet', 'is_primitive', 'uri_match']
 
 
 def human_list(l, separator="and"):
@@ -70,6 +70,46 @@ def get_array_base(arr):
     return base
 
 
+def iter_array_chunks(arr, chunk_size):
+    """
+    Iterate over the data of an array as a sequence of contiguous 1D
+    arrays, without copying the whole array into memory.
+
+    Contiguous arrays are yielded whole, as by ``arr.ravel(order='K')``.
+    The elements of other arrays are copied into a buffer of at most
+    ``chunk_size`` bytes at a time, in C order for arrays with zero
+    strides (such as the result of `numpy.broadcast_to`) and otherwise
+    in the same order as ``arr.ravel(order='K')``.  Each chunk is only
+    valid until the next one is requested.
+
+    Parameters
+    ----------
+    arr : numpy.ndarray
+
+    chunk_size : int
+        The maximum size, in bytes, of the copied chunks.
+
+    Yields
+    ------
+    chunk : numpy.ndarray
+    """
+    if arr.flags.c_contiguous or arr.flags.f_contiguous:
+        yield arr.ravel(order='K')
+        return
+
+    if 0 not in arr.strides:
+        # Order the axes by decreasing stride so that iterating in C
+        # order visits the elements in memory order, as ravel does.
+        axes = sorted(range(arr.ndim), key=lambda i: -abs(arr.strides[i]))
+        arr = arr.transpose(axes)
+
+    buffersize = max(chunk_size // max(arr.itemsize, 1), 1)
+    for chunk in np.nditer(arr, flags=['external_loop', 'buffered', 'zerosize_ok'],
+                           op_flags=['readonly', 'contig'],
+                           buffersize=buffersize, order='C'):
+        yield chunk
+
+
 def get_base_uri(uri):
     """
     For a given URI, return the part without any fragment.
@@ -1,8 +1,13 @@
-from pkg_resources import get_distribution, DistributionNotFound
+import sys
+
+if sys.version_info < (3, 10):
+    import importlib_metadata
+else:
+    import importlib.metadata as importlib_metadata
 
 try:
-    version = get_distribution('asdf').version
-except DistributionNotFound:
+    version = importlib_metadata.version('asdf')
+except importlib_metadata.PackageNotFoundError:
     # package is not installed
     version = "unknown"
 
@@ -1,3 +1,4 @@
+import re
 import warnings
 from collections import OrderedDict
 from types import GeneratorType
@@ -6,6 +7,8 @@ import numpy as np
 
 import yaml
 
+from . import lazy_nodes
+from . import reference
 from . import schema
 from . import tagged
 from . import treeutil
@@ -131,10 +134,77 @@ def represent_ordereddict(dumper, data):
     return represent_ordered_mapping(dumper, YAML_OMAP_TAG, data)
 
 
+_YAML_SEQ_TAG = YAML_TAG_PREFIX + 'seq'
+_YAML_MAP_TAG = YAML_TAG_PREFIX + 'map'
+_YAML_BOOL_TAG = YAML_TAG_PREFIX + 'bool'
+_YAML_INT_TAG = YAML_TAG_PREFIX + 'int'
+_YAML_FLOAT_TAG = YAML_TAG_PREFIX + 'float'
+
+
+_float_specials = {
+    'nan': '.nan',
+    'inf': '.inf',
+    '-inf': '-.inf',
+}
+
+
+def _format_floats(values):
+    # Format the floats as SafeRepresenter.represent_float does.  Only
+    # special values and exponents without a decimal point need fixing
+    # up after repr.
+    values = list(map(repr, values))
+    text = ','.join(values)
+    if 'n' in text or 'e' in text:
+        for i, value in enumerate(values):
+            if value in _float_specials:
+                values[i] = _float_specials[value]
+            elif 'e' in value and '.' not in value:
+                values[i] = value.replace('e', '.0e', 1)
+    return values
+
+
+def represent_inline_array(dumper, data):
+    """
+    Represent a `tagged.InlineArray` with the same nodes that would
+    be represented for its data as nested lists, formatting all of the
+    elements at once rather than calling the representer for each one.
+    """
+    array = data.array
+    flat = array.ravel().tolist()
+    if array.dtype.kind == 'b':
+        tag = _YAML_BOOL_TAG
+        values = ['true' if value else 'false' for value in flat]
+    elif array.dtype.kind in 'iu':
+        tag = _YAML_INT_TAG
+        values = list(map(str, flat))
+    else:
+        tag = _YAML_FLOAT_TAG
+        values = _format_floats(flat)
+
+    flow_style = _flow_style_map.get(data.flow_style, None)
+    nodes = [yaml.ScalarNode(tag, value) for value in values]
+    is_innermost = True
+    for length in reversed(array.shape):
+        if flow_style is None:
+            style = is_innermost
+        else:
+            style = flow_style
+        nodes = [
+            yaml.SequenceNode(_YAML_SEQ_TAG, nodes[i:i + length], flow_style=style)
+            for i in range(0, len(nodes), length)
+        ]
+        is_innermost = False
+
+    return nodes[0]
+
+
 AsdfDumper.add_representer(tagged.TaggedList, represent_sequence)
 AsdfDumper.add_representer(tagged.TaggedDict, represent_mapping)
 AsdfDumper.add_representer(tagged.TaggedString, represent_scalar)
 AsdfDumper.add_representer(OrderedDict, represent_ordereddict)
+AsdfDumper.add_representer(tagged.InlineArray, represent_inline_array)
+AsdfDumper.add_representer(lazy_nodes.AsdfDictNode, _yaml_base_dumper.represent_dict)
+AsdfDumper.add_representer(lazy_nodes.AsdfListNode, _yaml_base_dumper.represent_list)
 
 # ----------------------------------------------------------------------
 # Handle numpy scalars
@@ -155,6 +225,85 @@ AsdfDumper.add_representer(np.str_, represent_numpy_str)
 AsdfDumper.add_representer(np.bytes_, AsdfDumper.represent_binary)
 
 
+_NDARRAY_TAG_PREFIX = 'tag:stsci.edu:asdf/core/ndarray-'
+_ASDF_OBJECT_TAG_PREFIX = 'tag:stsci.edu:asdf/core/asdf-'
+
+
+_bool_values = {
+    'yes': True,
+    'no': False,
+    'true': True,
+    'false': False,
+    'on': True,
+    'off': False,
+}
+
+
+_float_values = {
+    '.inf': 'inf',
+    '+.inf': 'inf',
+    '-.inf': '-inf',
+    '.nan': 'nan',
+}
+
+
+# Integers with a leading zero are octal in YAML 1.1, which numpy
+# would read as decimal.
+_octal_int = re.compile(r'(?:^|,)[-+]?0[0-9_]')
+
+
+def _parse_inline_array(node):
+    """
+    Parse a YAML sequence node, nested for multidimensional arrays,
+    whose elements are all integers, all floats or all booleans into
+    a numpy array, or return `None` if it has any other structure or
+    if numpy would read any of the values differently from YAML.
+    """
+    shape = []
+    nodes = [node]
+    while isinstance(nodes[0], yaml.SequenceNode):
+        length = len(nodes[0].value)
+        if length == 0:
+            return None
+        for subnode in nodes:
+            if (not isinstance(subnode, yaml.SequenceNode) or
+                    subnode.tag != _YAML_SEQ_TAG or
+                    len(subnode.value) != length):
+                return None
+        shape.append(length)
+        nodes = [item for subnode in nodes for item in subnode.value]
+
+    if not shape:
+        return None
+
+    tag = nodes[0].tag
+    for subnode in nodes:
+        if not isinstance(subnode, yaml.ScalarNode) or subnode.tag != tag:
+            return None
+    values = [subnode.value for subnode in nodes]
+
+    try:
+        if tag == _YAML_INT_TAG:
+            if _octal_int.search(','.join(values)):
+                return None
+            array = np.array(values, dtype=np.int_)
+        elif tag == _YAML_FLOAT_TAG:
+            try:
+                array = np.array(values, dtype=np.float64)
+            except ValueError:
+                values = [value.lower() for value in values]
+                values = [_float_values.get(value, value) for value in values]
+                array = np.array(values, dtype=np.float64)
+        elif tag == _YAML_BOOL_TAG:
+            array = np.array([_bool_values[value.lower()] for value in values])
+        else:
+            return None
+    except (ValueError, OverflowError, KeyError):
+        return None
+
+    return array.reshape(shape)
+
+
 class AsdfLoader(_yaml_base_loader):
     """
     A specialized YAML loader that can construct "tagged basic Python
@@ -174,8 +323,21 @@ class AsdfLoader(_yaml_base_loader):
     def _construct_tagged_mapping(self, node):
         data = tagged.tag_object(node.tag, {})
         yield data
+        if node.tag.startswith(_NDARRAY_TAG_PREFIX):
+            self._construct_inline_data(node)
         data.update(self.construct_mapping(node))
 
+    def _construct_inline_data(self, node):
+        # Construct the inline data of an ndarray as a `tagged.InlineArray`,
+        # parsing all of its elements at once, when they are all numbers
+        # or booleans of the same type.  Otherwise the data is left to be
+        # constructed as nested lists as usual.
+        for key_node, value_node in node.value:
+            if key_node.value == 'data' and value_node not in self.constructed_objects:
+                array = _parse_inline_array(value_node)
+                if array is not None:
+                    self.constructed_objects[value_node] = tagged.InlineArray(array)
+
     def _construct_tagged_sequence(self, node):
         data = tagged.tag_object(node.tag, [])
         yield data
@@ -223,9 +385,9 @@ def custom_tree_to_tagged_tree(tree, ctx, _serialization_context=None):
         _serialization_context = ctx._create_serialization_context()
 
     extension_manager = _serialization_context.extension_manager
+    type_dispatch = _serialization_context._type_dispatch
 
-    def _convert_obj(obj):
-        converter = extension_manager.get_converter_for_type(type(obj))
+    def _convert_obj(obj, converter):
         tag = converter.select_tag(obj, _serialization_context)
         node = converter.to_yaml_tree(obj, tag, _serialization_context)
 
@@ -253,19 +415,29 @@ def custom_tree_to_tagged_tree(tree, ctx, _serialization_context=None):
         if generator is not None:
             yield from generator
 
-    def _walker(obj):
-        if extension_manager.handles_type(type(obj)):
-            return _convert_obj(obj)
+    def _get_type_dispatch(typ):
+        if extension_manager.handles_type(typ):
+            return extension_manager.get_converter_for_type(typ), None
         else:
-            tag = ctx.type_index.from_custom_type(
-                type(obj),
+            tag_type = ctx.type_index.from_custom_type(
+                typ,
                 ctx.version_string,
                 _serialization_context=_serialization_context
             )
+            return None, tag_type
 
-            if tag is not None:
-                return tag.to_tree_tagged(obj, ctx)
-            return obj
+    def _walker(obj):
+        typ = type(obj)
+        try:
+            converter, tag_type = type_dispatch[typ]
+        except KeyError:
+            converter, tag_type = type_dispatch[typ] = _get_type_dispatch(typ)
+
+        if converter is not None:
+            return _convert_obj(obj, converter)
+        if tag_type is not None:
+            return tag_type.to_tree_tagged(obj, ctx)
+        return obj
 
     return treeutil.walk_and_modify(
         tree,
@@ -278,47 +450,98 @@ def custom_tree_to_tagged_tree(tree, ctx, _serialization_context=None):
     )
 
 
-def tagged_tree_to_custom_tree(tree, ctx, force_raw_types=False, _serialization_context=None):
+def tagged_tree_to_custom_tree(tree, ctx, force_raw_types=False, _serialization_context=None,
+                               _validate_node=None, _fill_defaults=False, _find_references=False,
+                               _modification_context=None, _json_id=None):
     """
     Convert a tree containing only basic data types, annotated with
     tags, to a tree containing custom data types.
+
+    The private arguments allow the other steps of reading a file to
+    be done in the same walk over the tree:
+
+    - ``_fill_defaults``: fill in default values from the schema of
+      each tagged node before its children are visited.
+    - ``_validate_node``: a function called with the original tagged
+      form of each node just before the node is converted.
+    - ``_find_references``: convert JSON references into `Reference`
+      objects, as `reference.find_references` does.
+
+    ``_modification_context`` and ``_json_id`` are used to convert a
+    subtree of a lazy tree, see `_tagged_tree_to_lazy_tree`.
     """
     if _serialization_context is None:
         _serialization_context = ctx._create_serialization_context()
 
     extension_manager = _serialization_context.extension_manager
+    tag_dispatch = _serialization_context._tag_dispatch
+    if _modification_context is None:
+        modification_context = ctx._tree_modification_context
+    else:
+        modification_context = _modification_context
+
+    if _fill_defaults:
+        apply_defaults = schema._get_node_defaults_applier(ctx)
+
+        def _pre_walker(node, json_id):
+            if not (isinstance(node, dict) and '$ref' in node):
+                apply_defaults(node)
+    else:
+        _pre_walker = None
+
+    # Returns the converter or tag type for a tag, or the warning to
+    # issue when the tagged node is left as it is.
+    def _get_tag_dispatch(tag):
+        if extension_manager.handles_tag(tag):
+            return extension_manager.get_converter_for_tag(tag), None, None
+
+        tag_type = ctx.type_index.from_yaml_tag(ctx, tag, _serialization_context=_serialization_context)
+        # This means the tag did not correspond to any type in our type index.
+        if tag_type is None:
+            if ctx._ignore_unrecognized_tag:
+                return None, None, None
+            return None, None, ("{} is not recognized, converting to raw Python "
+                "data structure".format(tag))
+
+        tag_name, tag_version = split_tag_version(tag)
+        # This means that there is an explicit description of versions that are
+        # compatible with the associated tag class implementation, but the
+        # version we found does not fit that description.
+        if tag_type.incompatible_version(tag_version):
+            return None, None, ("Version {} of {} is not compatible with any "
+                "existing tag implementations".format(tag_version, tag_name))
+
+        return None, tag_type, None
+
+    def _walker(node, json_id):
+        if _find_references and isinstance(node, dict) and '$ref' in node:
+            return reference.Reference(node['$ref'], json_id, asdffile=ctx)
+
+        if _validate_node is not None:
+            _validate_node(modification_context.current_node())
 
-    def _walker(node):
         if force_raw_types:
+            if isinstance(node, tagged.InlineArray):
+                return node.tolist()
             return node
 
         tag = getattr(node, '_tag', None)
         if tag is None:
             return node
 
-        if extension_manager.handles_tag(tag):
-            converter = extension_manager.get_converter_for_tag(tag)
+        try:
+            converter, tag_type, message = tag_dispatch[tag]
+        except KeyError:
+            converter, tag_type, message = tag_dispatch[tag] = _get_tag_dispatch(tag)
+
+        if converter is not None:
             obj = converter.from_yaml_tree(node.data, tag, _serialization_context)
             _serialization_context._mark_extension_used(converter.extension)
             return obj
 
-        tag_type = ctx.type_index.from_yaml_tag(ctx, tag, _serialization_context=_serialization_context)
-        # This means the tag did not correspond to any type in our type index.
         if tag_type is None:
-            if not ctx._ignore_unrecognized_tag:
-                warnings.warn("{} is not recognized, converting to raw Python "
-                    "data structure".format(tag), AsdfConversionWarning)
-            return node
-
-        tag_name, tag_version = split_tag_version(tag)
-        # This means that there is an explicit description of versions that are
-        # compatible with the associated tag class implementation, but the
-        # version we found does not fit that description.
-        if tag_type.incompatible_version(tag_version):
-            warnings.warn("Version {} of {} is not compatible with any "
-                "existing tag implementations".format(
-                    tag_version, tag_name),
-                AsdfConversionWarning)
+            if message is not None:
+                warnings.warn(message, AsdfConversionWarning)
             return node
 
         # If a tag class does not explicitly list compatible versions, then all
@@ -342,10 +565,78 @@ def tagged_tree_to_custom_tree(tree, ctx, force_raw_types=False, _serialization_
         # Walk the tree in postorder, so that extensions receive
         # container nodes with children already deserialized.
         postorder=True,
-        _context=ctx._tree_modification_context,
+        _context=modification_context,
+        _pre_callback=_pre_walker,
+        _json_id=_json_id,
     )
 
 
+def _tagged_tree_to_lazy_tree(tree, ctx, force_raw_types=False,
+                              _validate_node=None, _fill_defaults=False):
+    """
+    Wrap a tree containing only basic data types, annotated with tags,
+    in the `lazy_nodes` containers, which convert it to a tree of custom
+    data types as it is accessed.
+
+    Untagged mappings and sequences are wrapped in containers of their
+    own, while any other node is converted, along with all of its
+    children, when it is first accessed.  The tagged root of the tree
+    becomes an `lazy_nodes.AsdfObjectNode`.  The private arguments are
+    those of `tagged_tree_to_custom_tree`.
+    """
+    serialization_context = ctx._create_serialization_context()
+
+    # The context keeps the results of all conversions for the lifetime
+    # of the tree, so that nodes shared between subtrees converted at
+    # different times (or by different routes) keep their identity.
+    modification_context = treeutil._TreeModificationContext(keep_results=True)
+
+    if _fill_defaults:
+        apply_defaults = schema._get_node_defaults_applier(ctx)
+
+    def _wrap(node, json_id, node_class):
+        if _validate_node is not None:
+            _validate_node(node)
+        if _fill_defaults:
+            apply_defaults(node)
+        if isinstance(node, dict) and isinstance(node.get('id'), str):
+            json_id = node['id']
+        result = node_class(node, _convert, json_id)
+        modification_context[node] = result
+        return result
+
+    def _convert(node, json_id):
+        if node in modification_context:
+            return modification_context[node]
+
+        if not isinstance(node, tagged.Tagged):
+            if isinstance(node, dict):
+                if '$ref' not in node:
+                    return _wrap(node, json_id, lazy_nodes.AsdfDictNode)
+            elif isinstance(node, list):
+                return _wrap(node, json_id, lazy_nodes.AsdfListNode)
+            else:
+                if _validate_node is not None:
+                    _validate_node(node)
+                return node
+
+        return tagged_tree_to_custom_tree(
+            node, ctx, force_raw_types,
+            _serialization_context=serialization_context,
+            _validate_node=_validate_node,
+            _fill_defaults=_fill_defaults,
+            _find_references=True,
+            _modification_context=modification_context,
+            _json_id=json_id,
+        )
+
+    if (not force_raw_types and isinstance(tree, tagged.TaggedDict) and
+            tree._tag.startswith(_ASDF_OBJECT_TAG_PREFIX)):
+        return _wrap(tree, None, lazy_nodes.AsdfObjectNode)
+
+    return _convert(tree, None)
+
+
 def load_tree(stream):
     """
     Load YAML, returning a tree of objects.
@@ -360,6 +651,162 @@ def load_tree(stream):
     return yaml.load(stream, Loader=AsdfLoader) # nosec
 
 
+def _parse_select(select):
+    """
+    Parse a list of JSON pointers into a tree of dicts keyed on the parts
+    of the pointers, in which `True` marks a subtree selected whole.
+    """
+    selection = {}
+    for pointer in select:
+        pointer = pointer.lstrip('/')
+        if not pointer:
+            return True
+
+        parts = [part.replace('~1', '/').replace('~0', '~') for part in pointer.split('/')]
+        node = selection
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is True:
+                break
+        else:
+            node[parts[-1]] = True
+
+    return selection
+
+
+class _SelectingComposer(yaml.composer.Composer):
+    """
+    Composer that builds YAML nodes only for the parts of the document
+    selected with `_parse_select`, from the events of an `AsdfLoader`.
+    The entries of the root mapping, and of untagged mappings below it,
+    that are not selected are skipped at the event level, without
+    composing or constructing them.
+    """
+    def __init__(self, loader):
+        super().__init__()
+        self.check_event = loader.check_event
+        self.peek_event = loader.peek_event
+        self.get_event = loader.get_event
+        self.resolve = loader.resolve
+        self.descend_resolver = loader.descend_resolver
+        self.ascend_resolver = loader.ascend_resolver
+
+        # Paths, as tuples of keys, of the mapping entries skipped
+        self.skipped = []
+        # Anchors defined in the skipped subtrees
+        self.skipped_anchors = set()
+
+    def compose_selected_document(self, selection):
+        # Drop the STREAM-START event.
+        self.get_event()
+
+        node = None
+        if not self.check_event(yaml.StreamEndEvent):
+            # Drop the DOCUMENT-START event.
+            self.get_event()
+            node = self.compose_selected_node(selection, (), True)
+            # Drop the DOCUMENT-END event.
+            self.get_event()
+
+        if not self.check_event(yaml.StreamEndEvent):
+            event = self.get_event()
+            raise yaml.composer.ComposerError(
+                "expected a single document in the stream",
+                None, "but found another document", event.start_mark)
+
+        # Drop the STREAM-END event.
+        self.get_event()
+        return node
+
+    def compose_selected_node(self, selection, path, is_root=False):
+        if selection is True or not self.check_event(yaml.MappingStartEvent):
+            return self.compose_node(None, None)
+
+        start_event = self.peek_event()
+        tag = start_event.tag
+        if tag is None or tag == '!':
+            tag = self.resolve(yaml.MappingNode, None, start_event.implicit)
+
+        # A tagged mapping missing some of its entries would likely fail
+        # validation and conversion, so those are composed whole.
+        if not (tag == _YAML_MAP_TAG or
+                (is_root and tag.startswith(_ASDF_OBJECT_TAG_PREFIX))):
+            return self.compose_node(None, None)
+
+        self.get_event()
+        node = yaml.MappingNode(tag, [], start_event.start_mark, None,
+                                flow_style=start_event.flow_style)
+        if start_event.anchor is not None:
+            self.anchors[start_event.anchor] = node
+
+        while not self.check_event(yaml.MappingEndEvent):
+            key_node = self.compose_node(node, None)
+            key = key_node.value if isinstance(key_node, yaml.ScalarNode) else None
+            if key in selection:
+                value_node = self.compose_selected_node(selection[key], path + (key,))
+            elif key == 'id':
+                # The id is the base URI of references in the selected
+                # subtrees, so it is kept with them.
+                value_node = self.compose_node(node, key_node)
+            else:
+                self.skipped.append(path + (key,))
+                self.skip_node()
+                continue
+            node.value.append((key_node, value_node))
+
+        node.end_mark = self.get_event().end_mark
+        return node
+
+    def skip_node(self):
+        depth = 0
+        while True:
+            event = self.get_event()
+            if isinstance(event, yaml.NodeEvent) and not isinstance(event, yaml.AliasEvent):
+                if event.anchor is not None:
+                    self.skipped_anchors.add(event.anchor)
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+            if depth == 0:
+                return
+
+
+def _load_selected_tree(content, select):
+    """
+    Load YAML, returning a tree of objects that only holds the subtrees
+    at the JSON pointers in ``select``, along with the paths of the
+    mapping entries that were skipped.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw YAML content.
+
+    select : list of str
+        JSON pointers to the subtrees to load, for example ``'/meta'``.
+        Only the root mapping and untagged mappings are descended into,
+        any other node on the way to a pointer is loaded whole.
+    """
+    loader = AsdfLoader(content)
+    try:
+        composer = _SelectingComposer(loader)
+        try:
+            node = composer.compose_selected_document(_parse_select(select))
+        except yaml.composer.ComposerError:
+            if not composer.skipped_anchors:
+                raise
+            # An alias to an anchor in a skipped subtree, so give up
+            # on skipping and load the whole tree.
+            return load_tree(content), []
+
+        if node is None:
+            return None, []
+        return loader.construct_document(node), composer.skipped
+    finally:
+        loader.dispose()
+
+
 def dump_tree(tree, fd, ctx, tree_finalizer=None, _serialization_context=None):
     """
     Dump a tree of objects, possibly containing custom types, to YAML.
@@ -385,27 +832,44 @@ def dump_tree(tree, fd, ctx, tree_finalizer=None, _serialization_context=None):
     # what extensions were used when converting the tree's custom
     # types.  In 3.0, it will be passed as the `ctx` instead of the
     # AsdfFile itself.
-    tags = None
-    tree_type = ctx.type_index.from_custom_type(type(tree))
-    if tree_type is not None:
-        tag_parts = tree_type.yaml_tag.split(':')
-        last_part = tag_parts[-1]
-        if '/' in last_part:
-            last_part = last_part[0:last_part.index('/') + 1]
-        else:
-            last_part = ''
-        yaml_tag = ':'.join(tag_parts[0:-1] + [last_part])
-        tags = {'!': yaml_tag}
+    tags = _get_tag_handles(tree, ctx)
 
     tree = custom_tree_to_tagged_tree(tree, ctx, _serialization_context=_serialization_context)
     if tree_finalizer is not None:
         tree_finalizer(tree)
     schema.validate(tree, ctx)
 
+    _dump_tagged_tree(tree, fd, ctx, tags)
+
+
+def _get_tag_handles(tree, ctx):
+    """
+    Get the YAML tag handles to write a tree with, which abbreviate the
+    tag of the tree's root node, or `None` if the root isn't tagged.
+    """
+    tree_type = ctx.type_index.from_custom_type(type(tree))
+    if tree_type is None:
+        return None
+
+    tag_parts = tree_type.yaml_tag.split(':')
+    last_part = tag_parts[-1]
+    if '/' in last_part:
+        last_part = last_part[0:last_part.index('/') + 1]
+    else:
+        last_part = ''
+    yaml_tag = ':'.join(tag_parts[0:-1] + [last_part])
+    return {'!': yaml_tag}
+
+
+def _dump_tagged_tree(tree, fd, ctx, tags):
+    """
+    Dump a validated, tagged tree to YAML.  If ``fd`` is `None`,
+    return the YAML as bytes.
+    """
     yaml_version = tuple(
         int(x) for x in ctx.version_map['YAML_VERSION'].split('.'))
 
-    yaml.dump_all(
+    return yaml.dump_all(
         [tree], stream=fd, Dumper=AsdfDumper,
         explicit_start=True, explicit_end=True,
         version=yaml_version,
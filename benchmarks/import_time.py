@@ -0,0 +1,50 @@
+"""
+Time importing asdf in a fresh interpreter, on its own and followed by
+the first access of the attributes that import the rest of the package.
+With ``--limit``, exit with an error if a bare ``import asdf`` takes
+longer than the given number of seconds, so that the script can guard
+against regressions in CI.
+"""
+import argparse
+import subprocess
+import sys
+import timeit
+
+
+CASES = [
+    ('import asdf', 'import asdf'),
+    ('import asdf; asdf.AsdfFile', 'import asdf; asdf.AsdfFile'),
+    ('import asdf.commands.main', 'import asdf.commands.main; asdf.commands.main.make_argparser()'),
+]
+
+
+def time_import(statement, repeat):
+    # Time an empty interpreter as well, so that its startup isn't
+    # counted against asdf.
+    def run(code):
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    baseline = min(timeit.repeat(lambda: run('pass'), number=1, repeat=repeat))
+    total = min(timeit.repeat(lambda: run(statement), number=1, repeat=repeat))
+    return max(total - baseline, 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--limit', type=float, default=None,
+                        help='maximum time in seconds for a bare import asdf')
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in CASES:
+        results[name] = time_import(statement, args.repeat)
+        print('{:<32} {:.3f} s'.format(name, results[name]))
+
+    if args.limit is not None and results['import asdf'] > args.limit:
+        sys.exit('import asdf took {:.3f} s, more than the limit of {:.3f} s'.format(
+            results['import asdf'], args.limit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Time writing and reading a table of numbers stored inline in the
+YAML tree, against the same table stored in a binary block.
+"""
+import argparse
+import io
+import timeit
+
+import numpy as np
+
+import asdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--columns', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    table = np.random.random((args.rows, args.columns))
+    af = asdf.AsdfFile({'table': table})
+
+    print('table of {} x {} float64'.format(args.rows, args.columns))
+    for storage in ['internal', 'inline']:
+        buff = io.BytesIO()
+        af.write_to(buff, all_array_storage=storage)
+        content = buff.getvalue()
+
+        def write():
+            af.write_to(io.BytesIO(), all_array_storage=storage)
+
+        def read():
+            with asdf.open(io.BytesIO(content), copy_arrays=True) as f:
+                f['table'][...]
+
+        write_time = min(timeit.repeat(write, number=1, repeat=args.repeat))
+        read_time = min(timeit.repeat(read, number=1, repeat=args.repeat))
+        print('  {:10s} write: {:.3f} s  read: {:.3f} s'.format(storage + ':', write_time, read_time))
+
+
+if __name__ == '__main__':
+    main()
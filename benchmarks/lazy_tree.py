@@ -0,0 +1,57 @@
+"""
+Time opening a file with many tagged nodes and reading a single value
+from its tree, with the tree converted when the file is opened, and
+with ``lazy_tree=True``, for each setting of ``validate_on_read``.
+"""
+import argparse
+import io
+import timeit
+
+import asdf
+from asdf.tags.core import Software
+
+
+def make_tree(size):
+    return {
+        'name': 'lazy',
+        'items': [
+            {
+                'software': Software(name='package{}'.format(i), version='1.0'),
+                'value': i,
+                'complex': complex(i, 1),
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=10000,
+                        help='number of items in the tree')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    buff = io.BytesIO()
+    asdf.AsdfFile(make_tree(args.size)).write_to(buff)
+    content = buff.getvalue()
+
+    def read_value(lazy_tree):
+        with asdf.open(io.BytesIO(content), lazy_tree=lazy_tree) as af:
+            return af.tree['items'][-1]['software']['name']
+
+    assert read_value(False) == read_value(True)
+
+    print('open a file of {} items and read one value'.format(args.size))
+    for validate_on_read in [True, 'lazy', False]:
+        with asdf.config_context() as config:
+            config.validate_on_read = validate_on_read
+            eager = min(timeit.repeat(lambda: read_value(False), number=1, repeat=args.repeat))
+            lazy = min(timeit.repeat(lambda: read_value(True), number=1, repeat=args.repeat))
+
+        print('  validate_on_read={!r}'.format(validate_on_read))
+        print('    eager tree: {:.3f} s'.format(eager))
+        print('    lazy tree:  {:.3f} s ({:.2f}x)'.format(lazy, eager / lazy))
+
+if __name__ == '__main__':
+    main()
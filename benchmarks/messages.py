@@ -0,0 +1,63 @@
+"""
+Measure the rate at which small trees can be serialized to and from the
+bytes of an ASDF file, as when ASDF is used as a message format, with
+``AsdfFile.write_to``/``asdf.open`` and with ``asdf.dumps``/``asdf.loads``.
+"""
+import argparse
+import io
+import timeit
+
+import asdf
+
+
+def make_tree(size):
+    return {
+        'meta': {
+            'id': 12345, 'name': 'message', 'tags': ['a', 'b', 'c'],
+            'values': [1.5, 2.5, 3.5], 'nested': {'x': 1, 'y': 2, 'flag': True},
+        },
+        'items': [{'k': i, 'v': 'val{}'.format(i)} for i in range(size)],
+    }
+
+
+def write_to(tree):
+    buff = io.BytesIO()
+    asdf.AsdfFile(tree).write_to(buff)
+    return buff.getvalue()
+
+
+def read(content):
+    with asdf.open(io.BytesIO(content)) as af:
+        return af.tree
+
+
+def rate(func, arg, number, repeat):
+    return number / min(timeit.repeat(lambda: func(arg), number=number, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=20,
+                        help='number of items in each message')
+    parser.add_argument('--number', type=int, default=200,
+                        help='number of messages in each timing')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tree = make_tree(args.size)
+    content = write_to(tree)
+    assert asdf.dumps(tree) == content
+    assert asdf.loads(content)['meta'] == read(content)['meta']
+
+    print('messages/s for a message of {} bytes'.format(len(content)))
+    for name, func, arg in [
+        ('write_to', write_to, tree),
+        ('dumps', asdf.dumps, tree),
+        ('open', read, content),
+        ('loads', asdf.loads, content),
+    ]:
+        print('  {:<10}{:>10.0f}'.format(name, rate(func, arg, args.number, args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
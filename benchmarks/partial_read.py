@@ -0,0 +1,49 @@
+"""
+Time opening a file whose YAML is dominated by a large inline table, to
+read a single value from a small part of its tree, with and without
+``select``.
+"""
+import argparse
+import io
+import timeit
+
+import asdf
+
+
+def make_tree(size):
+    return {
+        'meta': {'exposure': 10.0, 'name': 'select'},
+        'table': [
+            {'index': i, 'name': 'row{}'.format(i), 'values': [i, i + 1, i + 2]}
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=20000,
+                        help='number of rows in the table')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    buff = io.BytesIO()
+    asdf.AsdfFile(make_tree(args.size)).write_to(buff)
+    content = buff.getvalue()
+
+    def read_value(select):
+        with asdf.open(io.BytesIO(content), select=select) as af:
+            return af.tree['meta']['exposure']
+
+    assert read_value(None) == read_value(['/meta'])
+
+    whole = min(timeit.repeat(lambda: read_value(None), number=1, repeat=args.repeat))
+    selected = min(timeit.repeat(lambda: read_value(['/meta']), number=1, repeat=args.repeat))
+
+    print('read one value from a file of {:.1f} MB of YAML'.format(len(content) / 1e6))
+    print('  whole tree:  {:.3f} s'.format(whole))
+    print('  select:      {:.3f} s ({:.2f}x)'.format(selected, whole / selected))
+
+
+if __name__ == '__main__':
+    main()
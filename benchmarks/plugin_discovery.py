@@ -0,0 +1,49 @@
+"""
+Time, in a fresh interpreter, discovering the installed resource
+mapping plugins and reading the core asdf schema from them, with and
+without ``plugin_cache_dir``.
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+
+
+CODE = """
+import time
+import asdf
+asdf.get_config().plugin_cache_dir = {cache_dir!r}
+
+start = time.perf_counter()
+asdf.get_config().resource_manager['http://stsci.edu/schemas/asdf/core/asdf-1.1.0']
+print(time.perf_counter() - start)
+"""
+
+
+def time_discovery(cache_dir, repeat):
+    # Each run is a new process, so that nothing discovered by the
+    # previous run is kept in memory.
+    code = CODE.format(cache_dir=cache_dir)
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE)
+        results.append(float(output.stdout))
+    return min(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    uncached = time_discovery(None, args.repeat)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = time_discovery(cache_dir, args.repeat)
+
+    print('discover plugins and read the core asdf schema')
+    print('  no cache:          {:.4f} s'.format(uncached))
+    print('  plugin_cache_dir:  {:.4f} s ({:.2f}x)'.format(cached, uncached / cached))
+
+
+if __name__ == '__main__':
+    main()
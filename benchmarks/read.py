@@ -0,0 +1,78 @@
+"""
+Time the conversion of a tree read from a file, with references found,
+defaults filled, and nodes validated and converted in a single walk,
+against doing each of those in a walk of its own.
+"""
+import argparse
+import io
+import timeit
+
+import asdf
+from asdf import reference, schema, treeutil, yamlutil
+from asdf.tags.core import Software
+
+
+def make_tree(size):
+    return {
+        'items': [
+            {
+                'software': Software(name='package{}'.format(i), version='1.0'),
+                'value': i,
+                'complex': complex(i, 1),
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100000,
+                        help='approximate number of nodes in the tree')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Use a version of the standard that still fills defaults on read
+    version = '1.5.0'
+    af = asdf.AsdfFile(make_tree(args.size // 7), version=version)
+    tagged_tree = yamlutil.custom_tree_to_tagged_tree(af.tree, af)
+    nodes = sum(1 for _ in treeutil.iter_tree(tagged_tree))
+
+    buff = io.BytesIO()
+    yamlutil.dump_tree(af.tree, buff, af)
+    content = buff.getvalue()
+
+    def separate():
+        ctx = asdf.AsdfFile(version=version)
+        tree = yamlutil.load_tree(io.BytesIO(content))
+        tree = reference.find_references(tree, ctx)
+        schema.fill_defaults(tree, ctx, reading=True)
+        schema.validate(tree, ctx, reading=True)
+        return yamlutil.tagged_tree_to_custom_tree(tree, ctx)
+
+    def fused():
+        ctx = asdf.AsdfFile(version=version)
+        tree = yamlutil.load_tree(io.BytesIO(content))
+        return yamlutil.tagged_tree_to_custom_tree(
+            tree, ctx,
+            _validate_node=schema._get_node_validator(ctx, reading=True),
+            _fill_defaults=True,
+            _find_references=True,
+        )
+
+    def parse():
+        return yamlutil.load_tree(io.BytesIO(content))
+
+    assert separate() == fused()
+
+    parsing = min(timeit.repeat(parse, number=1, repeat=args.repeat))
+    separate_time = min(timeit.repeat(separate, number=1, repeat=args.repeat)) - parsing
+    fused_time = min(timeit.repeat(fused, number=1, repeat=args.repeat)) - parsing
+
+    print('read a tree of {} nodes (excluding {:.3f} s of YAML parsing)'.format(nodes, parsing))
+    print('  separate walks: {:.3f} s'.format(separate_time))
+    print('  single walk:    {:.3f} s ({:.2f}x)'.format(fused_time, separate_time / fused_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Time the tree traversals in `asdf.treeutil` on a wide tree (many
+small containers) and a deep tree (containers nested many levels).
+"""
+import argparse
+import sys
+import timeit
+
+from asdf import treeutil
+
+
+def make_wide_tree(size):
+    return {
+        'items': [
+            {'name': 'item{}'.format(i), 'values': [i, i + 1, i + 2]}
+            for i in range(size)
+        ]
+    }
+
+
+def make_deep_tree(depth):
+    tree = node = {}
+    for i in range(depth):
+        node['child'] = [{'value': i}]
+        node = node['child'][0]
+    return tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100000,
+                        help='number of items in the wide tree')
+    parser.add_argument('--depth', type=int, default=500,
+                        help='depth of the deep tree')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Leave room for implementations that recurse once per level
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), args.depth * 10))
+
+    trees = [
+        ('wide', make_wide_tree(args.size)),
+        ('deep', make_deep_tree(args.depth)),
+    ]
+
+    for name, tree in trees:
+        nodes = sum(1 for _ in treeutil.iter_tree(tree))
+        print('{} tree of {} nodes'.format(name, nodes))
+
+        cases = [
+            ('iter_tree', lambda: sum(1 for _ in treeutil.iter_tree(tree))),
+            ('walk_and_modify (postorder)',
+                lambda: treeutil.walk_and_modify(tree, lambda node: node)),
+            ('walk_and_modify (preorder)',
+                lambda: treeutil.walk_and_modify(tree, lambda node: node, postorder=False)),
+        ]
+        for label, fn in cases:
+            time = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print('  {:28s} {:.3f} s'.format(label + ':', time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Time schema validation of a tagged tree with many tagged nodes, using
+compiled schemas and the generic `jsonschema` validation path.
+"""
+import argparse
+import timeit
+
+import asdf
+from asdf import schema, yamlutil
+from asdf.tags.core import Software
+
+
+def make_tree(size):
+    return {
+        'items': [
+            {
+                'software': Software(name='package{}'.format(i), version='1.0'),
+                'value': i,
+                'complex': complex(i, 1),
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=10000,
+                        help='number of items in the tree')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    af = asdf.AsdfFile(make_tree(args.size))
+    tagged_tree = yamlutil.custom_tree_to_tagged_tree(af.tree, af)
+
+    def validate():
+        # Don't let repeats skip validation of unchanged subtrees
+        af._validation_cache.clear()
+        schema.validate(tagged_tree, af)
+
+    validate()
+    compiled = min(timeit.repeat(validate, number=1, repeat=args.repeat))
+
+    # Disable schema compilation to time the generic path
+    cls = type(schema.get_validator(ctx=af))
+    iter_schema_errors = cls.__dict__['_iter_schema_errors']
+
+    def iter_generic_errors(self, instance, schema):
+        return super(cls, self).iter_errors(instance, schema)
+
+    cls._iter_schema_errors = iter_generic_errors
+    try:
+        generic = min(timeit.repeat(validate, number=1, repeat=args.repeat))
+    finally:
+        cls._iter_schema_errors = iter_schema_errors
+
+    print('validate {} items'.format(args.size))
+    print('  generic:  {:.3f} s'.format(generic))
+    print('  compiled: {:.3f} s ({:.2f}x)'.format(compiled, generic / compiled))
+
+
+if __name__ == '__main__':
+    main()